@@ -6,10 +6,14 @@ import argparse
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from engine.core.event_binary import BINARY_SUFFIX, BinaryEventWriter
+from engine.core.event_log import JsonlEventWriter
 from main import DataLoader, run_battle
 
+EVENT_SUFFIXES = {"none": ".jsonl", "gzip": ".jsonl.gz", "lzma": ".jsonl.xz"}
+
 
 def _sanitize(name: str) -> str:
     cleaned = re.sub(r"[^A-Za-z0-9_\-\.\u4e00-\u9fff]+", "_", name)
@@ -46,6 +50,15 @@ def _choice_list(slot: int, opt_idx: int) -> List[int]:
     return choices
 
 
+def _shard_writer(path: Path, enabled: bool) -> Optional[JsonlEventWriter]:
+    # One handle for every battle of a traversal pass; records carry "battle".
+    if not enabled:
+        return None
+    if path.suffix == BINARY_SUFFIX:
+        return BinaryEventWriter(path)
+    return JsonlEventWriter(path, mode="w")
+
+
 def _default_dummy(pets_data: Dict[int, dict], prefer: int | None) -> int:
     if prefer is not None and prefer in pets_data:
         return int(prefer)
@@ -65,6 +78,9 @@ def generate_logs(
     max_skills: int | None,
     dummy_pet_id: int | None,
     write_events: bool,
+    events_compress: str = "none",
+    events_shard: bool = False,
+    events_format: str = "jsonl",
 ) -> None:
     data_loader = DataLoader(".")
     data_loader.load_all()
@@ -86,6 +102,8 @@ def generate_logs(
     if write_events:
         by_pet_event_dir.mkdir(parents=True, exist_ok=True)
         by_skill_event_dir.mkdir(parents=True, exist_ok=True)
+    event_suffix = BINARY_SUFFIX if events_format == "binary" else EVENT_SUFFIXES[events_compress]
+    events_shard = write_events and events_shard
 
     ability_index = _ability_index(pets_data)
     all_ability_ids = sorted(int(x) for x in data_loader.abilities_data.keys())
@@ -102,13 +120,16 @@ def generate_logs(
     skill_logs: List[Dict[str, str | int]] = []
     missing_skills: List[int] = []
 
+    shard = _shard_writer(output_dir / "events" / f"by_pet{event_suffix}", events_shard)
     for i, pet_id in enumerate(pet_ids, start=1):
         name_zh = pets_data.get(pet_id, {}).get("Names", {}).get("zh", f"pet_{pet_id}")
         filename = f"pet_{pet_id}_{_sanitize(str(name_zh))}.txt"
         log_path = by_pet_dir / filename
         event_log = None
-        if write_events:
-            event_log = by_pet_event_dir / f"pet_{pet_id}_{_sanitize(str(name_zh))}.jsonl"
+        if shard is not None:
+            shard.battle = f"pet_{pet_id}"
+        elif write_events:
+            event_log = by_pet_event_dir / f"pet_{pet_id}_{_sanitize(str(name_zh))}{event_suffix}"
         run_battle(
             data_loader=data_loader,
             team0_pet_ids=[pet_id],
@@ -123,11 +144,15 @@ def generate_logs(
             ability_override_by_pet_slot=None,
             verbose=False,
             event_log_file=str(event_log) if event_log else None,
+            event_writer=shard,
         )
         pet_logs.append({"pet_id": int(pet_id), "name_zh": str(name_zh), "log": str(log_path)})
         if i % 50 == 0:
             print(f"[pet] {i}/{len(pet_ids)}")
+    if shard is not None:
+        shard.close()
 
+    shard = _shard_writer(output_dir / "events" / f"by_skill{event_suffix}", events_shard)
     for i, ability_id in enumerate(skill_ids, start=1):
         carriers = ability_index.get(int(ability_id)) or []
         if carriers:
@@ -145,8 +170,10 @@ def generate_logs(
         filename = f"ability_{ability_id}_{_sanitize(str(ability_name_zh))}.txt"
         log_path = by_skill_dir / filename
         event_log = None
-        if write_events:
-            event_log = by_skill_event_dir / f"ability_{ability_id}_{_sanitize(str(ability_name_zh))}.jsonl"
+        if shard is not None:
+            shard.battle = f"ability_{ability_id}"
+        elif write_events:
+            event_log = by_skill_event_dir / f"ability_{ability_id}_{_sanitize(str(ability_name_zh))}{event_suffix}"
         run_battle(
             data_loader=data_loader,
             team0_pet_ids=[int(pet_id)],
@@ -161,6 +188,7 @@ def generate_logs(
             ability_override_by_pet_slot=ability_override_by_pet_slot,
             verbose=False,
             event_log_file=str(event_log) if event_log else None,
+            event_writer=shard,
         )
         skill_logs.append({
             "ability_id": int(ability_id),
@@ -171,6 +199,8 @@ def generate_logs(
         })
         if i % 50 == 0:
             print(f"[skill] {i}/{len(skill_ids)}")
+    if shard is not None:
+        shard.close()
 
     report = {
         "pets_total": len(pet_ids),
@@ -196,6 +226,12 @@ def main() -> None:
     parser.add_argument("--max-skills", type=int, help="Limit number of skills")
     parser.add_argument("--dummy", type=int, help="Dummy target pet id")
     parser.add_argument("--events", action="store_true", help="Write JSONL event logs")
+    parser.add_argument("--events-compress", choices=sorted(EVENT_SUFFIXES), default="none",
+                        help="Compress event logs (gzip -> .jsonl.gz, lzma -> .jsonl.xz)")
+    parser.add_argument("--events-format", choices=["jsonl", "binary"], default="jsonl",
+                        help="Event log format (binary -> indexed .wpev files, see event_convert.py)")
+    parser.add_argument("--events-shard", action="store_true",
+                        help="One event file per pass (events/by_pet, events/by_skill) instead of one per battle")
     args = parser.parse_args()
 
     generate_logs(
@@ -208,6 +244,9 @@ def main() -> None:
         max_skills=args.max_skills,
         dummy_pet_id=args.dummy,
         write_events=args.events,
+        events_compress=args.events_compress,
+        events_shard=args.events_shard,
+        events_format=args.events_format,
     )
 
 
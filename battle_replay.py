@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Replay / verify compact battle records (engine.core.replay).
+
+    python battle_replay.py verify --records battles.jsonl --factory mysim:make_ctx
+    python battle_replay.py show --records battles.jsonl --index 3 --round 23 --factory mysim:make_ctx
+
+--factory names the ctx factory make_ctx(spec, seed) -> (ctx, pets) the records were
+recorded with.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+
+from engine.core.replay import load_records, replay, verify_records
+
+
+def _factory(path: str):
+    module, _, name = path.partition(":")
+    if not module or not name:
+        raise SystemExit(f"--factory must be module:function, not {path!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay and verify compact battle records")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("verify", "Replay every record and compare outcome hashes"),
+                            ("show", "Fast-forward one record and print the traced round's log")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--records", type=str, required=True, help="Battle record JSONL file")
+        p.add_argument("--factory", type=str, required=True, help="ctx factory as module:function")
+        if name == "show":
+            p.add_argument("--index", type=int, default=0, help="Record index in the file")
+            p.add_argument("--round", type=int, required=True, help="Round to trace")
+    args = parser.parse_args()
+
+    records = load_records(args.records)
+    factory = _factory(args.factory)
+
+    if args.command == "verify":
+        results = verify_records(records, factory)
+        bad = [r for r in results if not r.ok]
+        for r in bad:
+            print(f"MISMATCH record {r.index}: expected {r.expected} got {r.actual}")
+        print(f"{len(results) - len(bad)}/{len(results)} records reproduce their outcome hash")
+        sys.exit(1 if bad else 0)
+
+    res = replay(records[args.index], factory, until_round=args.round)
+    print(f"record {args.index}: round {res.round_no}, winner {res.winner}")
+    for rec in getattr(getattr(res.ctx, "log", None), "records", []):
+        print(json.dumps(rec, ensure_ascii=False, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Chrome trace-event JSON of whole battles (engine.core.span_trace).
+
+    python battle_trace.py --records battles.jsonl --factory mysim:make_ctx --index 3 --out b3.json
+    python battle_trace.py --seeds 0 1 2 --out fixture.json
+
+Open the output in chrome://tracing or https://ui.perfetto.dev (the file is loaded
+locally in the browser). With --records the chosen records are replayed through the
+ctx factory they were recorded with; without it, seeded 3v3 fixture battles are run.
+"""
+from __future__ import annotations
+
+import argparse
+
+from battle_replay import _factory
+from engine.core.battle_loop import BattleLoop
+from engine.core.span_trace import SpanTracer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export battle spans as Chrome trace-event JSON")
+    parser.add_argument("--records", type=str, default=None, help="Battle record JSONL to replay")
+    parser.add_argument("--factory", type=str, default=None, help="ctx factory as module:function (with --records)")
+    parser.add_argument("--index", type=int, nargs="+", default=[0], help="Record indexes to trace (with --records)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="Fixture battle seeds without --records")
+    parser.add_argument("--out", type=str, default="battle.trace.json", help="Output trace file")
+    args = parser.parse_args()
+
+    tracer = SpanTracer()
+    if args.records:
+        if not args.factory:
+            parser.error("--records needs --factory")
+        from engine.core.replay import load_records, replay
+
+        factory = _factory(args.factory)
+        records = load_records(args.records)
+        for i in args.index:
+            loop = BattleLoop()
+
+            def traced_factory(spec, seed):
+                ctx, pets = factory(spec, seed)
+                tracer.attach(loop, ctx.dispatcher)
+                return ctx, pets
+
+            with tracer.battle(f"record {i}", seed=records[i].seed):
+                replay(records[i], traced_factory, loop=loop)
+            tracer.detach(loop)
+    else:
+        from benchmarks.macro import run_loop_battle
+
+        for seed in args.seeds:
+            loop = BattleLoop()
+            with tracer.battle(f"seed {seed}", seed=seed):
+                run_loop_battle(seed, setup=lambda ctx: tracer.attach(loop, ctx.dispatcher), loop=loop)
+            tracer.detach(loop)
+
+    n = tracer.export(args.out)
+    print(f"wrote {n} spans to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
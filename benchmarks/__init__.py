@@ -0,0 +1 @@
+"""Engine benchmark suite: python -m benchmarks run | compare | list (see __main__)."""
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""Benchmark CLI.
+
+    python -m benchmarks list
+    python -m benchmarks run [-k dispatch.* -k macro] [--out results.json] [--compare]
+    python -m benchmarks compare [BASELINE] CURRENT [--threshold 0.10]
+
+`run --compare` checks the fresh results against the baseline right away; `run
+--out benchmarks/baseline.json` refreshes the stored baseline. Both compare forms
+exit with status 1 when a benchmark regressed by more than the threshold.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import benchmarks.macro  # noqa: F401  (registers benchmarks)
+import benchmarks.micro  # noqa: F401
+from benchmarks.harness import (
+    DEFAULT_THRESHOLD,
+    compare,
+    format_ns,
+    get_benchmarks,
+    load_baseline,
+    make_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _print_progress(name: str, entry: Dict[str, Any]) -> None:
+    if "skipped" in entry:
+        print(f"{name:<28} skipped: {entry['skipped']}")
+    else:
+        print(f"{name:<28} {format_ns(entry['ns_per_op']):>10}/{entry['unit']:<7} "
+              f"(median {format_ns(entry['median_ns'])}, {entry['calls']} calls x {entry['repeat']})")
+
+
+def _report(rows: List[Dict[str, Any]], threshold: float) -> int:
+    print(f"{'benchmark':<28} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for r in rows:
+        ratio = "-" if r["ratio"] is None else f"{r['ratio']:.3f}"
+        print(f"{r['name']:<28} {format_ns(r['base_ns']):>10} {format_ns(r['current_ns']):>10} {ratio:>7}  {r['status']}")
+    bad = [r["name"] for r in rows if r["status"] == "regression"]
+    if bad:
+        print(f"{len(bad)} regression(s) beyond {threshold:.0%}: {', '.join(bad)}")
+        return 1
+    print(f"no regressions beyond {threshold:.0%}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Engine hot-path benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="List registered benchmarks")
+    p_list.add_argument("-k", dest="patterns", action="append", help="Name glob or group (repeatable)")
+
+    p_run = sub.add_parser("run", help="Run benchmarks")
+    p_run.add_argument("-k", dest="patterns", action="append", help="Name glob or group (repeatable)")
+    p_run.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed batch")
+    p_run.add_argument("--repeat", type=int, default=5, help="Timed batches per benchmark")
+    p_run.add_argument("--out", type=str, default=None, help="Write results as a baseline JSON")
+    p_run.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), default=None,
+                       help="Compare against a baseline (default: benchmarks/baseline.json)")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (0.10 = 10%%)")
+
+    p_cmp = sub.add_parser("compare", help="Compare two result files")
+    p_cmp.add_argument("files", nargs="+", help="[BASELINE] CURRENT (baseline defaults to benchmarks/baseline.json)")
+    p_cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regression threshold (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for b in get_benchmarks(args.patterns):
+            print(f"{b.name:<28} {b.group:<6} per {b.unit}")
+        return
+
+    if args.command == "compare":
+        if len(args.files) > 2:
+            parser.error("compare takes at most two files")
+        base_path = args.files[0] if len(args.files) == 2 else DEFAULT_BASELINE
+        rows = compare(load_baseline(base_path), load_baseline(args.files[-1]), threshold=args.threshold)
+        sys.exit(_report(rows, args.threshold))
+
+    selected = get_benchmarks(args.patterns)
+    if not selected:
+        parser.error("no benchmark matches the given -k patterns")
+    results = run_benchmarks(selected, min_time=args.min_time, repeat=args.repeat, progress=_print_progress)
+    current = make_baseline(results)
+    if args.out:
+        save_baseline(args.out, current)
+        print(f"results written to {args.out}")
+    if args.compare:
+        print()
+        rows = compare(load_baseline(args.compare), current, threshold=args.threshold)
+        sys.exit(_report(rows, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
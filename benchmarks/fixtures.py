@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+"""Self-contained engine contexts for the benchmarks (no xlsx / pandas needed).
+
+make_ctx() wires the same managers and resolvers a BattleLoop battle uses around an
+in-memory ability table: a direct hit, a heal with a cooldown, a DOT aura whose
+meta binds a state (so StatsResolver.sum_state has aura binds to walk) and a state
+setter. Pets have enough HP that the micro-benchmarks never kill anything.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+from engine.core.event_bus import EventBus
+from engine.core.logs import LOG_OFF, MiniLog
+from engine.core.rng import BlockRNG, CounterRNG
+from engine.core.team_manager import TeamManager
+from engine.effects.dispatcher import EffectDispatcher
+from engine.model.effect_row import EffectRow
+from engine.pets.pet_instance import PetInstance
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.cooldown import CooldownManager
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.heal_pipeline import HealPipeline
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.racial_passives import RacialPassiveManager
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import StatsResolver
+from engine.resolver.weather_manager import WeatherManager
+
+ABILITY_HIT = 101
+ABILITY_HEAL = 102
+ABILITY_DOT = 103
+ABILITY_SET_STATE = 104
+AURA_DOT = 201
+BOUND_STATE = 18
+
+
+def row(ability_id: int, prop_id: int, label: str, raw: str, *, aura: int = None, effect_id: int = 0) -> EffectRow:
+    return EffectRow(ability_id=ability_id, turn_id=1, effect_id=effect_id or ability_id, prop_id=prop_id,
+                     order_index=1, param_label=label, param_raw=raw, aura_ability_id=aura)
+
+
+# prop_id -> representative row for the dispatcher micro-benchmarks
+OPCODE_ROWS: Dict[int, EffectRow] = {
+    24: row(ABILITY_HIT, 24, "Points,Accuracy,IsPeriodic", "30,100,0"),
+    23: row(ABILITY_HEAL, 23, "Points,Accuracy", "25,100"),
+    26: row(ABILITY_DOT, 26, "Accuracy,Duration,TickDownFirstRound", "100,3,0", aura=AURA_DOT),
+    31: row(ABILITY_SET_STATE, 31, "State,StateValue", f"{BOUND_STATE},1"),
+    0: row(ABILITY_HIT, 0, "Points,Accuracy", "30,100"),
+    9999: row(ABILITY_HIT, 9999, "", ""),  # unknown opcode: NO_HANDLER path
+}
+
+
+class Scripts:
+    """The subset of the ScriptDB interface the engine reads."""
+
+    casts = {
+        ABILITY_HIT: [[OPCODE_ROWS[24]]],
+        ABILITY_HEAL: [[OPCODE_ROWS[23]]],
+        ABILITY_DOT: [[OPCODE_ROWS[26]]],
+    }
+    cooldowns = {ABILITY_HEAL: 2, ABILITY_DOT: 3}
+    periodic = {AURA_DOT: {"TURN_END": [row(AURA_DOT, 24, "Points,Accuracy,IsPeriodic", "8,100,1")]}}
+    meta = {AURA_DOT: {"state_binds": [{"state_id": BOUND_STATE, "value": 10}]}}
+
+    def get_ability_cast_turns(self, ability_id: int) -> List[List[EffectRow]]:
+        return [list(r) for r in self.casts.get(int(ability_id), [])]
+
+    def get_ability_cooldown(self, ability_id: int) -> int:
+        return self.cooldowns.get(int(ability_id), 0)
+
+    def get_aura_periodic(self, aura_id: int) -> Dict[str, List[EffectRow]]:
+        return dict(self.periodic.get(int(aura_id), {}))
+
+    def get_aura_meta(self, aura_id: int) -> Dict[str, Any]:
+        return dict(self.meta.get(int(aura_id), {}))
+
+    def attach_periodic_to_aura(self, aura: Any) -> None:
+        aura.periodic_payloads.update(self.get_aura_periodic(aura.aura_id))
+
+    def attach_meta_to_aura(self, aura: Any) -> None:
+        aura.meta.update(self.get_aura_meta(aura.aura_id))
+
+
+def make_ctx(*, team_size: int = 3, seed: int = 0, hp: int = 1200, log_level: int = LOG_OFF) -> Tuple[Any, List[Any]]:
+    """(ctx, pets) for a team_size v team_size battle; team 0 holds pet ids 1..team_size."""
+    rng = BlockRNG(CounterRNG(seed=seed), block_size=128)
+    stats = StatsResolver()
+    pets: Dict[int, PetInstance] = {}
+    for i in range(2 * team_size):
+        pid = i + 1
+        speed = 260 + (7 * i) % 23
+        pets[pid] = PetInstance(
+            id=pid, pet_id=pid, rarity_id=4, breed_id=3, level=25, pet_type=i % 10,
+            base_max_hp=hp, base_power=280, base_speed=speed, max_hp=hp, hp=hp, power=280, speed=speed,
+            abilities={1: ABILITY_HIT, 2: ABILITY_HEAL, 3: ABILITY_DOT},
+        )
+    teams = TeamManager()
+    teams.register_team(0, list(range(1, team_size + 1)))
+    teams.register_team(1, list(range(team_size + 1, 2 * team_size + 1)))
+    weather = WeatherManager()
+    ctx = SimpleNamespace(
+        rng=rng, pets=pets, teams=teams, states=StateManager(), stats=stats, aura=AuraManager(),
+        weather=weather, cooldowns=CooldownManager(), racial=RacialPassiveManager(),
+        damage_pipeline=DamagePipeline(rng), heal_pipeline=HealPipeline(rng),
+        hitcheck=HitCheck(rng=rng, stats=stats, weather=weather), scripts=Scripts(),
+        log=MiniLog(level=log_level), acc_ctx=SimpleNamespace(dont_miss=False),
+        dispatcher=EffectDispatcher(), event_bus=EventBus(capacity=0),
+        apply_damage=lambda t, amt, trace=None: t.take_damage(amt),
+        apply_heal=lambda t, amt, trace=None: t.receive_heal(amt),
+    )
+    return ctx, list(pets.values())
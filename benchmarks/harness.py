@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+"""Benchmark registry, timer and baseline comparison.
+
+A benchmark is a setup function registered with @register_benchmark(name, group=...).
+It builds its fixtures and returns the zero-argument callable to time (or raises
+SkipBenchmark when an optional dependency / data file is missing). Setup cost is
+never timed.
+
+measure() calibrates how many calls make one batch of at least `min_time` seconds,
+then times `repeat` batches and keeps the best and median ns per op; `per_call`
+divides when one call performs several ops (e.g. 8 battles).
+"""
+
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when the benchmark cannot run here."""
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]]
+    per_call: int = 1
+    unit: str = "op"
+
+
+_BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def register_benchmark(name: str, *, group: str = "micro", per_call: int = 1, unit: str = "op"):
+    def deco(setup):
+        _BENCHMARKS[name] = Benchmark(name=name, group=group, setup=setup, per_call=per_call, unit=unit)
+        return setup
+    return deco
+
+
+def get_benchmarks(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """Registered benchmarks (in registration order) whose name or group matches a glob."""
+    out = []
+    for b in _BENCHMARKS.values():
+        if not patterns or any(fnmatch.fnmatch(b.name, p) or b.group == p for p in patterns):
+            out.append(b)
+    return out
+
+
+def measure(fn: Callable[[], Any], *, min_time: float = 0.2, repeat: int = 5, per_call: int = 1) -> Dict[str, Any]:
+    timer = time.perf_counter
+    number = 1
+    while True:
+        t0 = timer()
+        for _ in range(number):
+            fn()
+        elapsed = timer() - t0
+        if elapsed >= min_time or number >= 1 << 24:
+            break
+        # aim slightly past min_time so the timed batches do not straddle it
+        number = max(number * 2, int(number * 1.2 * min_time / max(elapsed, 1e-9)))
+
+    samples = []
+    for _ in range(max(1, int(repeat))):
+        t0 = timer()
+        for _ in range(number):
+            fn()
+        samples.append((timer() - t0) * 1e9 / (number * per_call))
+    return {
+        "ns_per_op": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+        "calls": number,
+        "repeat": len(samples),
+    }
+
+
+def run_benchmarks(
+    benchmarks: List[Benchmark],
+    *,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for b in benchmarks:
+        entry: Dict[str, Any] = {"group": b.group, "unit": b.unit}
+        try:
+            fn = b.setup()
+        except SkipBenchmark as exc:
+            entry["skipped"] = str(exc)
+        else:
+            entry.update(measure(fn, min_time=min_time, repeat=repeat, per_call=b.per_call))
+        results[b.name] = entry
+        if progress is not None:
+            progress(b.name, entry)
+    return results
+
+
+def make_baseline(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def save_baseline(path: Union[str, Path], baseline: Dict[str, Any]) -> None:
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Union[str, Path]) -> Dict[str, Any]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if int(data.get("version", 0)) != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version in {path}: {data.get('version')!r}")
+    return data
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any], *, threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """One row per benchmark present in both runs.
+
+    status: "regression" when current is slower than base by more than `threshold`
+    (0.10 = 10%), "improvement" when faster by more than it, "ok" otherwise and
+    "skipped" when either side did not run.
+    """
+    rows = []
+    b_res, c_res = base.get("results", {}), current.get("results", {})
+    for name, c in c_res.items():
+        b = b_res.get(name)
+        if b is None:
+            continue
+        if "ns_per_op" not in b or "ns_per_op" not in c:
+            rows.append({"name": name, "base_ns": b.get("ns_per_op"), "current_ns": c.get("ns_per_op"),
+                         "ratio": None, "status": "skipped"})
+            continue
+        ratio = float(c["ns_per_op"]) / max(float(b["ns_per_op"]), 1e-9)
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "base_ns": b["ns_per_op"], "current_ns": c["ns_per_op"],
+                     "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def format_ns(ns: Optional[float]) -> str:
+    if ns is None:
+        return "-"
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
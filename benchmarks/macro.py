@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+"""Macro-benchmarks: whole battles (reported per battle)."""
+
+import contextlib
+import io
+import os
+import random
+from typing import Any, Callable, Optional
+
+from benchmarks.fixtures import make_ctx
+from benchmarks.harness import register_benchmark
+from benchmarks.micro import REPO_ROOT
+from engine.core.battle_loop import BattleLoop
+
+BATTLES = 8
+MAX_ROUNDS = 50
+MAIN_TEAMS = ([40, 41, 42], [43, 44, 45])
+
+
+def run_loop_battle(
+    seed: int,
+    setup: Optional[Callable[[Any], None]] = None,
+    loop: Optional[BattleLoop] = None,
+) -> int:
+    """One 3v3 BattleLoop battle with seeded random legal actions; returns the rounds played.
+
+    setup(ctx), if given, runs on the fresh ctx first (e.g. to attach a profiler);
+    loop, if given, must be a fresh BattleLoop (e.g. one with a PhaseTimer attached).
+    """
+    ctx, pets = make_ctx(team_size=3, seed=seed)
+    if setup is not None:
+        setup(ctx)
+    loop = loop or BattleLoop()
+    choose = random.Random(seed)
+    for _ in range(MAX_ROUNDS):
+        a0 = choose.choice(loop.legal_actions(ctx, 0))
+        a1 = choose.choice(loop.legal_actions(ctx, 1))
+        if loop.run_round(ctx, a0, a1, pets).winner_team_id is not None:
+            break
+    return loop.round_no
+
+
+@register_benchmark("battle_loop.3v3", group="macro", per_call=BATTLES, unit="battle")
+def _battle_loop():
+    def run():
+        for seed in range(BATTLES):
+            run_loop_battle(seed)
+    return run
+
+
+@register_benchmark("main.run_battle.3v3", group="macro", per_call=BATTLES, unit="battle")
+def _main_run_battle():
+    import main
+
+    dl = main.DataLoader(str(REPO_ROOT))
+    with contextlib.redirect_stdout(io.StringIO()):
+        dl.load_all()
+    team0, team1 = MAIN_TEAMS
+
+    def run():
+        for seed in range(BATTLES):
+            main.run_battle(dl, team0, team1, seed=seed, verbose=False, log_file=os.devnull)
+    return run
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""Micro-benchmarks: one engine hot-path call per op."""
+
+from pathlib import Path
+
+from benchmarks.fixtures import AURA_DOT, BOUND_STATE, OPCODE_ROWS, make_ctx
+from benchmarks.harness import SkipBenchmark, register_benchmark
+from engine.core.rng import BlockRNG, CounterRNG
+from engine.effects.param_parser import ParamParser
+from engine.model.damage import DamageEvent
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_XLSX = REPO_ROOT / "wow_export_merged.xlsx"
+
+TICK_AURAS = 8
+RNG_BATCH = 256
+
+
+def _steady_ctx():
+    """Context whose damage / heal callbacks do not move HP, so every op sees the same state."""
+    ctx, pets = make_ctx()
+    ctx.apply_damage = lambda t, amt, trace=None: int(amt)
+    ctx.apply_heal = lambda t, amt, trace=None: int(amt)
+    actor, target = pets[0], pets[len(pets) // 2]
+    target.hp = target.max_hp // 2
+    return ctx, actor, target
+
+
+def _register_dispatch(prop_id: int) -> None:
+    @register_benchmark(f"dispatch.op{prop_id:04d}")
+    def setup():
+        ctx, actor, target = _steady_ctx()
+        effect_row = OPCODE_ROWS[prop_id]
+        dispatch = ctx.dispatcher.dispatch
+        return lambda: dispatch(ctx, actor, target, effect_row)
+
+
+for _prop_id in OPCODE_ROWS:
+    _register_dispatch(_prop_id)
+
+
+@register_benchmark("damage_pipeline.resolve")
+def _damage_resolve():
+    ctx, actor, target = _steady_ctx()
+    ev = DamageEvent(source_actor=actor, target=target, ability_id=101, effect_id=101, points=30)
+    resolve = ctx.damage_pipeline.resolve
+    return lambda: resolve(ctx, ev)
+
+
+@register_benchmark("rng.random.rand_hit")
+def _random_rand_hit():
+    import main
+
+    return main.RandomRNG(seed=1).rand_hit
+
+
+@register_benchmark("rng.counter.rand_hit")
+def _counter_rand_hit():
+    return CounterRNG(seed=1).rand_hit
+
+
+@register_benchmark("rng.block.rand_hit")
+def _block_rand_hit():
+    return BlockRNG(seed=1).rand_hit
+
+
+@register_benchmark(f"rng.block.draws.{RNG_BATCH}", per_call=RNG_BATCH, unit="draw")
+def _block_draws():
+    draws = BlockRNG(seed=1).draws
+    return lambda: draws("hit", RNG_BATCH)
+
+
+@register_benchmark("stats.sum_state")
+def _sum_state():
+    ctx, actor, target = _steady_ctx()
+    ctx.dispatcher.dispatch(ctx, actor, target, OPCODE_ROWS[26])  # aura whose meta binds BOUND_STATE
+    ctx.states.set(target.id, BOUND_STATE, 5)
+    assert ctx.stats.sum_state(ctx, target.id, BOUND_STATE) == 15
+    sum_state, pid = ctx.stats.sum_state, target.id
+    return lambda: sum_state(ctx, pid, BOUND_STATE)
+
+
+@register_benchmark(f"aura.tick.{TICK_AURAS}")
+def _aura_tick():
+    ctx, actor, target = _steady_ctx()
+    for i in range(TICK_AURAS):
+        # long enough that the auras never expire while being timed
+        ctx.aura.apply(owner_pet_id=target.id, caster_pet_id=actor.id, aura_id=AURA_DOT + i,
+                       duration=1 << 40, tickdown_first_round=False, source_effect_id=1)
+    tick, pid = ctx.aura.tick, target.id
+    return lambda: tick(pid)
+
+
+@register_benchmark("param_parser.parse")
+def _param_parse():
+    label, raw = "Points,Accuracy,IsPeriodic", "30,100,0"
+    parse = ParamParser.parse
+    return lambda: parse(label, raw)
+
+
+@register_benchmark("script_db.load_xlsx", group="load")
+def _script_db_load():
+    try:
+        from engine.data.script_db import ScriptDB
+    except ImportError as exc:
+        raise SkipBenchmark(f"ScriptDB unavailable: {exc}")
+    if not SCRIPT_XLSX.exists():
+        raise SkipBenchmark(f"{SCRIPT_XLSX.name} not found")
+    path = str(SCRIPT_XLSX)
+    return lambda: ScriptDB.from_xlsx(path)
@@ -72,3 +72,32 @@ def type_multiplier(attack_type: int, target_type: int) -> Tuple[float, str]:
     if WEAK_AGAINST.get(a) == t:
         return WEAK_MULT, "WEAK"
     return 1.0, "NEUTRAL"
+
+
+TYPE_COUNT: int = 10
+# Row/column used for any attack/target type outside 0..9 (always neutral).
+TYPE_UNKNOWN_INDEX: int = TYPE_COUNT
+
+
+def _build_type_mult_table() -> Tuple[Tuple[float, ...], ...]:
+    rows = []
+    for a in range(TYPE_COUNT + 1):
+        row = []
+        for t in range(TYPE_COUNT + 1):
+            if STRONG_AGAINST.get(a) == t:
+                row.append(STRONG_MULT)
+            elif WEAK_AGAINST.get(a) == t:
+                row.append(WEAK_MULT)
+            else:
+                row.append(1.0)
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+# Precomputed [attack_type][target_type] multipliers, shape (11, 11); index 10 = unknown type.
+TYPE_MULT_TABLE: Tuple[Tuple[float, ...], ...] = _build_type_mult_table()
+
+
+def type_index(pet_type: int) -> int:
+    """Table index for a pet/attack type (TYPE_UNKNOWN_INDEX when out of range)."""
+    return pet_type if 0 <= pet_type < TYPE_COUNT else TYPE_UNKNOWN_INDEX
@@ -21,7 +21,7 @@ Other weather-specific behaviors can be layered later via opcode semantics.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 
 # Weather state IDs (from this repo's DB2 export: BattlePetState.lua_name == "Weather_*")
@@ -103,6 +103,17 @@ WEATHER_EFFECTS: Dict[int, WeatherEffect] = {
 }
 
 
+# Precomputed weather x attack-type damage multipliers: weather id -> 11 multipliers
+# (attack types 0..9, index 10 = unknown type). Weathers without damage modifiers are omitted.
+NEUTRAL_DAMAGE_MULT_ROW: Tuple[float, ...] = (1.0,) * 11
+
+WEATHER_DAMAGE_MULT_TABLE: Dict[int, Tuple[float, ...]] = {
+    wid: tuple(float(eff.damage_mult_by_attack_type.get(a, 1.0)) for a in range(10)) + (1.0,)
+    for wid, eff in WEATHER_EFFECTS.items()
+    if eff.damage_mult_by_attack_type
+}
+
+
 def get_weather_effect(weather_state_id: int) -> Optional[WeatherEffect]:
     try:
         return WEATHER_EFFECTS.get(int(weather_state_id))
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any, List
 
 from engine.core.executor import AbilityTurnExecutor, TurnExecResult
+from engine.core.pet_index import pet_index
 from engine.core.scheduler import Scheduler
 from engine.core.tick_engine import TickEngine
 from engine.core.events import Event
@@ -17,13 +18,15 @@ class AbilityExecutor:
     # Minimal cross-turn infrastructure:
     # - TURN_START: tick cooldowns; resolve scheduled packets; process TURN_START ticks.
     # - TURN_END: process TURN_END ticks (DOT/HOT + aura duration/expire).
+    # - Reactive aura triggers: ON_ABILITY after a cast, on_action() / on_swap() for the battle loop
+    #   (damage / heal triggers run from the turn executor, see TickEngine).
     #
     # This is a framework for Prop22 (timer) / multi-turn abilities, not a full battle loop.
 
     def __init__(self):
-        self.turn_executor = AbilityTurnExecutor()
-        self.scheduler = Scheduler()
         self.tick_engine = TickEngine()
+        self.turn_executor = AbilityTurnExecutor(triggers=self.tick_engine)
+        self.scheduler = Scheduler()
         self.turn_no = 0
 
     def _bind_scheduler(self, ctx: Any) -> None:
@@ -36,37 +39,55 @@ class AbilityExecutor:
 
         # cooldown tick once per round
         # team control tick (ability lockouts)
+        self._tick_cooldowns(ctx)
+
+        # resolve scheduled packets
+        self._run_scheduled(ctx, pets)
+
+        # event ticks at TURN_START (optional)
+        self._process_ticks(ctx, pets, Event.TURN_START)
+
+        # Sync effective stats (best-effort) after TURN_START packets/ticks.
+        self._sync_stats(ctx, pets)
+
+    def on_turn_end(self, ctx: Any, pets: List[Any]) -> None:
+        self._bind_scheduler(ctx)
+        self._process_ticks(ctx, pets, Event.TURN_END)
+
+        # Sync effective stats after aura expiration.
+        self._sync_stats(ctx, pets)
+
+    # Turn phases (separate methods so engine.core.phases can time / trace them).
+    def _tick_cooldowns(self, ctx: Any) -> None:
         if hasattr(ctx, "teams") and ctx.teams is not None:
             ctx.teams.tick_down()
         if hasattr(ctx, "cooldowns"):
             ctx.cooldowns.tick_down()
             ctx.log.cooldown_tick()
 
-        # resolve scheduled packets
+    def _run_scheduled(self, ctx: Any, pets: List[Any]) -> None:
         ready = self.scheduler.tick()
+        idx = pet_index(ctx, pets) if ready else None
         for pkt in ready:
-            actor = next((p for p in pets if p.id == pkt.actor_id), None)
-            target = next((p for p in pets if p.id == pkt.target_id), None)
+            actor = idx.get(pkt.actor_id)
+            target = idx.get(pkt.target_id)
             if actor is None or target is None:
                 continue
             self.turn_executor.execute_turn(ctx, actor, target, pkt.effect_rows)
 
-        # event ticks at TURN_START (optional)
-        self.tick_engine.process_event(ctx, pets, Event.TURN_START)
+    def _process_ticks(self, ctx: Any, pets: List[Any], event: Event) -> None:
+        self.tick_engine.process_event(ctx, pets, event)
 
-        # Sync effective stats (best-effort) after TURN_START packets/ticks.
-        stats = getattr(ctx, "stats", None)
-        if stats is not None and hasattr(stats, "sync"):
-            try:
-                stats.sync(ctx, pets)
-            except Exception:
-                pass
+    def on_action(self, ctx: Any, pets: List[Any], pet: Any) -> None:
+        """`pet` is about to act (cast or swap): ON_ACTION triggers."""
+        self.tick_engine.process_owner_event(ctx, pets, pet, Event.ON_ACTION)
 
-    def on_turn_end(self, ctx: Any, pets: List[Any]) -> None:
-        self._bind_scheduler(ctx)
-        self.tick_engine.process_event(ctx, pets, Event.TURN_END)
+    def on_swap(self, ctx: Any, pets: List[Any], out_pet: Any, in_pet: Any) -> None:
+        """out_pet left the battlefield and in_pet entered it: ON_SWAP_OUT / ON_SWAP_IN triggers."""
+        self.tick_engine.process_owner_event(ctx, pets, out_pet, Event.ON_SWAP_OUT)
+        self.tick_engine.process_owner_event(ctx, pets, in_pet, Event.ON_SWAP_IN)
 
-        # Sync effective stats after aura expiration.
+    def _sync_stats(self, ctx: Any, pets: List[Any]) -> None:
         stats = getattr(ctx, "stats", None)
         if stats is not None and hasattr(stats, "sync"):
             try:
@@ -104,6 +125,7 @@ class AbilityExecutor:
             ctx.cooldowns.set(actor.id, ability_id, cd)
             ctx.log.cooldown_set(actor.id, ability_id, cd)
 
+        self.tick_engine.process_owner_event(ctx, (actor, target), actor, Event.ON_ABILITY)
         return AbilityUseResult(turn_result=tr, cooldown_set=cd)
 
 
@@ -199,5 +221,6 @@ class AbilityExecutor:
             if hasattr(ctx, "log"):
                 ctx.log.cooldown_set(getattr(actor, "id", 0), aid, cd)
 
+        self.tick_engine.process_owner_event(ctx, (actor, target), actor, Event.ON_ABILITY)
         return AbilityUseResult(turn_result=turn_result, cooldown_set=cd)
 
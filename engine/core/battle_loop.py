@@ -10,6 +10,41 @@ from engine.core.actions import ActionKind, BattleAction
 STATE_MOD_SPEED_PERCENT = 25  # BattlePetState: Mod_SpeedPercent
 
 
+def selected_abilities(pet: Any) -> List[Tuple[int, int]]:
+    """Return list[(slot_index, ability_id)] in stable slot order.
+
+    Supported shapes:
+      - pet.selected_abilities: list[int] length >= 3
+      - pet.ability_slots: dict[int->int] (1..3)
+      - pet.abilities: dict slot names -> ability_id (best-effort)
+    """
+    if hasattr(pet, "selected_abilities") and isinstance(getattr(pet, "selected_abilities"), list):
+        lst = [int(x) for x in getattr(pet, "selected_abilities")]
+        out = []
+        for i in range(3):
+            out.append((i + 1, int(lst[i]) if i < len(lst) else 0))
+        return out
+
+    if hasattr(pet, "ability_slots") and isinstance(getattr(pet, "ability_slots"), dict):
+        mp = getattr(pet, "ability_slots")
+        return [(1, int(mp.get(1, 0))), (2, int(mp.get(2, 0))), (3, int(mp.get(3, 0)))]
+
+    # Best-effort fallback: treat pet.abilities as already-selected mapping
+    if hasattr(pet, "abilities") and isinstance(getattr(pet, "abilities"), dict):
+        mp = getattr(pet, "abilities")
+        # allow either {1:..} or {"slot1":..}
+        def g(k1, k2):
+            if k1 in mp:
+                return int(mp.get(k1) or 0)
+            if k2 in mp:
+                return int(mp.get(k2) or 0)
+            return 0
+
+        return [(1, g(1, "slot1")), (2, g(2, "slot2")), (3, g(3, "slot3"))]
+
+    return [(1, 0), (2, 0), (3, 0)]
+
+
 @dataclass
 class RoundOutcome:
     round_no: int
@@ -94,12 +129,7 @@ class BattleLoop:
         self.ex.on_turn_start(ctx, pets)
 
         # Racial passive: on_round_start
-        racial = getattr(ctx, "racial", None)
-        if racial is not None and hasattr(racial, "on_round_start"):
-            try:
-                racial.on_round_start(ctx, pets)
-            except Exception:
-                pass
+        self._racial_hook(ctx, pets, "on_round_start")
 
         # Ensure dead actives are immediately replaced (no action this round).
         skip_team: Dict[int, bool] = {0: False, 1: False}
@@ -152,12 +182,7 @@ class BattleLoop:
         self.ex.on_turn_end(ctx, pets)
 
         # Racial passive: on_round_end
-        racial = getattr(ctx, "racial", None)
-        if racial is not None and hasattr(racial, "on_round_end"):
-            try:
-                racial.on_round_end(ctx, pets)
-            except Exception:
-                pass
+        self._racial_hook(ctx, pets, "on_round_end")
 
         winner = self._winner(ctx)
         return RoundOutcome(
@@ -171,6 +196,15 @@ class BattleLoop:
     # ---------------------------------------------------------------------
     # Internals
     # ---------------------------------------------------------------------
+    def _racial_hook(self, ctx: Any, pets: List[Any], hook: str) -> None:
+        racial = getattr(ctx, "racial", None)
+        fn = getattr(racial, hook, None) if racial is not None else None
+        if fn is not None:
+            try:
+                fn(ctx, pets)
+            except Exception:
+                pass
+
     def _pet_alive(self, pet: Any) -> bool:
         # Also consider undead immortality phase as "alive"
         return bool(getattr(pet, "alive", True)) and int(getattr(pet, "hp", 1)) > 0
@@ -205,38 +239,7 @@ class BattleLoop:
         return False
 
     def _get_selected_abilities(self, pet: Any) -> List[Tuple[int, int]]:
-        """Return list[(slot_index, ability_id)] in stable slot order.
-
-        Supported shapes:
-          - pet.selected_abilities: list[int] length >= 3
-          - pet.ability_slots: dict[int->int] (1..3)
-          - pet.abilities: dict slot names -> ability_id (best-effort)
-        """
-        if hasattr(pet, "selected_abilities") and isinstance(getattr(pet, "selected_abilities"), list):
-            lst = [int(x) for x in getattr(pet, "selected_abilities")]
-            out = []
-            for i in range(3):
-                out.append((i + 1, int(lst[i]) if i < len(lst) else 0))
-            return out
-
-        if hasattr(pet, "ability_slots") and isinstance(getattr(pet, "ability_slots"), dict):
-            mp = getattr(pet, "ability_slots")
-            return [(1, int(mp.get(1, 0))), (2, int(mp.get(2, 0))), (3, int(mp.get(3, 0)))]
-
-        # Best-effort fallback: treat pet.abilities as already-selected mapping
-        if hasattr(pet, "abilities") and isinstance(getattr(pet, "abilities"), dict):
-            mp = getattr(pet, "abilities")
-            # allow either {1:..} or {"slot1":..}
-            def g(k1, k2):
-                if k1 in mp:
-                    return int(mp.get(k1) or 0)
-                if k2 in mp:
-                    return int(mp.get(k2) or 0)
-                return 0
-
-            return [(1, g(1, "slot1")), (2, g(2, "slot2")), (3, g(3, "slot3"))]
-
-        return [(1, 0), (2, 0), (3, 0)]
+        return selected_abilities(pet)
 
     def _legal_swaps_only(self, ctx: Any, team_id: int, *, note: str = "") -> List[BattleAction]:
         team_id = int(team_id)
@@ -281,6 +284,9 @@ class BattleLoop:
         if self._pet_alive(pet):
             return False
 
+        # A dead pet's delayed packets (Prop22 timers it cast or that were aimed at it) never land.
+        self.ex.scheduler.cancel_pet(active_id)
+
         t = ctx.teams.teams[team_id]
         # Death replacement should not be blocked by swap-out lock (pet is dead).
         for idx, pid in enumerate(t.pet_ids):
@@ -297,6 +303,7 @@ class BattleLoop:
                 t.active_index = int(idx)
                 if hasattr(ctx, "log"):
                     ctx.log.swap(team_id, active_id, pid, forced=True, reason=reason)
+                self.ex.on_swap(ctx, list(ctx.pets.values()), pet, cand)
                 return True
 
         # Bypass swap-in lock as a last resort (keeps the battle progressing).
@@ -312,6 +319,7 @@ class BattleLoop:
             t.active_index = int(idx)
             if hasattr(ctx, "log"):
                 ctx.log.swap(team_id, active_id, pid, forced=True, reason=f"{reason}:BYPASS_SWAPIN")
+            self.ex.on_swap(ctx, list(ctx.pets.values()), pet, cand)
             return True
 
         return False
@@ -419,12 +427,16 @@ class BattleLoop:
         if use.kind == ActionKind.PASS:
             return
 
+        actives = (int(ctx.teams.active_pet_id(0)), int(ctx.teams.active_pet_id(1)))
+        self.ex.on_action(ctx, pets, ctx.pets.get(actives[team_id]))
+
         if use.kind == ActionKind.SWAP:
             before = int(ctx.teams.active_pet_id(team_id))
             ok, reason = ctx.teams.swap(team_id, int(use.swap_index), ctx)
             after = int(ctx.teams.active_pet_id(team_id))
             if hasattr(ctx, "log"):
                 ctx.log.swap(team_id, before, after, forced=False, reason=("OK" if ok else reason))
+            self._after_swaps(ctx, pets, actives)
             return
 
         # USE_ABILITY
@@ -435,6 +447,19 @@ class BattleLoop:
         if actor is None or target is None:
             return
         self.ex.use_ability_id(ctx, actor, target, int(use.ability_id), slot_index=int(use.slot_index))
+        # Abilities can force swaps too (TeamManager.force_swap_random).
+        self._after_swaps(ctx, pets, actives)
+
+    def _after_swaps(self, ctx: Any, pets: List[Any], actives: Tuple[int, int]) -> None:
+        """Run swap triggers for every team whose active pet is no longer actives[team].
+
+        The swapped-out pet's delayed packets are cancelled first, as for a death.
+        """
+        for tid in (0, 1):
+            after = int(ctx.teams.active_pet_id(tid))
+            if after != actives[tid]:
+                self.ex.scheduler.cancel_pet(actives[tid])
+                self.ex.on_swap(ctx, pets, ctx.pets.get(actives[tid]), ctx.pets.get(after))
 
     def _action_is_legal(self, a: BattleAction, legal: List[BattleAction]) -> bool:
         if a.kind == ActionKind.PASS:
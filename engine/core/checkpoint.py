@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+"""Round checkpoints: compact snapshots of BattleLoop state that can be restored later.
+
+capture() gathers the checkpoint() of every stateful manager on ctx (states, aura,
+cooldowns, teams, racial, weather), the executor's Scheduler and turn counter, the
+runtime fields of each pet and the RNG draw counters (so ctx.rng must be counter-based:
+CounterRNG or BlockRNG; other RNGs raise TypeError), and stores them as one
+zlib-compressed pickle (~1 KB for a 2v2/3v3 battle). restore() writes a checkpoint
+back into a ctx built the same way (same pets, same scripts), so the next
+BattleLoop.run_round continues exactly where the captured battle was:
+
+    cps = Checkpoints(every=5)
+    for ...:
+        loop.run_round(ctx, a0, a1, pets)
+        cps.maybe_capture(ctx, loop, pets)
+    round_no, blob = cps.nearest(23)
+    restore(blob, ctx2, loop2, pets2)          # then run rounds round_no+1 .. 23
+
+engine.core.replay uses this for seek(record, make_ctx, round_no, checkpoints).
+Logs, traces and event history are output, not state, and are not captured.
+"""
+
+import pickle
+import zlib
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from engine.core.rng import CounterRNG
+
+DEFAULT_CHECKPOINT_ROUNDS = 5
+
+# Mutable pet fields (everything else on a pet is fixed for the battle).
+PET_FIELDS = ("hp", "max_hp", "power", "speed", "alive", "base_max_hp", "base_power", "base_speed")
+
+# ctx attributes holding a manager with checkpoint() / restore(state).
+MANAGERS = ("states", "aura", "cooldowns", "teams", "racial")
+
+
+def _check_rng(rng: Any) -> None:
+    # Draw counts are the whole state only of counter-based generators; a SeqRNG (list pops)
+    # or a random.Random-backed RNG restored from counts would silently diverge.
+    if isinstance(rng, CounterRNG) or (hasattr(rng, "checkpoint") and hasattr(rng, "restore")):
+        return
+    raise TypeError(
+        f"cannot checkpoint ctx.rng of type {type(rng).__name__}: its position is not determined by "
+        f"draw counts; use a counter-based RNG (engine.core.rng.CounterRNG / BlockRNG)"
+    )
+
+
+def _rng_counts(rng: Any) -> Optional[Dict[str, int]]:
+    if rng is None:
+        return None
+    _check_rng(rng)
+    return dict(rng.checkpoint() if hasattr(rng, "checkpoint") else rng.used)
+
+
+def _restore_rng(rng: Any, counts: Optional[Dict[str, int]]) -> None:
+    if rng is None or counts is None:
+        return
+    _check_rng(rng)
+    if hasattr(rng, "restore"):
+        rng.restore(counts)
+    else:
+        rng.used.clear()
+        rng.used.update(counts)
+
+
+def capture(ctx: Any, loop: Any, pets: List[Any]) -> bytes:
+    """Checkpoint the battle as it stands after loop.round_no rounds."""
+    ex = loop.ex
+    state: Dict[str, Any] = {
+        "round": int(loop.round_no),
+        "turn": int(ex.turn_no),
+        "scheduler": ex.scheduler.checkpoint(),
+        "pets": tuple(
+            (int(p.id), tuple((f, getattr(p, f)) for f in PET_FIELDS if hasattr(p, f)), getattr(p, "tags", None))
+            for p in pets
+        ),
+        "rng": _rng_counts(getattr(ctx, "rng", None)),
+    }
+    for name in MANAGERS:
+        mgr = getattr(ctx, name, None)
+        if mgr is not None and hasattr(mgr, "checkpoint"):
+            state[name] = mgr.checkpoint()
+    weather = getattr(ctx, "weather", None)
+    if weather is not None and hasattr(weather, "checkpoint"):
+        state["weather"] = weather.checkpoint()
+    mods = getattr(ctx, "cooldown_mods", None)
+    if mods:
+        state["cooldown_mods"] = tuple(mods.items())
+    btl = getattr(ctx, "btl", None)
+    if btl is not None:
+        state["btl"] = dict(vars(btl))
+    return zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def restore(blob: bytes, ctx: Any, loop: Any, pets: List[Any]) -> int:
+    """Write a capture() back into ctx / loop / pets; returns the checkpoint's round."""
+    state = pickle.loads(zlib.decompress(blob))
+    _restore_rng(getattr(ctx, "rng", None), state["rng"])  # first: rejects a non-counter RNG untouched
+    ex = loop.ex
+    loop.round_no = state["round"]
+    ex.turn_no = state["turn"]
+    ex.scheduler.restore(state["scheduler"])
+
+    by_id = {int(p.id): p for p in pets}
+    for pid, values, tags in state["pets"]:
+        pet = by_id.get(pid)
+        if pet is None:
+            continue
+        for f, v in values:
+            setattr(pet, f, v)
+        if tags is not None:
+            pet.tags = tags
+
+    for name in MANAGERS:
+        mgr = getattr(ctx, name, None)
+        if name in state and mgr is not None:
+            mgr.restore(state[name])
+    weather = getattr(ctx, "weather", None)
+    if "weather" in state and weather is not None:
+        weather.restore(state["weather"], getattr(ctx, "aura", None))
+    if "cooldown_mods" in state:
+        ctx.cooldown_mods = dict(state["cooldown_mods"])
+    elif getattr(ctx, "cooldown_mods", None):
+        ctx.cooldown_mods = {}
+    if "btl" in state:
+        btl = getattr(ctx, "btl", None)
+        if btl is None:
+            ctx.btl = btl = SimpleNamespace()
+        vars(btl).update(state["btl"])
+    return int(state["round"])
+
+
+class Checkpoints:
+    """Checkpoints of one battle, taken every `every` rounds (round_no -> capture() blob)."""
+
+    def __init__(self, every: int = DEFAULT_CHECKPOINT_ROUNDS):
+        self.every = max(1, int(every))
+        self._blobs: Dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    @property
+    def rounds(self) -> List[int]:
+        return sorted(self._blobs)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(b) for b in self._blobs.values())
+
+    def maybe_capture(self, ctx: Any, loop: Any, pets: List[Any]) -> bool:
+        """Capture after a round that is a multiple of `every` (once per round)."""
+        r = int(loop.round_no)
+        if r % self.every or r in self._blobs:
+            return False
+        self._blobs[r] = capture(ctx, loop, pets)
+        return True
+
+    def nearest(self, round_no: int) -> Optional[Tuple[int, bytes]]:
+        """Latest checkpoint taken at or before `round_no`, or None."""
+        best = None
+        for r in self._blobs:
+            if r <= round_no and (best is None or r > best):
+                best = r
+        return None if best is None else (best, self._blobs[best])
@@ -1,18 +1,92 @@
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
+
+# Subscribe with ev=ANY_EVENT to receive every event.
+ANY_EVENT = None
+
 
 @dataclass
 class EventBus:
+    # History of (ev, payload). capacity: None = unbounded (default), 0 = no history,
+    # N = keep the last N events.
     events: List[Tuple[Any, Any]] = field(default_factory=list)
     logger: Optional[Any] = None
+    capacity: Optional[int] = None
+    # batched=True queues events until flush(); history is still recorded at emit time.
+    batched: bool = False
+
+    def __post_init__(self):
+        self._subs: Dict[Any, List[Callable[[Any, Any], None]]] = {}
+        self._pending: List[Tuple[Any, Any]] = []
+        if self.capacity is not None:
+            self.set_capacity(self.capacity)
+
+    def set_capacity(self, capacity: Optional[int]) -> None:
+        self.capacity = capacity
+        if capacity is None:
+            self.events = list(self.events)
+        else:
+            self.events = deque(self.events, maxlen=max(0, int(capacity)))
+
+    def _records(self) -> bool:
+        return self.capacity is None or self.capacity > 0
+
+    def subscribe(self, ev: Any, fn: Callable[[Any, Any], None]) -> None:
+        """Call fn(ev, payload) for every `ev` (ANY_EVENT: every event)."""
+        self._subs.setdefault(ev, []).append(fn)
+
+    def unsubscribe(self, ev: Any, fn: Callable[[Any, Any], None]) -> None:
+        subs = self._subs.get(ev)
+        if subs and fn in subs:
+            subs.remove(fn)
+            if not subs:
+                self._subs.pop(ev, None)
+
+    def has_subscribers(self, ev: Any) -> bool:
+        """True if emitting `ev` reaches anyone (history, logger or a subscriber).
+
+        Producers can skip building expensive payloads when this is False.
+        """
+        return (
+            self._records()
+            or self.logger is not None
+            or ev in self._subs
+            or ANY_EVENT in self._subs
+        )
 
     def emit(self, ev, payload=None):
-        self.events.append((ev, payload))
+        if self._records():
+            self.events.append((ev, payload))
+        if self.batched:
+            if self.logger is not None or self._subs:
+                self._pending.append((ev, payload))
+            return
+        self._deliver(ev, payload)
+
+    def emit_lazy(self, ev: Any, build: Callable[[], Any]) -> None:
+        """emit(ev, build()) if anyone listens for `ev`; build is not called otherwise."""
+        if self.has_subscribers(ev):
+            self.emit(ev, build())
+
+    def flush(self) -> int:
+        """Deliver queued events (batched mode) in emit order; returns how many were delivered."""
+        pending, self._pending = self._pending, []
+        for ev, payload in pending:
+            self._deliver(ev, payload)
+        return len(pending)
+
+    def _deliver(self, ev: Any, payload: Any) -> None:
         if self.logger is not None:
             try:
                 self.logger.log(ev, payload)
             except Exception:
                 pass
+        if self._subs:
+            for fn in self._subs.get(ev, ()):
+                fn(ev, payload)
+            for fn in self._subs.get(ANY_EVENT, ()):
+                fn(ev, payload)
 
     def set_logger(self, logger: Optional[Any]) -> None:
         self.logger = logger
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+"""Buffered JSONL event writer (EventBus logger) and the matching reader helpers.
+
+One writer keeps one file handle open (one file per battle, or one shard file shared by
+many battles) and writes records in blocks of `block_records` lines. The file may be
+compressed on the fly: compression is taken from the suffix (".gz" -> gzip, ".xz" /
+".lzma" -> lzma) unless given explicitly.
+
+Record schema (unchanged): {"seq", "ts", "event", "payload"} plus "battle" when the
+writer is told which battle it is writing (shard files). `ts` depends on `clock`:
+
+    CLOCK_SEQ        ts = seq (default; deterministic, byte-identical reruns)
+    CLOCK_MONOTONIC  seconds since the writer was created (time.monotonic)
+    CLOCK_WALL       local wall-clock time "%Y-%m-%d %H:%M:%S" (the historical format)
+"""
+
+import gzip
+import json
+import lzma
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+
+CLOCK_SEQ = "seq"
+CLOCK_MONOTONIC = "monotonic"
+CLOCK_WALL = "wall"
+CLOCKS = (CLOCK_SEQ, CLOCK_MONOTONIC, CLOCK_WALL)
+
+COMPRESSION_SUFFIXES: Dict[str, str] = {
+    ".gz": "gzip",
+    ".xz": "lzma",
+    ".lzma": "lzma",
+}
+
+DEFAULT_BLOCK_RECORDS = 512
+
+PathLike = Union[str, Path]
+
+
+def compression_for(path: PathLike) -> Optional[str]:
+    """"gzip" / "lzma" from the file suffix, None for plain text."""
+    return COMPRESSION_SUFFIXES.get(Path(path).suffix.lower())
+
+
+def open_event_file(path: PathLike, mode: str = "r", compression: Optional[str] = None) -> IO[str]:
+    """Open an event file in text mode ("r", "w" or "a"), transparently (de)compressing."""
+    if compression is None:
+        compression = compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if compression == "lzma":
+        return lzma.open(path, mode + "t", encoding="utf-8")
+    if compression not in (None, "none"):
+        raise ValueError(f"unknown event log compression: {compression!r}")
+    return open(path, mode, encoding="utf-8")
+
+
+def iter_event_records(path: PathLike) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a (possibly compressed) JSONL or binary (.wpev) event file.
+
+    Unparsable lines come back as {"event": "__PARSE_ERROR__", "raw": line}.
+    """
+    if Path(path).suffix.lower() == ".wpev":
+        from engine.core.event_binary import iter_binary_records
+
+        yield from iter_binary_records(path)
+        return
+    with open_event_file(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except Exception:
+                yield {"event": "__PARSE_ERROR__", "raw": line}
+
+
+class JsonlEventWriter:
+    """EventBus logger writing JSONL records through one buffered file handle.
+
+    The file is opened on the first flush (no events, no file), `mode` "a" appends like
+    the old per-event logger, "w" truncates. Call close() (or use it as a context
+    manager) at the end of the battle / shard; unflushed records are lost otherwise.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        mode: str = "a",
+        compression: Optional[str] = None,
+        block_records: int = DEFAULT_BLOCK_RECORDS,
+        clock: str = CLOCK_SEQ,
+    ):
+        if clock not in CLOCKS:
+            raise ValueError(f"unknown event log clock: {clock!r}")
+        if mode not in ("a", "w"):
+            raise ValueError(f"event log mode must be 'a' or 'w', not {mode!r}")
+        self.path = str(path)
+        self.mode = mode
+        self.compression = compression if compression is not None else compression_for(path)
+        self.block_records = max(1, int(block_records))
+        self.clock = clock
+        self.seq = 0
+        # Tag records with this battle key when set (several battles in one shard file).
+        self.battle: Optional[Any] = None
+        self._t0 = time.monotonic()
+        self._buf: List[str] = []
+        self._fh: Optional[IO[str]] = None
+        self._closed = False
+
+    def _ts(self) -> Any:
+        if self.clock == CLOCK_SEQ:
+            return self.seq
+        if self.clock == CLOCK_MONOTONIC:
+            return round(time.monotonic() - self._t0, 6)
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def log(self, event: Any, payload: Optional[Dict[str, Any]] = None) -> None:
+        if self._closed:
+            raise ValueError("event log writer is closed")
+        self.seq += 1
+        record: Dict[str, Any] = {
+            "seq": self.seq,
+            "ts": self._ts(),
+            "event": event,
+            "payload": payload or {},
+        }
+        if self.battle is not None:
+            record["battle"] = self.battle
+        self._buf.append(json.dumps(record, ensure_ascii=False))
+        if len(self._buf) >= self.block_records:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records as one block (one write call)."""
+        if not self._buf:
+            return
+        if self._fh is None:
+            self._fh = open_event_file(self.path, self.mode, self.compression)
+        self._buf.append("")
+        self._fh.write("\n".join(self._buf))
+        self._buf = []
+        if self.compression in (None, "none"):
+            self._fh.flush()  # compressed streams flush on close (sync flushes cost ratio)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self._closed = True
+
+    def __enter__(self) -> "JsonlEventWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -7,5 +7,22 @@ class Event(str, Enum):
     ON_HEAL = "ON_HEAL"
     ON_MISS = "ON_MISS"
 
+    # Aura trigger events (DB2 BattlePetAbilityTurn.EventTypeEnum, see ScriptDBConfig.default).
+    # Dispatched per owner by TickEngine.process_owner_event (POST_TICK after TURN_END ticks).
+    ON_APPLY = "ON_APPLY"
+    ON_DAMAGE_TAKEN = "ON_DAMAGE_TAKEN"
+    ON_DAMAGE_DEALT = "ON_DAMAGE_DEALT"
+    ON_HEAL_TAKEN = "ON_HEAL_TAKEN"
+    ON_HEAL_DEALT = "ON_HEAL_DEALT"
+    ON_AURA_REMOVED = "ON_AURA_REMOVED"
+    ON_ACTION = "ON_ACTION"
+    ON_ABILITY = "ON_ABILITY"
+    ON_SWAP_IN = "ON_SWAP_IN"
+    ON_SWAP_OUT = "ON_SWAP_OUT"
+    POST_TICK = "POST_TICK"
+
+# Events that drive DOT/HOT style periodic payloads (round boundaries).
+PERIODIC_EVENTS = (Event.TURN_START.value, Event.TURN_END.value)
+
 # Backward/forward compatible alias
 BattleEvent = Event
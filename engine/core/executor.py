@@ -23,6 +23,13 @@ class AbilityTurnExecutor:
     #   - STOP_ABILITY: stop executing remaining effects in THIS turn and signal caller
     #
     # This class intentionally does not know about cooldowns, multi-turn state machines, etc.
+    #
+    # triggers (optional, a TickEngine): before_effect/after_effect are called around every
+    # dispatched row so reactive aura triggers (damage / heal dealt and taken, aura applied /
+    # removed) can run.
+
+    def __init__(self, triggers: Any = None):
+        self.triggers = triggers
 
     def execute_turn(self, ctx: Any, actor: Any, target: Any, effect_rows: List[Any]) -> TurnExecResult:
         # Reset transient per-turn contexts at the start of each turn execution.
@@ -66,7 +73,10 @@ class AbilityTurnExecutor:
             except Exception:
                 eff_target = target
 
+            watch = self.triggers.before_effect(ctx, actor, eff_target) if self.triggers is not None else None
             last = ctx.dispatcher.dispatch(ctx, actor, eff_target, row)
+            if watch is not None:
+                self.triggers.after_effect(ctx, actor, eff_target, watch)
 
             # Record previous effect execution outcome (for control opcodes like Prop194).
             try:
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+"""Instance-level method shadowing shared by the opt-in instrumentation.
+
+DispatchProfiler, PhaseTimer (hook_phases) and SpanTracer all wrap methods on one
+object *instance* and later put the previous attribute back, so uninstrumented
+objects keep running the plain class methods. Wrappers stack: each one wraps
+whatever the instance currently resolves (possibly another tool's wrapper), so
+several tools can watch the same object; undo them in reverse order.
+"""
+
+from typing import Any, Callable
+
+_MISSING = object()
+
+
+def shadow_method(obj: Any, name: str, wrap: Callable[[Callable[..., Any]], Callable[..., Any]]) -> Callable[[], None]:
+    """Set obj.<name> to wrap(<current obj.name>); returns undo(), which restores the previous attribute."""
+    prev = vars(obj).get(name, _MISSING)
+    setattr(obj, name, wrap(getattr(obj, name)))
+
+    def undo() -> None:
+        if prev is _MISSING:
+            vars(obj).pop(name, None)
+        else:
+            setattr(obj, name, prev)
+
+    return undo
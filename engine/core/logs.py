@@ -1,71 +1,290 @@
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+# Log levels:
+# - LOG_OFF: record nothing
+# - LOG_SUMMARY: battle-state changes only (damage/heal/states/auras/cooldowns/swaps), no traces
+# - LOG_DEBUG: everything, including warnings, gate rolls, effect results (historical default)
+LOG_OFF = 0
+LOG_SUMMARY = 1
+LOG_DEBUG = 2
+
+# Record kinds in column code order (ColumnarLog "kind" column); append only.
+LOG_KINDS = (
+    "warn", "unsupported", "effect_result", "damage", "heal", "state_set",
+    "aura_apply", "aura_refresh", "aura_stack", "aura_expire", "aura_remove", "dispel",
+    "cannot_act", "cooldown_set", "cooldown_tick", "gate", "timer_schedule", "swap",
+)
+DEBUG_KINDS = frozenset({"warn", "unsupported", "effect_result", "cooldown_tick", "gate", "timer_schedule"})
+
+
+def _pid(pet: Any) -> int:
+    return int(getattr(pet, "id", 0) or 0)
+
+
 @dataclass
 class MiniLog:
     records: List[Any] = field(default_factory=list)
+    level: int = LOG_DEBUG
+    # Keep only the last `capacity` records (records becomes a deque); None = unbounded.
+    capacity: Optional[int] = None
+
+    def __post_init__(self):
+        if self.capacity is not None:
+            self.records = deque(self.records, maxlen=max(1, int(self.capacity)))
+
+    def clear(self) -> None:
+        self.records.clear()
 
     # Diagnostics / semantics
     def warn(self, effect_row, code: str, detail: Optional[Dict[str, Any]] = None):
         """Record a non-fatal validation / semantics warning."""
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("warn", effect_row.prop_id, str(code), dict(detail or {})))
 
     # Generic results
     def unsupported(self, effect_row, reason: str):
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("unsupported", effect_row.prop_id, str(reason)))
 
     def effect_result(self, effect_row, actor, target, code: str, reason: Optional[str] = None):
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("effect_result", effect_row.prop_id, str(code), (str(reason) if reason is not None else None)))
 
     # Damage / Heal
     def damage(self, effect_row, actor, target, resolved):
-        self.records.append(("damage", effect_row.prop_id, int(resolved.final_damage), dict(resolved.trace or {})))
+        if self.level < LOG_SUMMARY:
+            return
+        trace = dict(resolved.trace or {}) if self.level >= LOG_DEBUG else None
+        self.records.append(("damage", effect_row.prop_id, int(resolved.final_damage), trace))
 
     def heal(self, effect_row, actor, target, final_heal: int, trace: Optional[Dict[str, Any]] = None):
-        self.records.append(("heal", effect_row.prop_id, int(final_heal), dict(trace or {})))
+        if self.level < LOG_SUMMARY:
+            return
+        trace = dict(trace or {}) if self.level >= LOG_DEBUG else None
+        self.records.append(("heal", effect_row.prop_id, int(final_heal), trace))
 
     # State ops
     def state_set(self, effect_row, actor, target, state_id: int, value: int):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("state_set", effect_row.prop_id, int(state_id), int(value), int(getattr(target, "id", 0))))
 
     # Aura ops
     def aura_apply(self, effect_row, actor, target, aura_id: int, duration: int, tickdown_first_round: bool, reason: str):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("aura_apply", effect_row.prop_id, int(aura_id), int(duration), bool(tickdown_first_round), str(reason)))
 
     def aura_refresh(self, effect_row, actor, target, aura_id: int, remaining_duration: int, tickdown_first_round: bool):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("aura_refresh", effect_row.prop_id, int(aura_id), int(remaining_duration), bool(tickdown_first_round)))
 
     def aura_stack(self, effect_row, actor, target, aura_id: int, stacks: int, max_stack: int):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("aura_stack", effect_row.prop_id, int(aura_id), int(stacks), int(max_stack)))
 
     def aura_expire(self, owner_pet_id: int, aura_id: int):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("aura_expire", int(owner_pet_id), int(aura_id)))
 
     def aura_remove(self, owner_pet_id: int, aura_id: int, reason: str):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("aura_remove", int(owner_pet_id), int(aura_id), str(reason)))
 
     def dispel(self, effect_row, actor, target, removed_count: int, reason: str):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("dispel", effect_row.prop_id, int(removed_count), str(reason), int(getattr(target, "id", 0))))
 
     
     def cannot_act(self, pet_id: int, reason: str):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("cannot_act", int(pet_id), str(reason)))
 
     # Cooldowns
     def cooldown_set(self, pet_id: int, ability_id: int, turns: int):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("cooldown_set", int(pet_id), int(ability_id), int(turns)))
 
     def cooldown_tick(self):
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("cooldown_tick",))
 
     # Gate
     def gate(self, effect_row, actor, target, chance_norm: float, roll: float, passed: bool):
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("gate", effect_row.prop_id, float(chance_norm), float(roll), bool(passed)))
 
     # Timer scheduling
     def timer_schedule(self, effect_row, actor, target, delay_turns: int, payload_count: int, tag: str):
+        if self.level < LOG_DEBUG:
+            return
         self.records.append(("timer_schedule", effect_row.prop_id, int(delay_turns), int(payload_count), str(tag)))
 
     # Battle loop
     def swap(self, team_id: int, from_pet_id: int, to_pet_id: int, forced: bool, reason: str):
+        if self.level < LOG_SUMMARY:
+            return
         self.records.append(("swap", int(team_id), int(from_pet_id), int(to_pet_id), bool(forced), str(reason)))
+
+
+class ColumnarLog:
+    """MiniLog-compatible log stored as parallel int64 columns.
+
+    Columns (COLUMNS): kind (index into LOG_KINDS), prop_id (-1 if none), pet_id (target /
+    owner), key (aura/state/ability id, source pet for damage/heal), value (amount, duration,
+    stacks, turns, ...) and text (index into `strings` for codes/reasons, -1 if none).
+    Traces and warning details are not kept. With `capacity`, columns are a fixed-size ring
+    buffer holding the last `capacity` records.
+    """
+
+    COLUMNS = ("kind", "prop_id", "pet_id", "key", "value", "text")
+
+    def __init__(self, level: int = LOG_SUMMARY, capacity: Optional[int] = None):
+        self.level = int(level)
+        self.capacity = max(1, int(capacity)) if capacity is not None else None
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._kind_ids = {k: i for i, k in enumerate(LOG_KINDS)}
+        self.clear()
+
+    def clear(self) -> None:
+        n = self.capacity or 0
+        self._cols = [array("q", bytes(8 * n)) for _ in self.COLUMNS]
+        self.total = 0  # records written, including ones overwritten by the ring buffer
+
+    def __len__(self) -> int:
+        return self.total if self.capacity is None else min(self.total, self.capacity)
+
+    def _text(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        s = str(s)
+        i = self._string_ids.get(s)
+        if i is None:
+            i = self._string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def _add(self, kind: str, prop_id: int = -1, pet_id: int = 0, key: int = 0, value: int = 0, text: int = -1) -> None:
+        row = (self._kind_ids[kind], int(prop_id), int(pet_id), int(key), int(value), int(text))
+        if self.capacity is None:
+            for col, v in zip(self._cols, row):
+                col.append(v)
+        else:
+            i = self.total % self.capacity
+            for col, v in zip(self._cols, row):
+                col[i] = v
+        self.total += 1
+
+    def export(self) -> Dict[str, Any]:
+        """Columns in chronological order (int64 numpy arrays, or lists without numpy),
+        plus the `kinds` and `strings` lookup tables."""
+        n = len(self)
+        start = 0 if self.capacity is None or self.total <= self.capacity else self.total % self.capacity
+        out: Dict[str, Any] = {}
+        for name, col in zip(self.COLUMNS, self._cols):
+            data = col[start:n] + col[:start] if start else col[:n]
+            out[name] = np.frombuffer(data, dtype=np.int64).copy() if np is not None else data.tolist()
+        out["kinds"] = list(LOG_KINDS)
+        out["strings"] = list(self.strings)
+        return out
+
+    # Diagnostics / semantics
+    def warn(self, effect_row, code: str, detail: Optional[Dict[str, Any]] = None):
+        if self.level >= LOG_DEBUG:
+            self._add("warn", effect_row.prop_id, text=self._text(code))
+
+    def unsupported(self, effect_row, reason: str):
+        if self.level >= LOG_DEBUG:
+            self._add("unsupported", effect_row.prop_id, text=self._text(reason))
+
+    def effect_result(self, effect_row, actor, target, code: str, reason: Optional[str] = None):
+        if self.level >= LOG_DEBUG:
+            self._add("effect_result", effect_row.prop_id, _pid(target), text=self._text(code))
+
+    # Damage / Heal
+    def damage(self, effect_row, actor, target, resolved):
+        if self.level >= LOG_SUMMARY:
+            self._add("damage", effect_row.prop_id, _pid(target), _pid(actor), resolved.final_damage)
+
+    def heal(self, effect_row, actor, target, final_heal: int, trace: Optional[Dict[str, Any]] = None):
+        if self.level >= LOG_SUMMARY:
+            self._add("heal", effect_row.prop_id, _pid(target), _pid(actor), final_heal)
+
+    # State ops
+    def state_set(self, effect_row, actor, target, state_id: int, value: int):
+        if self.level >= LOG_SUMMARY:
+            self._add("state_set", effect_row.prop_id, _pid(target), state_id, value)
+
+    # Aura ops
+    def aura_apply(self, effect_row, actor, target, aura_id: int, duration: int, tickdown_first_round: bool, reason: str):
+        if self.level >= LOG_SUMMARY:
+            self._add("aura_apply", effect_row.prop_id, _pid(target), aura_id, duration, self._text(reason))
+
+    def aura_refresh(self, effect_row, actor, target, aura_id: int, remaining_duration: int, tickdown_first_round: bool):
+        if self.level >= LOG_SUMMARY:
+            self._add("aura_refresh", effect_row.prop_id, _pid(target), aura_id, remaining_duration)
+
+    def aura_stack(self, effect_row, actor, target, aura_id: int, stacks: int, max_stack: int):
+        if self.level >= LOG_SUMMARY:
+            self._add("aura_stack", effect_row.prop_id, _pid(target), aura_id, stacks)
+
+    def aura_expire(self, owner_pet_id: int, aura_id: int):
+        if self.level >= LOG_SUMMARY:
+            self._add("aura_expire", -1, owner_pet_id, aura_id)
+
+    def aura_remove(self, owner_pet_id: int, aura_id: int, reason: str):
+        if self.level >= LOG_SUMMARY:
+            self._add("aura_remove", -1, owner_pet_id, aura_id, text=self._text(reason))
+
+    def dispel(self, effect_row, actor, target, removed_count: int, reason: str):
+        if self.level >= LOG_SUMMARY:
+            self._add("dispel", effect_row.prop_id, _pid(target), value=removed_count, text=self._text(reason))
+
+    def cannot_act(self, pet_id: int, reason: str):
+        if self.level >= LOG_SUMMARY:
+            self._add("cannot_act", -1, pet_id, text=self._text(reason))
+
+    # Cooldowns
+    def cooldown_set(self, pet_id: int, ability_id: int, turns: int):
+        if self.level >= LOG_SUMMARY:
+            self._add("cooldown_set", -1, pet_id, ability_id, turns)
+
+    def cooldown_tick(self):
+        if self.level >= LOG_DEBUG:
+            self._add("cooldown_tick")
+
+    # Gate
+    def gate(self, effect_row, actor, target, chance_norm: float, roll: float, passed: bool):
+        if self.level >= LOG_DEBUG:
+            self._add("gate", effect_row.prop_id, _pid(target), value=int(bool(passed)))
+
+    # Timer scheduling
+    def timer_schedule(self, effect_row, actor, target, delay_turns: int, payload_count: int, tag: str):
+        if self.level >= LOG_DEBUG:
+            self._add("timer_schedule", effect_row.prop_id, _pid(target), payload_count, delay_turns, self._text(tag))
+
+    # Battle loop
+    def swap(self, team_id: int, from_pet_id: int, to_pet_id: int, forced: bool, reason: str):
+        if self.level >= LOG_SUMMARY:
+            self._add("swap", -1, to_pet_id, from_pet_id, team_id, self._text(reason))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+
+class PetIndex:
+    # id -> pet lookup for resolving scheduled packet / periodic aura actor and target ids.
+    #
+    # The battle loop passes the participating pets around as a list; resolving ids against that
+    # list with a linear scan made every scheduled packet and every periodic aura tick O(n).
+    # The engine context already keeps an id -> pet dict (ctx.pets) that is updated whenever a
+    # pet is replaced, so the index reads through it instead of caching a copy that could go
+    # stale; only a ctx without ctx.pets gets a map built from the list (once per event).
+
+    __slots__ = ("_by_id",)
+
+    def __init__(self, by_id: Optional[Mapping[int, Any]] = None):
+        self._by_id: Mapping[int, Any] = by_id if by_id is not None else {}
+
+    @classmethod
+    def from_pets(cls, pets: Sequence[Any]) -> "PetIndex":
+        by_id: Dict[int, Any] = {}
+        for p in pets:
+            pid = int(getattr(p, "id", 0) or 0)
+            # First occurrence wins (same as the previous `next(...)` scan).
+            if pid not in by_id:
+                by_id[pid] = p
+        return cls(by_id)
+
+    def get(self, pet_id: int) -> Optional[Any]:
+        return self._by_id.get(int(pet_id))
+
+    def __contains__(self, pet_id: int) -> bool:
+        return int(pet_id) in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+def pet_index(ctx: Any, pets: Sequence[Any]) -> PetIndex:
+    """Id lookup over ctx.pets when it is an id -> pet dict, else over `pets`."""
+    by_id = getattr(ctx, "pets", None)
+    if isinstance(by_id, dict):
+        return PetIndex(by_id)
+    return PetIndex.from_pets(pets)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+"""Per-phase wall time of BattleLoop.run_round, aggregated into histograms.
+
+    timer = PhaseTimer()
+    timer.attach(loop)               # or: with timer.attached(loop): ...
+    ...run rounds / battles (one timer can watch many loops)...
+    timer.detach(loop)
+    timer.snapshot()                 # {"round/turn_start/scheduler": {"count": .., "p90_us": .., ...}}
+    print(timer.format_table())
+    timer.export("phases.json")
+
+Phases nest, so every phase is keyed by its path from the round:
+
+    round
+      turn_start             AbilityExecutor.on_turn_start
+        cooldowns            team lockout + cooldown tick_down
+        scheduler            Scheduler.tick and the ready packets
+        ticks                TickEngine.process_event(TURN_START)
+        stats_sync           ctx.stats.sync
+      racial_start / racial_end   RacialPassiveManager.on_round_start / on_round_end
+      ensure_active          forced swaps of dead actives
+      order                  BattleLoop._order
+        effective_speed
+      first_action / second_action
+      turn_end               AbilityExecutor.on_turn_end (ticks, stats_sync)
+      winner
+
+hook_phases() does the instrumentation by shadowing those methods on the loop and
+its executor *instances* (like DispatchProfiler.attach), so an unhooked loop runs
+the plain class methods. Times are inclusive; "self" is the part of a phase not
+covered by its sub-phases.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from engine.core.instrument import shadow_method
+
+PHASES_VERSION = 1
+
+
+def _action_label(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    btl = getattr(args[0] if args else kwargs.get("ctx"), "btl", None)
+    return "second_action" if getattr(btl, "phase", "") == "SECOND_ACTION" else "first_action"
+
+
+def _racial_label(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    hook = args[2] if len(args) > 2 else kwargs.get("hook", "")
+    return "racial_end" if hook == "on_round_end" else "racial_start"
+
+
+# (owner, method, label): owner "" is the BattleLoop, "ex" its AbilityExecutor.
+# label is a phase name or label(args, kwargs) for methods that run in several phases.
+ROUND_PHASES: Tuple[Tuple[str, str, Union[str, Callable[..., str]]], ...] = (
+    ("", "run_round", "round"),
+    ("ex", "on_turn_start", "turn_start"),
+    ("ex", "on_turn_end", "turn_end"),
+    ("ex", "_tick_cooldowns", "cooldowns"),
+    ("ex", "_run_scheduled", "scheduler"),
+    ("ex", "_process_ticks", "ticks"),
+    ("ex", "_sync_stats", "stats_sync"),
+    ("", "_racial_hook", _racial_label),
+    ("", "_ensure_active_alive", "ensure_active"),
+    ("", "_order", "order"),
+    ("", "_effective_speed", "effective_speed"),
+    ("", "_exec_if_not_skipped", _action_label),
+    ("", "_winner", "winner"),
+)
+
+
+def hook_phases(
+    loop: Any,
+    on_enter: Callable[[str, Tuple[Any, ...], Dict[str, Any]], None],
+    on_exit: Callable[[str], None],
+) -> Callable[[], None]:
+    """Call on_enter(label, args, kwargs) / on_exit(label) around every ROUND_PHASES method.
+
+    Returns undo(). Hooks stack (each wraps whatever the instance currently has), so
+    several observers can watch one loop; undo them in reverse order.
+    """
+    undos: List[Callable[[], None]] = []
+    for owner_name, name, label in ROUND_PHASES:
+        owner = getattr(loop, owner_name) if owner_name else loop
+        if getattr(owner, name, None) is None:
+            continue
+        undos.append(shadow_method(owner, name, lambda inner, label=label: _wrap(inner, label, on_enter, on_exit)))
+
+    def undo() -> None:
+        for u in reversed(undos):
+            u()
+        undos.clear()
+
+    return undo
+
+
+def _wrap(inner: Callable[..., Any], label: Any, on_enter: Callable, on_exit: Callable) -> Callable[..., Any]:
+    if callable(label):
+        def phase(*args, **kwargs):
+            name = label(args, kwargs)
+            on_enter(name, args, kwargs)
+            try:
+                return inner(*args, **kwargs)
+            finally:
+                on_exit(name)
+    else:
+        def phase(*args, **kwargs):
+            on_enter(label, args, kwargs)
+            try:
+                return inner(*args, **kwargs)
+            finally:
+                on_exit(label)
+    return phase
+
+
+def _bucket(ns: int) -> int:
+    """Histogram bucket: 0 is < 1 us, k >= 1 is [2**(k-1), 2**k) us."""
+    return (ns // 1000).bit_length()
+
+
+def bucket_bounds_us(k: int) -> Tuple[int, int]:
+    return (0, 1) if k == 0 else (1 << (k - 1), 1 << k)
+
+
+@dataclass
+class PhaseStats:
+    path: str
+    count: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    max_ns: int = 0
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, ns: int, self_ns: int) -> None:
+        self.count += 1
+        self.total_ns += ns
+        self.self_ns += self_ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        k = _bucket(ns)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def percentile_us(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen >= rank:
+                return round(min(float(bucket_bounds_us(k)[1]), self.max_ns / 1e3), 2)
+        return round(self.max_ns / 1e3, 2)
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.stats: Dict[str, PhaseStats] = {}
+        self._stack: List[List[Any]] = []  # [path, t0, ns spent in sub-phases]
+        self._undo: Dict[int, Callable[[], None]] = {}
+
+    def reset(self) -> None:
+        self.stats = {}
+        self._stack = []
+
+    def attach(self, loop: Any) -> None:
+        """Time loop's rounds from now on (idempotent)."""
+        if id(loop) in self._undo:
+            return
+        self._undo[id(loop)] = hook_phases(loop, self._enter, self._exit)
+
+    def detach(self, loop: Any) -> None:
+        undo = self._undo.pop(id(loop), None)
+        if undo is not None:
+            undo()
+
+    @contextmanager
+    def attached(self, loop: Any) -> Iterator["PhaseTimer"]:
+        self.attach(loop)
+        try:
+            yield self
+        finally:
+            self.detach(loop)
+
+    def _enter(self, label: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        stack = self._stack
+        path = f"{stack[-1][0]}/{label}" if stack else label
+        if path not in self.stats:  # created on entry: parents are always seen first
+            self.stats[path] = PhaseStats(path=path)
+        stack.append([path, time.perf_counter_ns(), 0])
+
+    def _exit(self, label: str) -> None:
+        path, t0, child_ns = self._stack.pop()
+        ns = time.perf_counter_ns() - t0
+        self.stats[path].add(ns, ns - child_ns)
+        if self._stack:
+            self._stack[-1][2] += ns
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Plain-dict copy per phase path, in tree order (siblings in first-seen order)."""
+        rounds = self.stats.get("round")
+        round_ns = rounds.total_ns if rounds is not None and rounds.total_ns else 0
+        seen = {path: i for i, path in enumerate(self.stats)}
+
+        def tree_key(path: str) -> Tuple[int, ...]:
+            parts = path.split("/")
+            return tuple(seen.get("/".join(parts[:i + 1]), -1) for i in range(len(parts)))
+
+        out = {}
+        for path in sorted(self.stats, key=tree_key):
+            st = self.stats[path]
+            out[path] = {
+                "count": st.count,
+                "total_ms": round(st.total_ns / 1e6, 3),
+                "self_ms": round(st.self_ns / 1e6, 3),
+                "share": round(st.total_ns / round_ns, 4) if round_ns else None,
+                "mean_us": round(st.total_ns / st.count / 1e3, 2) if st.count else 0.0,
+                "p50_us": st.percentile_us(0.50),
+                "p90_us": st.percentile_us(0.90),
+                "p99_us": st.percentile_us(0.99),
+                "max_us": round(st.max_ns / 1e3, 2),
+                "histogram_us": {f"{lo}-{hi}": n for lo, hi, n in
+                                 ((*bucket_bounds_us(k), st.buckets[k]) for k in sorted(st.buckets))},
+            }
+        return out
+
+    def export(self, path: Union[str, Path]) -> None:
+        data = {"version": PHASES_VERSION, "phases": self.snapshot()}
+        Path(path).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+    def format_table(self, *, max_depth: Optional[int] = None) -> str:
+        lines = [
+            f"{'phase':<32} {'count':>8} {'total_ms':>10} {'self_ms':>9} {'share':>6} "
+            f"{'mean_us':>9} {'p50_us':>8} {'p90_us':>8} {'p99_us':>8} {'max_us':>9}"
+        ]
+        for path, r in self.snapshot().items():
+            depth = path.count("/")
+            if max_depth is not None and depth > max_depth:
+                continue
+            name = "  " * depth + path.rsplit("/", 1)[-1]
+            share = f"{r['share']:>6.1%}" if r["share"] is not None else f"{'-':>6}"
+            lines.append(
+                f"{name[:32]:<32} {r['count']:>8} {r['total_ms']:>10.3f} {r['self_ms']:>9.3f} {share} "
+                f"{r['mean_us']:>9.2f} {r['p50_us']:>8.0f} {r['p90_us']:>8.0f} {r['p99_us']:>8.0f} {r['max_us']:>9.1f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+"""Compact battle records and deterministic replay through BattleLoop.run_round.
+
+A BattleLoop battle is fully determined by how its ctx is built (team specs + seed) and
+the (team0, team1) BattleAction pair of every round, so that is all a BattleRecord
+stores; the event log of any round can be regenerated on demand:
+
+    rec = BattleRecorder(spec, seed)
+    out = rec.run_round(loop, ctx, a0, a1, pets)        # instead of loop.run_round(...)
+    record = rec.finish(ctx)                             # + outcome hash
+    res = replay(record, make_ctx, until_round=23)       # rounds 1-22 silent, 23 traced
+    bad = verify_records(records, make_ctx)              # re-run, compare outcome hashes
+
+With a Checkpoints (engine.core.checkpoint) passed to the recorder or to replay(),
+seek(record, make_ctx, 23, checkpoints) restores the latest checkpoint before round 23
+and fast-forwards only from there; replay() also fills in checkpoints it passes.
+
+The ctx factory, make_ctx(spec, seed) -> (ctx, pets), is the caller's: the record does
+not know how pets, scripts and resolvers are wired, it only hands `spec` back.
+
+Fast-forwarded rounds run with ctx.log at LOG_OFF, ctx.trace_level TRACE_OFF and the
+event bus without history / logger (subscribers still fire: they may be game logic).
+None of these consume RNG draws, so the state reached is the same as a logged run.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from engine.core.actions import ActionKind, BattleAction
+from engine.core.battle_loop import BattleLoop, RoundOutcome
+from engine.core.checkpoint import Checkpoints, restore
+from engine.core.logs import LOG_DEBUG, LOG_OFF
+from engine.core.snapshots import snapshot_pet
+from engine.core.trace import TRACE_EXTENDED, TRACE_OFF
+
+RECORD_VERSION = 1
+
+CtxFactory = Callable[[Dict[str, Any], int], Tuple[Any, List[Any]]]
+
+
+def encode_action(a: BattleAction) -> str:
+    """"A<ability_id>:<slot>" / "S<swap_index>" / "P" (notes are diagnostics, dropped)."""
+    if a.kind == ActionKind.USE_ABILITY:
+        return f"A{int(a.ability_id)}:{int(a.slot_index)}"
+    if a.kind == ActionKind.SWAP:
+        return f"S{int(a.swap_index)}"
+    return "P"
+
+
+def decode_action(s: str) -> BattleAction:
+    if s.startswith("A"):
+        aid, _, slot = s[1:].partition(":")
+        return BattleAction(kind=ActionKind.USE_ABILITY, ability_id=int(aid), slot_index=int(slot or 0))
+    if s.startswith("S"):
+        return BattleAction(kind=ActionKind.SWAP, swap_index=int(s[1:]))
+    return BattleAction(kind=ActionKind.PASS)
+
+
+@dataclass
+class BattleRecord:
+    spec: Dict[str, Any]
+    seed: int
+    actions: List[Tuple[BattleAction, BattleAction]] = field(default_factory=list)
+    winner: Optional[int] = None
+    outcome_hash: Optional[str] = None
+
+    @property
+    def rounds(self) -> int:
+        return len(self.actions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "v": RECORD_VERSION,
+            "spec": self.spec,
+            "seed": self.seed,
+            "actions": [[encode_action(a0), encode_action(a1)] for a0, a1 in self.actions],
+            "winner": self.winner,
+            "hash": self.outcome_hash,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BattleRecord":
+        if int(d.get("v", RECORD_VERSION)) != RECORD_VERSION:
+            raise ValueError(f"unsupported battle record version: {d.get('v')!r}")
+        return cls(
+            spec=d.get("spec") or {},
+            seed=int(d["seed"]),
+            actions=[(decode_action(a0), decode_action(a1)) for a0, a1 in d.get("actions") or []],
+            winner=d.get("winner"),
+            outcome_hash=d.get("hash"),
+        )
+
+
+def save_records(path: Union[str, Path], records: Iterable[BattleRecord], mode: str = "w") -> int:
+    """Write records as JSONL (one battle per line); returns how many."""
+    n = 0
+    with open(path, mode, encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+            n += 1
+    return n
+
+
+def load_records(path: Union[str, Path]) -> List[BattleRecord]:
+    with open(path, encoding="utf-8") as f:
+        return [BattleRecord.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def outcome_hash(ctx: Any, winner: Optional[int] = None) -> str:
+    """sha256 of the battle-relevant end state (pets, states, auras, cooldowns, teams, RNG)."""
+    pets = getattr(ctx, "pets", None) or {}
+    state: Dict[str, Any] = {
+        "winner": winner,
+        "pets": [snapshot_pet(ctx, pets[pid]) for pid in sorted(pets)],
+    }
+    cds = getattr(getattr(ctx, "cooldowns", None), "_cd", None)
+    if cds is not None:
+        state["cooldowns"] = sorted([int(p), int(a), int(v)] for (p, a), v in cds.items())
+    teams = getattr(ctx, "teams", None)
+    if teams is not None:
+        state["active"] = {int(tid): int(t.active_index) for tid, t in teams.teams.items()}
+    used = getattr(getattr(ctx, "rng", None), "used", None)
+    if isinstance(used, dict):
+        state["rng"] = dict(used)
+    blob = json.dumps(state, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class BattleRecorder:
+    """Records the actions of a battle run through BattleLoop.run_round (+ optional checkpoints)."""
+
+    def __init__(self, spec: Dict[str, Any], seed: int, checkpoints: Optional[Checkpoints] = None):
+        self.record = BattleRecord(spec=spec, seed=int(seed))
+        self.checkpoints = checkpoints
+
+    def run_round(self, loop: BattleLoop, ctx: Any, action0: BattleAction, action1: BattleAction,
+                  pets: List[Any]) -> RoundOutcome:
+        self.record.actions.append((action0, action1))
+        out = loop.run_round(ctx, action0, action1, pets)
+        self.record.winner = out.winner_team_id
+        if self.checkpoints is not None:
+            self.checkpoints.maybe_capture(ctx, loop, pets)
+        return out
+
+    def finish(self, ctx: Any) -> BattleRecord:
+        self.record.outcome_hash = outcome_hash(ctx, self.record.winner)
+        return self.record
+
+
+class _Quiet:
+    """Silences logging / tracing / event history on ctx; restore() puts them back."""
+
+    def __init__(self, ctx: Any):
+        self.ctx = ctx
+        log = getattr(ctx, "log", None)
+        bus = getattr(ctx, "event_bus", None)
+        self._log_level = getattr(log, "level", None)
+        self._trace = getattr(ctx, "trace_level", None)
+        self._had_trace = hasattr(ctx, "trace_level")
+        self._bus = (bus.capacity, bus.logger) if bus is not None and hasattr(bus, "set_capacity") else None
+        if self._log_level is not None:
+            log.level = LOG_OFF
+        ctx.trace_level = TRACE_OFF
+        if self._bus is not None:
+            bus.set_capacity(0)
+            bus.set_logger(None)
+
+    def restore(self) -> None:
+        ctx = self.ctx
+        if self._log_level is not None:
+            ctx.log.level = self._log_level
+        if self._had_trace:
+            ctx.trace_level = self._trace
+        else:
+            del ctx.trace_level
+        if self._bus is not None:
+            ctx.event_bus.set_capacity(self._bus[0])
+            ctx.event_bus.set_logger(self._bus[1])
+
+
+@dataclass
+class ReplayResult:
+    ctx: Any
+    pets: List[Any]
+    loop: BattleLoop
+    outcomes: List[RoundOutcome] = field(default_factory=list)
+    start_round: int = 0  # rounds restored from a checkpoint (not in outcomes)
+
+    @property
+    def round_no(self) -> int:
+        return self.start_round + len(self.outcomes)
+
+    @property
+    def winner(self) -> Optional[int]:
+        return self.outcomes[-1].winner_team_id if self.outcomes else None
+
+
+def replay(
+    record: BattleRecord,
+    ctx_factory: CtxFactory,
+    *,
+    until_round: Optional[int] = None,
+    loop: Optional[BattleLoop] = None,
+    checkpoints: Optional[Checkpoints] = None,
+) -> ReplayResult:
+    """Re-execute `record`.
+
+    until_round=None: every round, silently (verification).
+    until_round=k: rounds 1..k-1 silently, then round k with ctx.log at LOG_DEBUG and
+    extended traces; the ctx is left after round k for inspection.
+    checkpoints: start from the latest one before the last round to run, and capture
+    the missing ones on the way.
+    """
+    ctx, pets = ctx_factory(record.spec, record.seed)
+    res = ReplayResult(ctx=ctx, pets=pets, loop=loop or BattleLoop())
+    n = record.rounds if until_round is None else max(0, min(int(until_round), record.rounds))
+    silent = n if until_round is None else n - 1
+
+    if checkpoints is not None and n > 0:
+        cp = checkpoints.nearest(n - 1)
+        if cp is not None:
+            res.start_round = restore(cp[1], ctx, res.loop, pets)
+
+    quiet = _Quiet(ctx)
+    try:
+        for a0, a1 in record.actions[res.start_round:silent]:
+            res.outcomes.append(res.loop.run_round(ctx, a0, a1, pets))
+            if checkpoints is not None:
+                checkpoints.maybe_capture(ctx, res.loop, pets)
+    finally:
+        quiet.restore()
+
+    if silent < n:
+        log = getattr(ctx, "log", None)
+        if log is not None and hasattr(log, "level"):
+            log.level = LOG_DEBUG
+        ctx.trace_level = TRACE_EXTENDED
+        a0, a1 = record.actions[silent]
+        res.outcomes.append(res.loop.run_round(ctx, a0, a1, pets))
+    return res
+
+
+def seek(
+    record: BattleRecord,
+    ctx_factory: CtxFactory,
+    round_no: int,
+    checkpoints: Optional[Checkpoints] = None,
+) -> ReplayResult:
+    """State after round `round_no` with that round traced, from the nearest checkpoint."""
+    return replay(record, ctx_factory, until_round=round_no, checkpoints=checkpoints)
+
+
+@dataclass
+class VerifyResult:
+    index: int
+    expected: Optional[str]
+    actual: str
+    winner: Optional[int]
+
+    @property
+    def ok(self) -> bool:
+        return self.expected == self.actual
+
+
+def verify_records(records: Iterable[BattleRecord], ctx_factory: CtxFactory) -> List[VerifyResult]:
+    """Replay every record and compare its outcome hash with the stored one."""
+    out = []
+    for i, rec in enumerate(records):
+        res = replay(rec, ctx_factory)
+        out.append(VerifyResult(index=i, expected=rec.outcome_hash,
+                                actual=outcome_hash(res.ctx, res.winner), winner=res.winner))
+    return out
@@ -1,5 +1,13 @@
+import itertools
+import operator
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
 
 @dataclass
 class SeqRNG:
@@ -24,3 +32,207 @@ class SeqRNG:
     def rand_crit(self) -> float:
         self.used["crit"] += 1
         return self.seq_crit.pop(0) if self.seq_crit else 1.0
+
+
+# ---------------------------------------------------------------------------
+# Counter-based RNG
+# ---------------------------------------------------------------------------
+#
+# Draw i of a stream is SplitMix64's output for state key + (i + 1) * GOLDEN, i.e. a pure
+# function of (key, i). That gives:
+#   - independent streams per roll type (hit/gate/var/crit each have their own key), so
+#     extra hit rolls never shift the crit sequence;
+#   - O(1) jump (advance a counter) and split (derive a child key);
+#   - block generation of any slice of a stream (vectorized with NumPy when available);
+#   - per-battle seeds from (campaign_seed, battle_index), independent of how battles are
+#     sharded across workers.
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_INV_2_53 = 1.0 / (1 << 53)
+
+RNG_STREAMS = ("hit", "gate", "var", "crit")
+
+# RandomRNG.rand_variance(): 0.95 + random() * 0.1
+VARIANCE_LO = 0.95
+VARIANCE_SPAN = 0.1
+
+
+def _mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def derive_seed(seed: int, *path: object) -> int:
+    """64-bit child seed of `seed` for a key path (ints or strings)."""
+    k = _mix64((int(seed) + _GOLDEN) & _MASK64)
+    for part in path:
+        if isinstance(part, str):
+            v = 0
+            for b in part.encode("utf-8"):
+                v = _mix64(((v ^ b) + _GOLDEN) & _MASK64)
+        else:
+            v = int(part) & _MASK64
+        k = _mix64(((k ^ v) + _GOLDEN) & _MASK64)
+    return k
+
+
+def battle_seed(campaign_seed: int, battle_index: int) -> int:
+    return derive_seed(campaign_seed, "battle", battle_index)
+
+
+def uniform_block(key: int, start: int, n: int):
+    """Draws start .. start+n-1 of the stream `key` as floats in [0, 1).
+
+    NumPy float64 array when numpy is available, else a list (same values).
+    """
+    start = int(start); n = int(n)
+    if np is not None:
+        idx = np.arange(start + 1, start + n + 1, dtype=np.uint64)
+        z = np.uint64(key) + idx * np.uint64(_GOLDEN)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+        z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)).astype(np.float64) * _INV_2_53
+    return [
+        (_mix64((key + (i + 1) * _GOLDEN) & _MASK64) >> 11) * _INV_2_53
+        for i in range(start, start + n)
+    ]
+
+
+@dataclass
+class CounterRNG:
+    """Counter-based implementation of the rand_hit/rand_gate/rand_variance/rand_crit protocol.
+
+    `used` counts draws per stream (same keys as SeqRNG.used) and is the whole mutable
+    state: copying it checkpoints the generator.
+
+    A scalar draw runs SplitMix64 in Python ints and costs about 1-1.5 us, roughly 10-15x
+    main.RandomRNG (~0.1 us). Per-draw consumers should go through BlockRNG, which serves
+    the same values from block() at RandomRNG speed.
+    """
+
+    seed: int = 0
+    used: Dict[str, int] = field(default_factory=lambda: {"hit": 0, "gate": 0, "var": 0, "crit": 0})
+
+    def __post_init__(self):
+        self._keys = {s: derive_seed(self.seed, s) for s in RNG_STREAMS}
+
+    @classmethod
+    def for_battle(cls, campaign_seed: int, battle_index: int) -> "CounterRNG":
+        return cls(seed=battle_seed(campaign_seed, battle_index))
+
+    def split(self, *path: object) -> "CounterRNG":
+        """Independent child generator (e.g. split("rollout", k)); does not advance self."""
+        return CounterRNG(seed=derive_seed(self.seed, *path))
+
+    def jump(self, n: int, stream: str = "") -> None:
+        """Skip n draws of one stream (all streams if stream is empty)."""
+        for s in ((stream,) if stream else RNG_STREAMS):
+            self.used[s] += int(n)
+
+    def _next(self, stream: str) -> float:
+        i = self.used[stream]
+        self.used[stream] = i + 1
+        return (_mix64((self._keys[stream] + (i + 1) * _GOLDEN) & _MASK64) >> 11) * _INV_2_53
+
+    def rand_hit(self) -> float:
+        return self._next("hit")
+
+    def rand_gate(self) -> float:
+        return self._next("gate")
+
+    def rand_variance(self) -> float:
+        return VARIANCE_LO + self._next("var") * VARIANCE_SPAN
+
+    def rand_crit(self) -> float:
+        return self._next("crit")
+
+    def block(self, stream: str, n: int, *, advance: bool = True):
+        """Next n raw uniforms of a stream ("var" is not rescaled), see uniform_block()."""
+        out = uniform_block(self._keys[stream], self.used[stream], n)
+        if advance:
+            self.used[stream] += int(n)
+        return out
+
+
+class BlockRNG:
+    """Serves rand_* draws from prefetched per-stream blocks of a counter-based source.
+
+    The source (CounterRNG by default) must provide block(stream, n) and a `used` dict.
+    Each block is converted to a Python list once and rand_hit/rand_gate/rand_variance/
+    rand_crit are bound to the C-level __next__ of an itertools.chain over those lists,
+    so the Python code only runs once per block. Draws are identical to calling the
+    source directly.
+
+    Measured per draw (python -m benchmarks run -k 'rng.*'): rand_* ~80-95 ns, on par
+    with main.RandomRNG (~90-100 ns) and over 10x cheaper than scalar CounterRNG draws;
+    draws(stream, n) ~50-60 ns per value, block fill included. So this is not faster than
+    random.Random per scalar draw: it gives counter-based (checkpointable, seekable)
+    streams at that cost. Filling a block costs ~55 ns per value (NumPy + tolist), so
+    size blocks to the draws a battle makes (a 3v3 fixture battle draws ~80 per stream;
+    benchmarks.fixtures uses 128).
+
+    draws(stream, n) hands out n draws as one list; HitCheck.compute_batch and
+    DamagePipeline.resolve_batch use it when the RNG provides it (streams are
+    independent, so batching per stream keeps every value).
+
+    `used` counts the draws actually served (same keys as SeqRNG.used); checkpoint() /
+    restore() save and rewind it.
+    """
+
+    _METHODS = {"hit": "rand_hit", "gate": "rand_gate", "var": "rand_variance", "crit": "rand_crit"}
+
+    def __init__(self, source: Any = None, block_size: int = 4096, *, seed: int = 0):
+        self.source = source if source is not None else CounterRNG(seed=seed)
+        self.block_size = max(1, int(block_size))
+        # stream -> [current block iterator (None before the first draw), block start, block length]
+        self._streams: Dict[str, list] = {}
+        self._iters: Dict[str, Iterator[float]] = {}
+        self.restore(self.source.used)
+
+    @property
+    def used(self) -> Dict[str, int]:
+        out = {}
+        for s, (it, start, n) in self._streams.items():
+            out[s] = start if it is None else start + n - operator.length_hint(it)
+        return out
+
+    def _block(self, stream: str, start: int) -> List[float]:
+        self.source.used[stream] = start
+        raw = self.source.block(stream, self.block_size)
+        if stream == "var":
+            if np is not None:
+                raw = VARIANCE_LO + raw * VARIANCE_SPAN
+            else:
+                raw = [VARIANCE_LO + u * VARIANCE_SPAN for u in raw]
+        return raw.tolist() if np is not None else list(raw)
+
+    def _blocks(self, stream: str, start: int) -> Iterator[Iterator[float]]:
+        st = self._streams[stream]
+        while True:
+            buf = self._block(stream, start)
+            it = iter(buf)
+            st[0], st[1], st[2] = it, start, len(buf)
+            yield it
+            start += len(buf)
+
+    def draws(self, stream: str, n: int) -> List[float]:
+        """The next n draws of one stream (same values as n rand_* calls)."""
+        return list(itertools.islice(self._iters[stream], int(n)))
+
+    def checkpoint(self) -> Dict[str, int]:
+        return self.used
+
+    def restore(self, counts: Dict[str, int]) -> None:
+        """Move every stream to a checkpoint() position (blocks are refilled lazily)."""
+        for s in RNG_STREAMS:
+            start = int(counts.get(s, 0))
+            self._streams[s] = [None, start, 0]
+            self.source.used[s] = start
+            it = itertools.chain.from_iterable(self._blocks(s, start))
+            self._iters[s] = it
+            setattr(self, self._METHODS[s], it.__next__)
@@ -1,35 +1,109 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-@dataclass
+@dataclass(frozen=True)
 class ScheduledPacket:
-    remaining_turns: int
+    due_round: int
     actor_id: int
     target_id: int
-    effect_rows: List[Any]
+    effect_rows: Tuple[Any, ...]
     tag: str = "scheduled"
+    seq: int = 0
 
 class Scheduler:
+    # Round-indexed timing wheel for delayed effect packets (Prop22 timers, charge/release).
+    #
+    # - schedule(): O(1); packets are bucketed by the round they become ready.
+    # - tick(): advances one round and pops that round's bucket, O(ready).
+    # - Packets keep their effect rows as an immutable tuple (tuples are stored by reference).
+    #
+    # Semantics match the previous countdown queue: delay_turns <= 1 fires on the next tick,
+    # delay_turns = d fires on the d-th tick; packets due in the same round keep insertion order.
+
     def __init__(self):
-        self._queue: List[ScheduledPacket] = []
+        self._round: int = 0
+        self._seq: int = 0
+        self._wheel: Dict[int, List[ScheduledPacket]] = {}
+
+    @property
+    def current_round(self) -> int:
+        return int(self._round)
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self._wheel.values())
 
-    def schedule(self, *, delay_turns: int, actor_id: int, target_id: int, effect_rows: List[Any], tag: str = "scheduled") -> None:
+    def schedule(self, *, delay_turns: int, actor_id: int, target_id: int, effect_rows: Sequence[Any], tag: str = "scheduled") -> ScheduledPacket:
         d = int(delay_turns)
-        if d < 0:
-            d = 0
-        self._queue.append(ScheduledPacket(remaining_turns=d, actor_id=int(actor_id), target_id=int(target_id), effect_rows=list(effect_rows), tag=tag))
+        if d < 1:
+            d = 1
+        rows = effect_rows if isinstance(effect_rows, tuple) else tuple(effect_rows)
+        self._seq += 1
+        pkt = ScheduledPacket(
+            due_round=self._round + d,
+            actor_id=int(actor_id),
+            target_id=int(target_id),
+            effect_rows=rows,
+            tag=tag,
+            seq=self._seq,
+        )
+        self._wheel.setdefault(pkt.due_round, []).append(pkt)
+        return pkt
 
     def tick(self) -> List[ScheduledPacket]:
-        ready: List[ScheduledPacket] = []
-        for pkt in self._queue:
-            pkt.remaining_turns -= 1
-        still: List[ScheduledPacket] = []
-        for pkt in self._queue:
-            if pkt.remaining_turns <= 0:
-                ready.append(pkt)
+        self._round += 1
+        return self._wheel.pop(self._round, [])
+
+    def remaining_turns(self, pkt: ScheduledPacket) -> int:
+        return max(0, int(pkt.due_round) - self._round)
+
+    def pending(self) -> List[ScheduledPacket]:
+        """All queued packets in firing order (round, then insertion)."""
+        out: List[ScheduledPacket] = []
+        for r in sorted(self._wheel.keys()):
+            out.extend(self._wheel[r])
+        return out
+
+    def checkpoint(self) -> Tuple[int, int, Tuple[ScheduledPacket, ...]]:
+        """(round, seq, queued packets); packets are frozen, so the tuple is a safe copy."""
+        return (self._round, self._seq, tuple(self.pending()))
+
+    def restore(self, state: Tuple[int, int, Tuple[ScheduledPacket, ...]]) -> None:
+        self._round, self._seq, packets = int(state[0]), int(state[1]), state[2]
+        self._wheel = {}
+        for pkt in packets:
+            self._wheel.setdefault(pkt.due_round, []).append(pkt)
+
+    def cancel(self, *, tag: Optional[str] = None, actor_id: Optional[int] = None, target_id: Optional[int] = None) -> int:
+        """Drop queued packets matching every given filter (e.g. when a pet dies or swaps out).
+
+        Returns the number of cancelled packets. With no filters, nothing is cancelled.
+        """
+        if tag is None and actor_id is None and target_id is None:
+            return 0
+
+        def match(pkt: ScheduledPacket) -> bool:
+            if tag is not None and pkt.tag != tag:
+                return False
+            if actor_id is not None and pkt.actor_id != int(actor_id):
+                return False
+            if target_id is not None and pkt.target_id != int(target_id):
+                return False
+            return True
+
+        removed = 0
+        for r in list(self._wheel.keys()):
+            bucket = self._wheel[r]
+            keep = [p for p in bucket if not match(p)]
+            removed += len(bucket) - len(keep)
+            if keep:
+                self._wheel[r] = keep
             else:
-                still.append(pkt)
-        self._queue = still
-        return ready
+                self._wheel.pop(r, None)
+        return removed
+
+    def cancel_pet(self, pet_id: int) -> int:
+        """Cancel every packet where the pet is either the actor or the target."""
+        pid = int(pet_id)
+        return self.cancel(actor_id=pid) + self.cancel(target_id=pid)
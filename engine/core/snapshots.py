@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+"""Pet snapshots for ABILITY_EFFECTS events: keyframes plus change-only diffs.
+
+A snapshot is {"pet_id", "name", "hp", "max_hp", "alive", "power", "speed", "states",
+"auras"} (snapshot_pet). Instead of full before/after copies around every cast, a
+SnapshotTracker emits
+
+  - keyframes: full snapshots of every pet (battle start, then every K rounds);
+  - diffs: only what changed on one pet since its last keyframe / diff, in the
+    diff_snapshot format ({"hp": {"before", "after", "delta"}, "states_changed",
+    "auras_added", "auras_removed", "auras_changed"}).
+
+States and auras come from the managers' change tracking (track_changes() /
+pop_changes()), so a diff costs nothing for untouched pets. In tracker diffs a state
+that did not exist (or was cleared) is None, so presence round-trips exactly.
+
+SnapshotReconstructor replays keyframes + diffs back into full snapshots. It works on
+records as read from an event file: state and aura ids are string keys.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_KEYFRAME_ROUNDS = 5
+KEYFRAME_EVENT = "SNAPSHOT_KEYFRAME"
+
+DIFF_FIELDS = ("hp", "max_hp", "alive", "power", "speed")
+# Tracked fields also cover identity, so a pet first seen in a diff is complete.
+_TRACKED_FIELDS = ("pet_id", "name") + DIFF_FIELDS
+
+
+def aura_snapshot(aura: Any) -> Dict[str, Any]:
+    return {
+        "remaining_duration": int(aura.remaining_duration),
+        "stacks": int(aura.stacks),
+        "caster_pet_id": int(aura.caster_pet_id),
+        "source_effect_id": int(aura.source_effect_id),
+        "tickdown_first_round": bool(aura.tickdown_first_round),
+        "just_applied": bool(aura.just_applied),
+    }
+
+
+def _fields(pet: Any) -> Dict[str, Any]:
+    return {
+        "pet_id": int(pet.id),
+        "name": getattr(pet, "name_zh", None),
+        "hp": int(pet.hp),
+        "max_hp": int(pet.max_hp),
+        "alive": bool(pet.alive),
+        "power": int(pet.power),
+        "speed": int(pet.speed),
+    }
+
+
+def snapshot_pet(ctx: Any, pet: Any) -> Dict[str, Any]:
+    snap = _fields(pet)
+    snap["states"] = ctx.states.snapshot_pet(pet.id)
+    snap["auras"] = {int(aid): aura_snapshot(a) for aid, a in ctx.aura.list_owner(pet.id).items()}
+    return snap
+
+
+def _field_entry(b: Any, a: Any) -> Dict[str, Any]:
+    entry = {"before": b, "after": a}
+    if isinstance(b, int) and isinstance(a, int):
+        entry["delta"] = a - b
+    return entry
+
+
+def diff_snapshot(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Diff of two full snapshots (absent states count as 0)."""
+    diff: Dict[str, Any] = {}
+    for k in DIFF_FIELDS:
+        if before.get(k) != after.get(k):
+            diff[k] = _field_entry(before.get(k), after.get(k))
+
+    states_before = before.get("states", {}) or {}
+    states_after = after.get("states", {}) or {}
+    state_changes: Dict[str, Any] = {}
+    for sid in set(states_before.keys()) | set(states_after.keys()):
+        bv = states_before.get(sid, 0)
+        av = states_after.get(sid, 0)
+        if bv != av:
+            state_changes[str(sid)] = {"before": bv, "after": av}
+    if state_changes:
+        diff["states_changed"] = state_changes
+
+    a_before = before.get("auras", {}) or {}
+    a_after = after.get("auras", {}) or {}
+    added = {}
+    removed = {}
+    changed = {}
+    for aid in set(a_before.keys()) | set(a_after.keys()):
+        b = a_before.get(aid)
+        a = a_after.get(aid)
+        if b is None and a is not None:
+            added[str(aid)] = a
+        elif a is None and b is not None:
+            removed[str(aid)] = b
+        elif b != a:
+            changed[str(aid)] = {"before": b, "after": a}
+    if added:
+        diff["auras_added"] = added
+    if removed:
+        diff["auras_removed"] = removed
+    if changed:
+        diff["auras_changed"] = changed
+    return diff
+
+
+def apply_diff(snapshot: Optional[Dict[str, Any]], diff: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """New snapshot = snapshot + diff (string state / aura keys, as in event files)."""
+    out = dict(snapshot or {})
+    states = dict(out.get("states") or {})
+    auras = dict(out.get("auras") or {})
+    for k, v in (diff or {}).items():
+        if k == "states_changed":
+            for sid, ch in v.items():
+                if ch.get("after") is None:
+                    states.pop(sid, None)
+                else:
+                    states[sid] = ch["after"]
+        elif k == "auras_added":
+            auras.update(v)
+        elif k == "auras_removed":
+            for aid in v:
+                auras.pop(aid, None)
+        elif k == "auras_changed":
+            for aid, ch in v.items():
+                auras[aid] = ch["after"]
+        elif isinstance(v, dict) and "after" in v:
+            out[k] = v["after"]
+    out["states"] = states
+    out["auras"] = auras
+    return out
+
+
+def _json_keys(snap: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(snap)
+    out["states"] = {str(k): v for k, v in (snap.get("states") or {}).items()}
+    out["auras"] = {str(k): v for k, v in (snap.get("auras") or {}).items()}
+    return out
+
+
+class SnapshotTracker:
+    """Change-only pet diffs between keyframes (see module docstring).
+
+    Turns on change tracking in ctx.states / ctx.aura; managers without
+    pop_changes() fall back to comparing the full state / aura maps.
+    """
+
+    def __init__(self, ctx: Any, keyframe_rounds: int = DEFAULT_KEYFRAME_ROUNDS):
+        self.ctx = ctx
+        self.keyframe_rounds = max(1, int(keyframe_rounds))
+        # pet_id -> {"fields": {...}, "states": {sid: v}, "auras": {aid: snapshot}}
+        self._ref: Dict[int, Dict[str, Any]] = {}
+        for mgr in (getattr(ctx, "states", None), getattr(ctx, "aura", None)):
+            if hasattr(mgr, "track_changes"):
+                mgr.track_changes(True)
+
+    def close(self) -> None:
+        for mgr in (getattr(self.ctx, "states", None), getattr(self.ctx, "aura", None)):
+            if hasattr(mgr, "track_changes"):
+                mgr.track_changes(False)
+
+    def is_keyframe_round(self, round_no: int) -> bool:
+        """Keyframe at the start of rounds 1 + K, 1 + 2K, ... (round 1: battle start)."""
+        return round_no > 1 and (round_no - 1) % self.keyframe_rounds == 0
+
+    def keyframe(self, pets: Optional[Iterable[Any]] = None) -> Dict[int, Dict[str, Any]]:
+        """Full snapshots of `pets` (default: ctx.pets); diffs restart from here."""
+        if pets is None:
+            pets = (getattr(self.ctx, "pets", None) or {}).values()
+        out: Dict[int, Dict[str, Any]] = {}
+        for pet in pets:
+            snap = snapshot_pet(self.ctx, pet)
+            pid = snap["pet_id"]
+            self._pop(pid)
+            self._ref[pid] = {
+                "fields": {k: snap[k] for k in _TRACKED_FIELDS},
+                "states": dict(snap["states"]),
+                "auras": dict(snap["auras"]),
+            }
+            out[pid] = snap
+        return out
+
+    def _pop(self, pid: int) -> Tuple[Optional[List[int]], Optional[List[int]]]:
+        # (changed state ids, changed aura ids); None = manager not tracking, compare all
+        states = getattr(self.ctx, "states", None)
+        aura = getattr(self.ctx, "aura", None)
+        sids = states.pop_changes(pid) if hasattr(states, "pop_changes") else None
+        aids = aura.pop_changes(pid) if hasattr(aura, "pop_changes") else None
+        return sids, aids
+
+    def diff(self, pet: Any) -> Dict[str, Any]:
+        """What changed on `pet` since its last keyframe / diff."""
+        ctx = self.ctx
+        pid = int(pet.id)
+        ref = self._ref.get(pid)
+        sids, aids = self._pop(pid)
+        if ref is None:  # never keyframed: diff against nothing
+            ref = self._ref[pid] = {"fields": {}, "states": {}, "auras": {}}
+            sids = aids = None
+        diff: Dict[str, Any] = {}
+
+        fields = _fields(pet)
+        ref_fields = ref["fields"]
+        for k in _TRACKED_FIELDS:
+            b = ref_fields.get(k)
+            a = fields[k]
+            if b != a or k not in ref_fields:
+                diff[k] = _field_entry(b, a)
+                ref_fields[k] = a
+
+        ref_states = ref["states"]
+        if sids is None or sids:
+            cur = ctx.states.snapshot_pet(pid)
+            changes: Dict[str, Any] = {}
+            for sid in (sids if sids is not None else set(cur) | set(ref_states)):
+                b = ref_states.get(sid)
+                a = cur.get(sid)
+                if b != a or (sid in cur) != (sid in ref_states):
+                    changes[str(sid)] = {"before": b, "after": a}
+                    if sid in cur:
+                        ref_states[sid] = a
+                    else:
+                        ref_states.pop(sid, None)
+            if changes:
+                diff["states_changed"] = changes
+
+        ref_auras = ref["auras"]
+        if aids is None or aids:
+            live = ctx.aura.list_owner(pid)
+            added: Dict[str, Any] = {}
+            removed: Dict[str, Any] = {}
+            changed: Dict[str, Any] = {}
+            for aid in (aids if aids is not None else set(live) | set(ref_auras)):
+                b = ref_auras.get(aid)
+                inst = live.get(aid)
+                a = aura_snapshot(inst) if inst is not None else None
+                if b is None and a is not None:
+                    added[str(aid)] = a
+                elif a is None and b is not None:
+                    removed[str(aid)] = b
+                elif b != a:
+                    changed[str(aid)] = {"before": b, "after": a}
+                if a is None:
+                    ref_auras.pop(aid, None)
+                else:
+                    ref_auras[aid] = a
+            if added:
+                diff["auras_added"] = added
+            if removed:
+                diff["auras_removed"] = removed
+            if changed:
+                diff["auras_changed"] = changed
+        return diff
+
+
+class SnapshotReconstructor:
+    """Rebuilds full snapshots from an event stream (records in file order).
+
+    feed(record) returns the record's payload; for ABILITY_EFFECTS written with
+    diffs only, the returned payload also carries actor/target_before/after.
+    """
+
+    def __init__(self) -> None:
+        self.pets: Dict[str, Dict[str, Any]] = {}
+
+    def feed(self, record: Dict[str, Any]) -> Any:
+        ev = record.get("event")
+        payload = record.get("payload")
+        if ev == "BATTLE_START":
+            self.pets = {}
+        elif ev == KEYFRAME_EVENT and isinstance(payload, dict):
+            for pid, snap in (payload.get("pets") or {}).items():
+                self.pets[str(pid)] = _json_keys(snap)
+        elif ev == "ABILITY_EFFECTS" and isinstance(payload, dict):
+            out = dict(payload)
+            for role in ("actor", "target"):
+                pid = str(payload.get(f"{role}_id"))
+                if role == "target" and pid == str(payload.get("actor_id")):  # self-cast
+                    out["target_before"] = out.get("actor_before")
+                    out["target_after"] = out.get("actor_after")
+                    continue
+                if f"{role}_after" in payload:  # full snapshots (older logs)
+                    self.pets[pid] = _json_keys(payload[f"{role}_after"])
+                    continue
+                before = apply_diff(self.pets.get(pid), payload.get(f"{role}_sync"))
+                after = apply_diff(before, payload.get(f"{role}_diff"))
+                out[f"{role}_before"] = before
+                out[f"{role}_after"] = after
+                self.pets[pid] = after
+            return out
+        return payload
+
+    def snapshot(self, pet_id: Any) -> Optional[Dict[str, Any]]:
+        return self.pets.get(str(pet_id))
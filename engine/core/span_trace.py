@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Opt-in span tracer writing Chrome trace-event JSON (chrome://tracing, Perfetto UI).
+
+    tracer = SpanTracer()
+    with tracer.battle("seed 7"):
+        tracer.attach(loop, ctx.dispatcher)
+        ...run rounds...
+        tracer.detach(loop)
+    tracer.export("battle.trace.json")
+
+Spans nest as battle -> round -> phase (engine.core.phases.ROUND_PHASES) ->
+ability cast (AbilityExecutor.use_ability_id) -> cast turn (AbilityTurnExecutor.execute_turn,
+including scheduled packets and aura ticks) -> effect dispatch (EffectDispatcher.dispatch,
+with prop_id, handler, executed and flow_control). An ability that cascades through
+many effects shows up as a wide cast with a long row of dispatches under it.
+
+Like PhaseTimer and DispatchProfiler, attach() shadows methods on the given instances
+only; handlers and detached loops are untouched. Every span becomes one complete
+("X") event, so a trace of a long battle is large: trace a few battles, not thousands.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from engine.core.instrument import shadow_method
+from engine.core.phases import hook_phases
+from engine.effects.dispatcher import DISPATCH_ERROR
+from engine.effects.registry import get_handler
+
+TRACE_PID = 1
+TRACE_TID = 1
+
+# Called before a traced method with (args, kwargs); returns (name, category, span args).
+SpanStart = Callable[[Tuple[Any, ...], Dict[str, Any]], Tuple[str, str, Dict[str, Any]]]
+# Called after it with (span args, result) to add outcome fields.
+SpanEnd = Callable[[Dict[str, Any], Any], None]
+
+
+def _row_args(rows: List[Any]) -> Dict[str, Any]:
+    first = rows[0] if rows else None
+    return {"ability_id": int(getattr(first, "ability_id", 0) or 0), "rows": len(rows)}
+
+
+def _turn_result(span: Dict[str, Any], res: Any) -> None:
+    span["executed"] = int(getattr(res, "executed_count", 0) or 0)
+    span["stop_reason"] = getattr(res, "stop_reason", None)
+
+
+def _cast_result(span: Dict[str, Any], res: Any) -> None:
+    _turn_result(span, getattr(res, "turn_result", None))
+    span["cooldown_set"] = int(getattr(res, "cooldown_set", 0) or 0)
+
+
+class SpanTracer:
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._stack: List[Tuple[str, str, int, Dict[str, Any]]] = []  # (name, cat, t0_ns, args)
+        self._undo: Dict[int, List[Callable[[], None]]] = {}
+        self._handlers: Dict[int, Optional[str]] = {}
+        self._t0 = time.perf_counter_ns()
+
+    def reset(self) -> None:
+        self.events = []
+        self._stack = []
+
+    # -- spans ------------------------------------------------------------
+    def begin(self, name: str, cat: str, args: Optional[Dict[str, Any]] = None) -> None:
+        self._stack.append((name, cat, time.perf_counter_ns(), args if args is not None else {}))
+
+    def end(self) -> None:
+        name, cat, t0, args = self._stack.pop()
+        t1 = time.perf_counter_ns()
+        self.events.append({
+            "name": name, "cat": cat, "ph": "X", "pid": TRACE_PID, "tid": TRACE_TID,
+            "ts": (t0 - self._t0) / 1e3, "dur": (t1 - t0) / 1e3, "args": args,
+        })
+
+    @contextmanager
+    def span(self, name: str, cat: str = "user", **args: Any) -> Iterator[Dict[str, Any]]:
+        """A span around arbitrary code; the yielded args dict may be filled in."""
+        self.begin(name, cat, args)
+        try:
+            yield args
+        finally:
+            self.end()
+
+    def battle(self, name: str = "battle", **args: Any):
+        return self.span(name, "battle", **args)
+
+    # -- instrumentation --------------------------------------------------
+    def _shadow(self, obj: Any, name: str, start: SpanStart, finish: Optional[SpanEnd]) -> Callable[[], None]:
+        tracer = self
+
+        def wrap(inner):
+            def traced(*args, **kwargs):
+                span_name, cat, span_args = start(args, kwargs)
+                tracer.begin(span_name, cat, span_args)
+                res = None
+                try:
+                    res = inner(*args, **kwargs)
+                    return res
+                finally:
+                    if finish is not None and res is not None:
+                        finish(span_args, res)
+                    tracer.end()
+            return traced
+
+        return shadow_method(obj, name, wrap)
+
+    def attach(self, loop: Any, dispatcher: Any = None) -> None:
+        """Trace loop's rounds, phases, casts and cast turns, plus dispatcher's effects (idempotent)."""
+        if id(loop) in self._undo:
+            return
+
+        def enter(label: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+            span_args = {"round": int(loop.round_no) + 1} if label == "round" else {}
+            self.begin(label, "round" if label == "round" else "phase", span_args)
+
+        undos = [hook_phases(loop, enter, lambda label: self.end())]
+
+        ex = loop.ex
+
+        def cast(args, kwargs):
+            _ctx, actor, target, ability_id = args[:4]
+            return f"cast {int(ability_id)}", "ability", {
+                "ability_id": int(ability_id), "actor": int(getattr(actor, "id", 0) or 0),
+                "target": int(getattr(target, "id", 0) or 0), "slot": kwargs.get("slot_index"),
+            }
+
+        undos.append(self._shadow(ex, "use_ability_id", cast, _cast_result))
+
+        for owner, source in ((ex, "cast"), (getattr(ex, "tick_engine", None), "tick")):
+            turn_executor = getattr(owner, "turn_executor", None)
+            if turn_executor is None:
+                continue
+
+            def turn(args, kwargs, source=source):
+                span_args = _row_args(list(args[3]))
+                span_args["source"] = source
+                return f"turn {span_args['ability_id']}", "cast_turn", span_args
+
+            undos.append(self._shadow(turn_executor, "execute_turn", turn, _turn_result))
+
+        if dispatcher is not None:
+            undos.append(self._attach_dispatcher(dispatcher))
+        self._undo[id(loop)] = undos
+
+    def _attach_dispatcher(self, dispatcher: Any) -> Callable[[], None]:
+        handlers = self._handlers
+
+        def effect(args, kwargs):
+            row = args[3]
+            prop_id = int(getattr(row, "prop_id", 0) or 0)
+            if prop_id not in handlers:
+                h = get_handler(prop_id)
+                handlers[prop_id] = type(h).__name__ if h is not None else None
+            return f"prop {prop_id}", "effect", {
+                "prop_id": prop_id, "handler": handlers[prop_id],
+                "ability_id": int(getattr(row, "ability_id", 0) or 0),
+                "effect_id": int(getattr(row, "effect_id", 0) or 0),
+            }
+
+        def result(span_args, res):
+            span_args["executed"] = bool(getattr(res, "executed", False))
+            span_args["flow_control"] = getattr(res, "flow_control", "CONTINUE")
+            error = (getattr(res, "notes", None) or {}).get(DISPATCH_ERROR)
+            if error:
+                span_args["error"] = error
+
+        return self._shadow(dispatcher, "dispatch", effect, result)
+
+    def detach(self, loop: Any) -> None:
+        """Undo attach(loop, ...), including the dispatcher attached with it."""
+        for undo in reversed(self._undo.pop(id(loop), [])):
+            undo()
+
+    @contextmanager
+    def attached(self, loop: Any, dispatcher: Any = None) -> Iterator["SpanTracer"]:
+        self.attach(loop, dispatcher)
+        try:
+            yield self
+        finally:
+            self.detach(loop)
+
+    # -- output -----------------------------------------------------------
+    def to_chrome(self) -> Dict[str, Any]:
+        meta = [
+            {"name": "process_name", "ph": "M", "pid": TRACE_PID, "tid": TRACE_TID, "args": {"name": "WarCraftPets"}},
+            {"name": "thread_name", "ph": "M", "pid": TRACE_PID, "tid": TRACE_TID, "args": {"name": "BattleLoop"}},
+        ]
+        events = sorted(self.events, key=lambda e: (e["ts"], -e["dur"]))
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Union[str, Path]) -> int:
+        """Write the Chrome trace JSON; returns the number of spans written."""
+        Path(path).write_text(json.dumps(self.to_chrome(), default=str) + "\n", encoding="utf-8")
+        return len(self.events)
@@ -173,6 +173,25 @@ class TeamManager:
         t.active_index = int(new_idx)
         return True, "OK", int(new_pid)
 
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """Compact copy of rosters, active slots and lockouts; restore() rewinds to it."""
+        return (
+            tuple((tid, tuple(t.pet_ids), t.active_index) for tid, t in self.teams.items()),
+            tuple((pid, tuple(m.items())) for pid, m in self.slot_locks.items()),
+            tuple(self.pending_next_ability_lock.items()),
+            tuple((pid, tuple(m.items())) for pid, m in self.ability_locks.items()),
+        )
+
+    def restore(self, state: Tuple[Any, ...]) -> None:
+        teams, slot_locks, pending, ability_locks = state
+        self.teams = {}
+        self.pet_to_team = {}
+        for tid, pet_ids, active_index in teams:
+            self.register_team(tid, list(pet_ids), active_index=active_index)
+        self.slot_locks = {pid: dict(m) for pid, m in slot_locks}
+        self.pending_next_ability_lock = dict(pending)
+        self.ability_locks = {pid: dict(m) for pid, m in ability_locks}
+
     def tick_down(self) -> None:
         # Called at turn start (same as cooldown tick). Decrements locks.
         for pid, slots in list(self.slot_locks.items()):
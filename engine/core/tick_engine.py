@@ -1,10 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, List, Optional, Sequence, Tuple
 
 from engine.core.events import Event
 from engine.core.executor import AbilityTurnExecutor
+from engine.core.pet_index import pet_index
+from engine.resolver.aura_manager import AuraManager
+
+# Reactive events raised by an HP change of the actor / target of a dispatched row.
+HP_EVENTS = (
+    Event.ON_DAMAGE_TAKEN.value,
+    Event.ON_DAMAGE_DEALT.value,
+    Event.ON_HEAL_TAKEN.value,
+    Event.ON_HEAL_DEALT.value,
+)
+
+
+def _hp(pet: Any) -> int:
+    return int(getattr(pet, "hp", 0) or 0)
+
 
 @dataclass
 class TickSummary:
@@ -18,41 +33,52 @@ class TickEngine:
     # Responsibilities (v1):
     # - Periodic ticks (DOT/HOT) bound to aura instances:
     #     aura.periodic_payloads[event] (preferred), or legacy aura.periodic_effect_rows + aura.periodic_timing
-    # - Aura duration decrement + expire on TURN_END by default (after periodic ticks)
+    #   Only auras subscribed to the event are visited (AuraManager.subscribers), so an event
+    #   costs O(subscribers) rather than O(pets * auras).
+    # - Aura duration decrement + expire on TURN_END by default (after periodic ticks),
+    #   then POST_TICK triggers.
+    # - Reactive triggers for a single pet via process_owner_event(), also O(subscribers):
+    #     ON_DAMAGE_* / ON_HEAL_*: the actor / target HP changed while a row was dispatched
+    #       (before_effect/after_effect, called by every AbilityTurnExecutor built with
+    #       triggers=<this engine>);
+    #     ON_ACTION / ON_ABILITY / ON_SWAP_*: raised by AbilityExecutor and BattleLoop.
+    #   ON_APPLY / ON_AURA_REMOVED run the rows of the aura that was just applied / removed;
+    #   the engine listens to ctx.aura and runs them once the applying row has finished
+    #   (payloads are attached after AuraManager.apply()).
+    #   Rows run by a reactive trigger do not raise reactive triggers themselves, so two
+    #   reflect-style auras cannot ping-pong.
     #
     # Determinism:
-    # - TURN_END: (1) periodic ticks, (2) decrement duration, (3) expire at 0.
+    # - TURN_END: (1) periodic ticks, (2) decrement duration, (3) expire at 0, (4) POST_TICK.
 
     def __init__(self):
-        self.turn_executor = AbilityTurnExecutor()
+        self.turn_executor = AbilityTurnExecutor(triggers=self)
+        self._reacting = False
+        self._lifecycle: List[Tuple[str, Any]] = []  # (event, aura) waiting for the current row to finish
+        self._listening: Any = None
 
     def process_event(self, ctx: Any, pets: List[Any], event: Event) -> TickSummary:
         periodic_triggers = 0
         expired_auras = 0
 
         if hasattr(ctx, "aura"):
-            for owner in pets:
-                for aura in ctx.aura.list_owner(owner.id).values():
-                    # Preferred payloads mapping
-                    rows = None
-                    payloads = getattr(aura, "periodic_payloads", None)
-                    if isinstance(payloads, dict):
-                        rows = payloads.get(event.value)
-
-                    # Legacy fallback
-                    if not rows:
-                        timing = getattr(aura, "periodic_timing", Event.TURN_END.value)
-                        if str(timing) == event.value:
-                            rows = getattr(aura, "periodic_effect_rows", None)
-
-                    if not rows:
-                        continue
-
-                    actor = next((p for p in pets if p.id == aura.caster_pet_id), None)
-                    if actor is None:
-                        continue
-                    self.turn_executor.execute_turn(ctx, actor, owner, rows)
-                    periodic_triggers += 1
+            self._bind(ctx)
+            idx = pet_index(ctx, pets)
+            if hasattr(ctx.aura, "subscribers"):
+                if ctx.aura.has_subscribers(event.value):
+                    for owner in pets:
+                        periodic_triggers += self._run_subscribers(ctx, idx, owner, event)
+            else:
+                for owner in pets:
+                    for aura in ctx.aura.list_owner(owner.id).values():
+                        rows = AuraManager.event_rows(aura, event.value)
+                        if not rows:
+                            continue
+                        actor = idx.get(aura.caster_pet_id)
+                        if actor is None:
+                            continue
+                        self.turn_executor.execute_turn(ctx, actor, owner, rows)
+                        periodic_triggers += 1
 
         if event == Event.TURN_END and hasattr(ctx, "aura"):
             for owner in pets:
@@ -61,6 +87,12 @@ class TickEngine:
                     expired_auras += 1
                     if hasattr(ctx, "log"):
                         ctx.log.aura_expire(ex.owner_pet_id, ex.aura_id)
+            if self._lifecycle:
+                self._run_lifecycle(ctx, pets)
+            if hasattr(ctx.aura, "subscribers") and ctx.aura.has_subscribers(Event.POST_TICK.value):
+                idx = pet_index(ctx, pets)
+                for owner in pets:
+                    periodic_triggers += self._run_subscribers(ctx, idx, owner, Event.POST_TICK)
 
         # If a weather-providing aura expired, refresh cached weather.
         wm = getattr(ctx, "weather", None)
@@ -71,3 +103,98 @@ class TickEngine:
                 pass
 
         return TickSummary(event=event, periodic_triggers=periodic_triggers, expired_auras=expired_auras)
+
+    def process_owner_event(self, ctx: Any, pets: Sequence[Any], owner: Any, event: Event) -> int:
+        """Run one pet's aura triggers for a reactive event (damage taken, swap in, ...).
+
+        Cost is O(subscribers of `event` on `owner`); returns the number of triggered payloads.
+        """
+        if self._reacting or owner is None:
+            return 0
+        aura = getattr(ctx, "aura", None)
+        if aura is None or not hasattr(aura, "subscribers") or not aura.has_subscribers(event.value):
+            return 0
+        self._reacting = True
+        try:
+            return self._run_subscribers(ctx, pet_index(ctx, pets), owner, event)
+        finally:
+            self._reacting = False
+
+    # -- per-row hooks (AbilityTurnExecutor) -----------------------------------
+    def before_effect(self, ctx: Any, actor: Any, target: Any) -> Optional[Tuple[int, ...]]:
+        """HP of (actor, target) if an HP trigger is subscribed, () if not, None to skip after_effect."""
+        if self._reacting:
+            return None
+        aura = getattr(ctx, "aura", None)
+        if aura is None or not hasattr(aura, "has_any_subscribers"):
+            return None
+        if aura is not self._listening:
+            self._bind(ctx)
+        if aura.has_any_subscribers(HP_EVENTS):
+            return _hp(actor), _hp(target)
+        return ()
+
+    def after_effect(self, ctx: Any, actor: Any, target: Any, before: Tuple[int, ...]) -> None:
+        if before:
+            pets = (actor, target)
+            for pet, hp0 in ((target, before[1]), (actor, before[0])):
+                delta = _hp(pet) - hp0
+                if delta < 0:
+                    self.process_owner_event(ctx, pets, pet, Event.ON_DAMAGE_TAKEN)
+                    if pet is not actor:
+                        self.process_owner_event(ctx, pets, actor, Event.ON_DAMAGE_DEALT)
+                elif delta > 0:
+                    self.process_owner_event(ctx, pets, pet, Event.ON_HEAL_TAKEN)
+                    if pet is not actor:
+                        self.process_owner_event(ctx, pets, actor, Event.ON_HEAL_DEALT)
+                if actor is target:
+                    break
+        if self._lifecycle:
+            self._run_lifecycle(ctx, (actor, target))
+
+    # -- aura lifecycle (AuraManager listener) ---------------------------------
+    def _bind(self, ctx: Any) -> None:
+        aura = ctx.aura
+        if aura is not self._listening and hasattr(aura, "add_listener"):
+            aura.add_listener(self)
+            self._listening = aura
+
+    def on_aura_stored(self, aura: Any) -> None:
+        # Payloads are attached after apply(): whether it has ON_APPLY rows is checked later.
+        if not self._reacting:
+            self._lifecycle.append((Event.ON_APPLY.value, aura))
+
+    def on_aura_removed(self, aura: Any) -> None:
+        if not self._reacting and AuraManager.event_rows(aura, Event.ON_AURA_REMOVED.value):
+            self._lifecycle.append((Event.ON_AURA_REMOVED.value, aura))
+
+    def _run_lifecycle(self, ctx: Any, pets: Sequence[Any]) -> None:
+        pending, self._lifecycle = self._lifecycle, []
+        idx = None
+        for event, aura in pending:
+            if event == Event.ON_APPLY.value and ctx.aura.get(aura.owner_pet_id, aura.aura_id) is not aura:
+                continue  # replaced or removed by the same row
+            rows = AuraManager.event_rows(aura, event)
+            if not rows:
+                continue
+            if idx is None:
+                idx = pet_index(ctx, pets)
+            actor = idx.get(aura.caster_pet_id)
+            owner = idx.get(aura.owner_pet_id)
+            if actor is None or owner is None:
+                continue
+            self._reacting = True
+            try:
+                self.turn_executor.execute_turn(ctx, actor, owner, rows)
+            finally:
+                self._reacting = False
+
+    def _run_subscribers(self, ctx: Any, idx: Any, owner: Any, event: Event) -> int:
+        triggered = 0
+        for aura, rows in ctx.aura.subscribers(event.value, owner.id):
+            actor = idx.get(aura.caster_pet_id)
+            if actor is None:
+                continue
+            self.turn_executor.execute_turn(ctx, actor, owner, rows)
+            triggered += 1
+        return triggered
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+"""Trace levels for resolver outputs (ResolvedDamage.trace / ResolvedHeal.trace).
+
+ctx.trace_level selects how much each resolve() records:
+
+    TRACE_OFF       no trace dict at all (trace is None)
+    TRACE_MINIMAL   S1_base + S7_variance_roll (the historical default)
+    TRACE_EXTENDED  every pipeline stage
+
+It may be an int, one of the names "off" / "minimal" / "extended", or a TraceSampler
+(extended for 1 in N resolutions). Without ctx.trace_level the legacy ctx.trace_extended
+flag decides between minimal and extended.
+"""
+
+from typing import Any, Dict
+
+TRACE_OFF = 0
+TRACE_MINIMAL = 1
+TRACE_EXTENDED = 2
+
+TRACE_LEVELS: Dict[str, int] = {
+    "off": TRACE_OFF,
+    "minimal": TRACE_MINIMAL,
+    "extended": TRACE_EXTENDED,
+}
+
+
+class TraceSampler:
+    """Extended trace for every `every`-th resolution, `base` level for the others."""
+
+    __slots__ = ("every", "base", "_n")
+
+    def __init__(self, every: int, base: int = TRACE_OFF):
+        self.every = max(1, int(every))
+        self.base = int(base)
+        self._n = 0
+
+    def level(self) -> int:
+        self._n += 1
+        if self._n >= self.every:
+            self._n = 0
+            return TRACE_EXTENDED
+        return self.base
+
+
+def trace_level(ctx: Any) -> int:
+    lvl = getattr(ctx, "trace_level", None)
+    if lvl is None:
+        return TRACE_EXTENDED if getattr(ctx, "trace_extended", False) else TRACE_MINIMAL
+    if isinstance(lvl, int):
+        return lvl
+    if isinstance(lvl, str):
+        return TRACE_LEVELS.get(lvl.lower(), TRACE_MINIMAL)
+    try:
+        return int(lvl.level())
+    except Exception:
+        return TRACE_MINIMAL
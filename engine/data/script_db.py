@@ -7,20 +7,31 @@ import pandas as pd
 import json
 from pathlib import Path
 
-from engine.core.events import Event
+from engine.core.events import Event, PERIODIC_EVENTS
 from engine.model.effect_row import EffectRow
 
 
 @dataclass(frozen=True)
 class ScriptDBConfig:
-    # Map DB2 EventTypeEnum integer -> Event string ("TURN_START"/"TURN_END")
+    # Map DB2 EventTypeEnum integer -> Event string (payload key on AuraInstance.periodic_payloads)
     event_type_map: Dict[int, str]
 
     @staticmethod
     def default() -> "ScriptDBConfig":
         return ScriptDBConfig(event_type_map={
+            0: Event.ON_APPLY.value,
+            1: Event.ON_DAMAGE_TAKEN.value,
+            2: Event.ON_DAMAGE_DEALT.value,
+            3: Event.ON_HEAL_TAKEN.value,
+            4: Event.ON_HEAL_DEALT.value,
+            5: Event.ON_AURA_REMOVED.value,
             6: Event.TURN_START.value,  # v4 demo convention
             7: Event.TURN_END.value,
+            8: Event.ON_ACTION.value,
+            9: Event.ON_ABILITY.value,
+            10: Event.ON_SWAP_IN.value,
+            11: Event.ON_SWAP_OUT.value,
+            12: Event.POST_TICK.value,
         })
 
 
@@ -379,7 +390,10 @@ class ScriptDB:
                                 aura_ability_id=(aura_ref or None),
                             )
                             db._aura_periodic.setdefault(aura_id, {}).setdefault(ev, []).append(er)
-                            any_trigger_rows = True
+                            # Only round-boundary triggers suppress the cast IsPeriodic fallback;
+                            # reactive triggers (damage taken, swap, ...) do not define a DOT/HOT tick.
+                            if ev in PERIODIC_EVENTS:
+                                any_trigger_rows = True
 
             # Periodic scripts from cast turn (fallback for DOT/HOT modeled in cast with IsPeriodic=1)
             if attach_cast_is_periodic and not any_trigger_rows and default_ev is not None:
@@ -7,6 +7,11 @@ from engine.effects.param_parser import ParamParser
 from engine.effects.semantic_registry import get_default_registry, normalize_args, validate_and_fill_args
 from engine.effects.types import EffectResult
 from engine.core.event_bus import EventBus
+from engine.core.logs import LOG_DEBUG
+
+# EffectResult.notes key set on results the dispatcher produced itself instead of a handler:
+# "NO_HANDLER" / "NO_HANDLER_KNOWN" / "HANDLER_ERROR" (read by engine.effects.profiler).
+DISPATCH_ERROR = "dispatch_error"
 
 
 class EffectDispatcher:
@@ -25,10 +30,10 @@ class EffectDispatcher:
             # Distinguish: known opcode (semantics exists) vs unknown opcode
             reason = "NO_HANDLER_KNOWN" if sem is not None else "NO_HANDLER"
             ctx.log.unsupported(effect_row, reason=reason)
-            return EffectResult(executed=False)
+            return EffectResult(executed=False, notes={DISPATCH_ERROR: reason})
 
-        # Semantics-aware validation (non-fatal, logs warnings)
-        if sem is not None:
+        # Semantics-aware validation (non-fatal, logs warnings; skipped below debug log level)
+        if sem is not None and getattr(getattr(ctx, "log", None), "level", LOG_DEBUG) >= LOG_DEBUG:
             mm = self._sem.label_mismatch(effect_row.prop_id, effect_row.param_label)
             if mm is not None and hasattr(ctx, "log") and hasattr(ctx.log, "warn"):
                 ctx.log.warn(effect_row, code="PARAM_LABEL_MISMATCH", detail=mm)
@@ -45,4 +50,4 @@ class EffectDispatcher:
         except Exception as exc:
             if hasattr(ctx, "log") and hasattr(ctx.log, "warn"):
                 ctx.log.warn(effect_row, code="HANDLER_ERROR", detail={"error": repr(exc)})
-            return EffectResult(executed=False, flow_control="CONTINUE")
+            return EffectResult(executed=False, flow_control="CONTINUE", notes={DISPATCH_ERROR: "HANDLER_ERROR"})
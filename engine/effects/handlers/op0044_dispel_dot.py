@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from engine.core.events import PERIODIC_EVENTS
 from engine.effects.registry import register_handler
 from engine.effects.types import EffectResult
 
@@ -73,10 +74,12 @@ class H_Prop44_DispelDOT:
         return EffectResult(executed=True, notes={"removed": 1, "aura_id": int(aura_id)})
 
     def _is_harmful_periodic(self, aura_inst) -> bool:
-        # Preferred payloads
+        # Preferred payloads (round-tick events only; reactive triggers are not DOTs)
         payloads = getattr(aura_inst, "periodic_payloads", None)
         if isinstance(payloads, dict) and payloads:
-            for _, rows in payloads.items():
+            for ev, rows in payloads.items():
+                if ev not in PERIODIC_EVENTS:
+                    continue
                 for r in rows or []:
                     try:
                         op = int(getattr(r, "prop_id", getattr(r, "opcode_id", 0)) or 0)
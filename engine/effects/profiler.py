@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+"""Per-opcode counters and timers for EffectDispatcher.dispatch.
+
+    prof = DispatchProfiler()
+    prof.attach(ctx.dispatcher)      # or: with prof.attached(ctx.dispatcher): ...
+    ...run battles...
+    prof.detach(ctx.dispatcher)
+    prof.snapshot()                  # {prop_id: {"calls": .., "total_ms": .., ...}}
+    print(prof.format_table())
+
+attach() shadows `dispatch` on that dispatcher instance with a counting wrapper and
+detach() puts the previous attribute back (engine.core.instrument.shadow_method), so an
+unprofiled dispatcher runs the plain class method with no instrumentation cost at all,
+and the profiler stacks with SpanTracer on the same dispatcher. Times are wall time and
+inclusive: a handler that dispatches further effects is charged for them too.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from engine.core.instrument import shadow_method
+from engine.effects.dispatcher import DISPATCH_ERROR
+from engine.effects.registry import get_handler
+
+SORT_KEYS = ("total_ms", "calls", "max_ms", "mean_us", "prop_id")
+
+
+@dataclass
+class OpcodeStats:
+    prop_id: int
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+    executed: int = 0
+    not_executed: int = 0  # includes the three dispatcher outcomes below
+    handler_error: int = 0
+    no_handler: int = 0
+    no_handler_known: int = 0
+
+
+class DispatchProfiler:
+    def __init__(self):
+        self.stats: Dict[int, OpcodeStats] = {}
+        self._undo: Dict[int, Callable[[], None]] = {}
+
+    def reset(self) -> None:
+        self.stats = {}
+
+    def attach(self, dispatcher: Any) -> None:
+        """Route dispatcher.dispatch through the counters (idempotent)."""
+        if id(dispatcher) in self._undo:
+            return
+        self._undo[id(dispatcher)] = shadow_method(dispatcher, "dispatch", self._wrap)
+
+    def _wrap(self, base: Callable[..., Any]) -> Callable[..., Any]:
+        clock = time.perf_counter_ns
+        profiler = self
+
+        def dispatch(ctx, actor, target, effect_row):
+            t0 = clock()
+            res = base(ctx, actor, target, effect_row)
+            dt = clock() - t0
+            prop_id = effect_row.prop_id
+            st = profiler.stats.get(prop_id)
+            if st is None:
+                st = profiler.stats[prop_id] = OpcodeStats(prop_id=int(prop_id))
+            st.calls += 1
+            st.total_ns += dt
+            if dt > st.max_ns:
+                st.max_ns = dt
+            if getattr(res, "executed", False):
+                st.executed += 1
+            else:
+                st.not_executed += 1
+                code = (getattr(res, "notes", None) or {}).get(DISPATCH_ERROR)
+                if code == "HANDLER_ERROR":
+                    st.handler_error += 1
+                elif code == "NO_HANDLER":
+                    st.no_handler += 1
+                elif code == "NO_HANDLER_KNOWN":
+                    st.no_handler_known += 1
+            return res
+
+        return dispatch
+
+    def detach(self, dispatcher: Any) -> None:
+        undo = self._undo.pop(id(dispatcher), None)
+        if undo is not None:
+            undo()
+
+    @contextmanager
+    def attached(self, dispatcher: Any) -> Iterator["DispatchProfiler"]:
+        self.attach(dispatcher)
+        try:
+            yield self
+        finally:
+            self.detach(dispatcher)
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Plain-dict copy of the counters, with handler names and derived ms/us figures."""
+        out = {}
+        for prop_id, st in sorted(self.stats.items()):
+            d = asdict(st)
+            h = get_handler(prop_id)
+            d["handler"] = type(h).__name__ if h is not None else None
+            d["total_ms"] = round(st.total_ns / 1e6, 3)
+            d["max_ms"] = round(st.max_ns / 1e6, 3)
+            d["mean_us"] = round(st.total_ns / st.calls / 1e3, 2) if st.calls else 0.0
+            out[prop_id] = d
+        return out
+
+    def format_table(self, *, sort: str = "total_ms", limit: Optional[int] = None) -> str:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {SORT_KEYS}, not {sort!r}")
+        rows: List[Dict[str, Any]] = list(self.snapshot().values())
+        rows.sort(key=lambda r: r[sort], reverse=sort != "prop_id")
+        if limit is not None:
+            rows = rows[:limit]
+        total_ns = sum(st.total_ns for st in self.stats.values()) or 1
+        lines = [
+            f"{'prop':>5} {'handler':<42} {'calls':>8} {'total_ms':>10} {'share':>6} {'mean_us':>9} "
+            f"{'max_ms':>8} {'exec':>7} {'noexec':>7} {'err':>5} {'nohdl':>6}"
+        ]
+        for r in rows:
+            lines.append(
+                f"{r['prop_id']:>5} {(r['handler'] or '-')[:42]:<42} {r['calls']:>8} {r['total_ms']:>10.3f} "
+                f"{r['total_ns'] / total_ns:>6.1%} {r['mean_us']:>9.2f} {r['max_ms']:>8.3f} {r['executed']:>7} "
+                f"{r['not_executed']:>7} {r['handler_error']:>5} {r['no_handler'] + r['no_handler_known']:>6}"
+            )
+        return "\n".join(lines)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional, List, Tuple
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, List, Tuple
 
 from engine.model.aura import AuraInstance
 
@@ -23,21 +23,195 @@ class AuraManager:
     # - Prop26/52 use apply(): overwrite duration, stacks stays 1.
     # - Prop54 uses apply_with_stack_limit(): stacks increased up to max, duration overwritten.
     # - tick(owner): decrements remaining_duration each TURN_END and expires at 0 (ignores -1).
+    #
+    # Trigger subscriptions:
+    # - _subs[event][owner] holds the aura ids that carry a payload for that event
+    #   (periodic_payloads[event] or the legacy periodic_timing/periodic_effect_rows pair).
+    # - Payloads are attached by ScriptDB *after* apply(), so applied auras are marked dirty
+    #   and (re)indexed lazily on the next subscribers()/has_subscribers() query.
+    # - Removal/expiry drops the aura from every event it was subscribed to.
+    #
+    # Listeners (e.g. WeatherManager) get on_aura_stored(aura) after apply/refresh and
+    # on_aura_removed(aura) on remove/expire.
+    #
+    # Change tracking (track_changes()): every (owner, aura id) applied, refreshed, ticked
+    # or removed is recorded until pop_changes(owner) (ABILITY_EFFECTS diffs).
 
     def __init__(self):
         self._auras: Dict[int, Dict[int, AuraInstance]] = {}
+        self._subs: Dict[str, Dict[int, Dict[int, None]]] = {}
+        self._sub_events: Dict[Tuple[int, int], Tuple[str, ...]] = {}
+        self._dirty: Dict[Tuple[int, int], None] = {}
+        self._listeners: List[Any] = []
+        self._changed: Optional[Dict[int, Dict[int, None]]] = None
+
+    def track_changes(self, enabled: bool = True) -> None:
+        self._changed = {} if enabled else None
+
+    def pop_changes(self, owner_pet_id: int) -> List[int]:
+        """Aura ids touched on owner_pet_id since the last call (needs track_changes())."""
+        if not self._changed:
+            return []
+        return list(self._changed.pop(int(owner_pet_id), ()))
+
+    def _touch(self, owner_pet_id: int, aura_id: int) -> None:
+        self._changed.setdefault(owner_pet_id, {})[aura_id] = None
+
+    @staticmethod
+    def _copy_aura(aura: AuraInstance) -> AuraInstance:
+        # Payload rows and meta values are never mutated in place: copying the containers suffices.
+        return replace(aura, periodic_payloads=dict(aura.periodic_payloads), meta=dict(aura.meta))
+
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """Copy of every aura plus the subscription index; restore() rewinds to it.
+
+        Listeners are not part of the state: they stay attached across restore().
+        """
+        return (
+            tuple((owner, tuple(self._copy_aura(a) for a in om.values())) for owner, om in self._auras.items()),
+            tuple((ev, tuple((owner, tuple(ids)) for owner, ids in by_owner.items())) for ev, by_owner in self._subs.items()),
+            tuple(self._sub_events.items()),
+            tuple(self._dirty),
+        )
+
+    def restore(self, state: Tuple[Any, ...]) -> None:
+        auras, subs, sub_events, dirty = state
+        self._auras = {owner: {a.aura_id: self._copy_aura(a) for a in items} for owner, items in auras}
+        self._subs = {ev: {owner: dict.fromkeys(ids) for owner, ids in by_owner} for ev, by_owner in subs}
+        self._sub_events = dict(sub_events)
+        self._dirty = dict.fromkeys(dirty)
+        if self._changed is not None:
+            self._changed = {}
+
+    def add_listener(self, listener: Any) -> None:
+        if not any(l is listener for l in self._listeners):
+            self._listeners.append(listener)
+
+    def _notify(self, hook: str, aura: AuraInstance) -> None:
+        for l in self._listeners:
+            fn = getattr(l, hook, None)
+            if fn is not None:
+                fn(aura)
 
     def get(self, owner_pet_id: int, aura_id: int) -> Optional[AuraInstance]:
         return self._auras.get(int(owner_pet_id), {}).get(int(aura_id))
 
+    def has_auras(self, owner_pet_id: int) -> bool:
+        return bool(self._auras.get(int(owner_pet_id)))
+
     def list_owner(self, owner_pet_id: int) -> Dict[int, AuraInstance]:
         return dict(self._auras.get(int(owner_pet_id), {}))
 
     def remove(self, owner_pet_id: int, aura_id: int) -> None:
         om = self._auras.get(int(owner_pet_id), {})
-        om.pop(int(aura_id), None)
+        inst = om.pop(int(aura_id), None)
+        if inst is not None and self._changed is not None:
+            self._touch(int(owner_pet_id), int(aura_id))
+        self._unsubscribe(int(owner_pet_id), int(aura_id))
         if not om and int(owner_pet_id) in self._auras:
             self._auras.pop(int(owner_pet_id), None)
+        if inst is not None and self._listeners:
+            self._notify("on_aura_removed", inst)
+
+    @staticmethod
+    def event_rows(aura: AuraInstance, event: str) -> Optional[List[Any]]:
+        """Rows an aura runs on `event`: periodic_payloads first, legacy single payload as fallback."""
+        rows = None
+        payloads = getattr(aura, "periodic_payloads", None)
+        if isinstance(payloads, dict):
+            rows = payloads.get(event)
+        if not rows:
+            timing = getattr(aura, "periodic_timing", "TURN_END")
+            if str(timing) == event:
+                rows = getattr(aura, "periodic_effect_rows", None)
+        return rows or None
+
+    def reindex(self, owner_pet_id: int, aura_id: int) -> None:
+        """Mark an aura for re-indexing after its payloads were changed outside apply()."""
+        self._dirty[(int(owner_pet_id), int(aura_id))] = None
+
+    def has_subscribers(self, event: str) -> bool:
+        if self._dirty:
+            self._flush_dirty()
+        return bool(self._subs.get(str(event)))
+
+    def has_any_subscribers(self, events: Tuple[str, ...]) -> bool:
+        if self._dirty:
+            self._flush_dirty()
+        subs = self._subs
+        for ev in events:
+            if ev in subs:
+                return True
+        return False
+
+    def subscribers(self, event: str, owner_pet_id: int) -> List[Tuple[AuraInstance, List[Any]]]:
+        """(aura, rows) for the owner's auras subscribed to `event`, in aura application order.
+
+        Returns a snapshot list, so auras applied/removed while the caller runs the rows
+        do not affect the current iteration.
+        """
+        if self._dirty:
+            self._flush_dirty()
+        ids = self._subs.get(str(event), {}).get(int(owner_pet_id))
+        if not ids:
+            return []
+        om = self._auras.get(int(owner_pet_id), {})
+        out: List[Tuple[AuraInstance, List[Any]]] = []
+        for aura_id in ids:
+            aura = om.get(aura_id)
+            if aura is None:
+                continue
+            rows = self.event_rows(aura, str(event))
+            if rows:
+                out.append((aura, rows))
+        return out
+
+    def _flush_dirty(self) -> None:
+        dirty = self._dirty
+        self._dirty = {}
+        for owner_id, aura_id in dirty:
+            aura = self._auras.get(owner_id, {}).get(aura_id)
+            if aura is None:
+                self._unsubscribe(owner_id, aura_id)
+                continue
+            events = []
+            payloads = getattr(aura, "periodic_payloads", None)
+            if isinstance(payloads, dict):
+                events.extend(str(ev) for ev, rows in payloads.items() if rows)
+            timing = str(getattr(aura, "periodic_timing", "TURN_END"))
+            if getattr(aura, "periodic_effect_rows", None) and timing not in events:
+                events.append(timing)
+
+            key = (owner_id, aura_id)
+            for ev in self._sub_events.get(key, ()):
+                if ev not in events:
+                    self._drop_sub(ev, owner_id, aura_id)
+            for ev in events:
+                # setdefault keeps the original position for refreshed auras (matches owner map order)
+                self._subs.setdefault(ev, {}).setdefault(owner_id, {})[aura_id] = None
+            if events:
+                self._sub_events[key] = tuple(events)
+            else:
+                self._sub_events.pop(key, None)
+
+    def _unsubscribe(self, owner_pet_id: int, aura_id: int) -> None:
+        key = (owner_pet_id, aura_id)
+        self._dirty.pop(key, None)
+        for ev in self._sub_events.pop(key, ()):
+            self._drop_sub(ev, owner_pet_id, aura_id)
+
+    def _drop_sub(self, event: str, owner_pet_id: int, aura_id: int) -> None:
+        by_owner = self._subs.get(event)
+        if not by_owner:
+            return
+        ids = by_owner.get(owner_pet_id)
+        if ids is None:
+            return
+        ids.pop(aura_id, None)
+        if not ids:
+            by_owner.pop(owner_pet_id, None)
+            if not by_owner:
+                self._subs.pop(event, None)
 
     def tick(self, owner_pet_id: int) -> List[AuraExpire]:
         # Decrement duration and expire
@@ -45,6 +219,8 @@ class AuraManager:
         om = self._auras.get(int(owner_pet_id), {})
         if not om:
             return expired
+        if self._changed is not None:
+            self._changed.setdefault(int(owner_pet_id), {}).update(dict.fromkeys(om))
 
         to_remove = []
         for aura_id, inst in om.items():
@@ -68,11 +244,16 @@ class AuraManager:
                 if inst.remaining_duration <= 0:
                     to_remove.append(aura_id)
 
+        removed = []
         for aura_id in to_remove:
-            om.pop(aura_id, None)
+            removed.append(om.pop(aura_id))
+            self._unsubscribe(int(owner_pet_id), int(aura_id))
             expired.append(AuraExpire(owner_pet_id=int(owner_pet_id), aura_id=int(aura_id)))
         if not om:
             self._auras.pop(int(owner_pet_id), None)
+        if self._listeners:
+            for inst in removed:
+                self._notify("on_aura_removed", inst)
         return expired
 
     def apply(
@@ -107,6 +288,11 @@ class AuraManager:
             stacks=1,
         )
         owner_map[int(aura_id)] = aura
+        self._dirty[(int(owner_pet_id), int(aura_id))] = None
+        if self._changed is not None:
+            self._touch(int(owner_pet_id), int(aura_id))
+        if self._listeners:
+            self._notify("on_aura_stored", aura)
         return AuraApplyResult(applied=not refreshed, refreshed=refreshed, aura=aura, reason="OK")
 
     def apply_with_stack_limit(
@@ -144,6 +330,11 @@ class AuraManager:
                 stacks=1,
             )
             owner_map[int(aura_id)] = aura
+            self._dirty[(int(owner_pet_id), int(aura_id))] = None
+            if self._changed is not None:
+                self._touch(int(owner_pet_id), int(aura_id))
+            if self._listeners:
+                self._notify("on_aura_stored", aura)
             return AuraApplyResult(applied=True, refreshed=False, aura=aura, reason="OK")
 
         # refresh + increment stacks up to limit
@@ -151,6 +342,11 @@ class AuraManager:
         existing.caster_pet_id = int(caster_pet_id)
         existing.source_effect_id = int(source_effect_id)
         existing.just_applied = True
+        self._dirty[(int(owner_pet_id), int(aura_id))] = None
+        if self._changed is not None:
+            self._touch(int(owner_pet_id), int(aura_id))
         if existing.stacks < max_stacks:
             existing.stacks += 1
+        if self._listeners:
+            self._notify("on_aura_stored", existing)
         return AuraApplyResult(applied=False, refreshed=True, aura=existing, reason="OK")
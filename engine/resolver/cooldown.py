@@ -19,6 +19,12 @@ class CooldownManager:
         else:
             self._cd[(int(pet_id), int(ability_id))] = t
 
+    def checkpoint(self) -> Tuple[Tuple[int, int, int], ...]:
+        return tuple((p, a, t) for (p, a), t in self._cd.items())
+
+    def restore(self, state: Tuple[Tuple[int, int, int], ...]) -> None:
+        self._cd = {(int(p), int(a)): int(t) for p, a, t in state}
+
     def tick_down(self) -> None:
         # called once per battle round (TURN_START)
         remove = []
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from engine.constants.type_advantage import type_multiplier
-from engine.constants.weather import get_weather_effect
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from engine.constants.type_advantage import TYPE_MULT_TABLE, TYPE_UNKNOWN_INDEX, type_index, type_multiplier
+from engine.constants.weather import NEUTRAL_DAMAGE_MULT_ROW, WEATHER_DAMAGE_MULT_TABLE, get_weather_effect
+from engine.core.trace import TRACE_EXTENDED, TRACE_OFF, trace_level
 
 
 @dataclass
 class ResolvedDamage:
+    __slots__ = ("final_damage", "trace")
     final_damage: int
-    trace: Dict[str, Any]
+    trace: Optional[Dict[str, Any]]  # None at TRACE_OFF
 
 
 class DamagePipeline:
@@ -33,6 +40,9 @@ class DamagePipeline:
           * Magic: cap non-periodic hits at 35% of max HP
           * Elemental: ignore negative weather effects (for flat adds and hit handled elsewhere)
 
+    resolve_batch() resolves many events at once (RNG consumed in event order, numeric
+    composition vectorized via compose_damage_batch); results match resolve().
+
     Out-of-scope in v1 (not modeled here):
       - Mechanical revive / Undead extra round / Humanoid lifesteal / Dragonkin kill buff
     """
@@ -72,7 +82,8 @@ class DamagePipeline:
             return None
         return None
 
-    def resolve(self, ctx: Any, dmg_event) -> ResolvedDamage:
+    def _gather(self, ctx: Any, dmg_event) -> "_DamageInputs":
+        """Gather everything ctx-dependent for one event (no RNG; rolls are filled by _prepare)."""
         points = int(getattr(dmg_event, "points", 0) or 0)
         actor = getattr(dmg_event, "source_actor", None)
         target = getattr(dmg_event, "target", None)
@@ -93,9 +104,6 @@ class DamagePipeline:
             except Exception:
                 power = float(getattr(actor, "power", 0) or 0)
 
-        # --- S1: base damage ---
-        base = int(points * (1.0 + power / 20.0))
-
         # --- State/Aura multipliers + flats ---
         mul_state = 1.0
         flat_state = 0
@@ -110,7 +118,7 @@ class DamagePipeline:
                 mul_state = 1.0
                 flat_state = 0
 
-        # --- Type advantage ---
+        # --- Type advantage (multiplier is read from TYPE_MULT_TABLE) ---
         atk_override = getattr(dmg_event, "attack_type_override", None)
         if atk_override is not None:
             try:
@@ -120,13 +128,10 @@ class DamagePipeline:
         else:
             attack_type = self._attack_type(ctx, int(getattr(dmg_event, "ability_id", 0) or 0), actor)
         target_type = self._pet_type(target)
-        mul_type, type_reason = type_multiplier(attack_type, target_type)
 
-        # --- Weather ---
+        # --- Weather (multiplier is read from WEATHER_DAMAGE_MULT_TABLE) ---
         wid = 0
-        mul_weather = 1.0
         flat_weather = 0
-        we = None
         wm = getattr(ctx, "weather", None)
         if wm is not None:
             try:
@@ -135,10 +140,6 @@ class DamagePipeline:
                 wid = 0
             we = get_weather_effect(wid)
             if we is not None:
-                try:
-                    mul_weather = float(we.damage_mult_by_attack_type.get(int(attack_type), 1.0))
-                except Exception:
-                    mul_weather = 1.0
                 try:
                     flat_weather = int(we.flat_damage_taken_add)
                 except Exception:
@@ -179,49 +180,70 @@ class DamagePipeline:
             except Exception:
                 undead_immune = False
 
+        # --- Crit configuration ---
+        crit_chance = float(getattr(ctx, "crit_chance", 0.05) or 0.05)
+        crit_mult = float(getattr(ctx, "crit_mult", 1.5) or 1.5)
+        periodic_can_crit = bool(getattr(ctx, "periodic_can_crit", False))
+        can_crit = crit_chance > 0.0 and (not is_periodic or periodic_can_crit)
+
+        return _DamageInputs(
+            points=points, power=power, target=target, target_id=target_id,
+            mul_state=mul_state, flat_state=flat_state, is_periodic=is_periodic,
+            attack_type=attack_type, target_type=target_type, wid=wid, flat_weather=flat_weather,
+            mul_beast=mul_beast, mul_aquatic=mul_aquatic, mul_dragonkin=mul_dragonkin,
+            undead_immune=undead_immune, crit_chance=crit_chance, crit_mult=crit_mult, can_crit=can_crit,
+        )
+
+    def _prepare(self, ctx: Any, dmg_event) -> "_DamageInputs":
+        """_gather() plus this event's RNG rolls (variance, then crit)."""
+        inp = self._gather(ctx, dmg_event)
+
         # --- S7: variance (deterministic) ---
         v_override = getattr(dmg_event, "variance", None)
         if v_override is not None:
             try:
-                v = float(v_override)
+                inp.v = float(v_override)
             except Exception:
-                v = float(self.rng.rand_variance())
+                inp.v = float(self.rng.rand_variance())
         else:
-            v = float(self.rng.rand_variance())
+            inp.v = float(self.rng.rand_variance())
 
         # --- Crit ---
-        crit_chance = float(getattr(ctx, "crit_chance", 0.05) or 0.05)
-        crit_mult = float(getattr(ctx, "crit_mult", 1.5) or 1.5)
-        periodic_can_crit = bool(getattr(ctx, "periodic_can_crit", False))
-        rcrit = float(self.rng.rand_crit())  # always consume for determinism
-        is_crit = False
-        if crit_chance > 0.0 and (not is_periodic or periodic_can_crit):
-            if rcrit <= crit_chance:
-                is_crit = True
-
-        # --- Undead immortality: immune to all damage ---
-        if undead_immune:
-            trace: Dict[str, Any] = {"S1_base": 0, "S7_variance_roll": 0.0, "undead_immune": True}
-            return ResolvedDamage(final_damage=0, trace=trace)
-
-        # --- Compose ---
-        dmg_f = float(base)
-        dmg_f *= float(mul_state)
-        dmg_f *= float(mul_type)
-        dmg_f *= float(mul_weather)
-        dmg_f *= float(mul_beast)
-        dmg_f *= float(mul_aquatic)
-        dmg_f *= float(mul_dragonkin)
-        dmg_f *= float(v)
-        if is_crit:
-            dmg_f *= float(crit_mult)
-
-        dmg = int(dmg_f)
-        dmg += int(flat_state) + int(flat_weather)
+        inp.rcrit = float(self.rng.rand_crit())  # always consume for determinism
+        inp.is_crit = bool(inp.can_crit and inp.rcrit <= inp.crit_chance)
+        return inp
+
+    def _prepare_batch(self, ctx: Any, dmg_events: Sequence[Any], draws: Any) -> List["_DamageInputs"]:
+        """_prepare() for many events with one draws() call per RNG stream.
+
+        Only for RNGs with independent per-stream sequences (BlockRNG): each stream
+        yields the same values in the same event order as repeated _prepare() calls.
+        """
+        inputs = [self._gather(ctx, ev) for ev in dmg_events]
+        rolled = []
+        for inp, ev in zip(inputs, dmg_events):
+            v_override = getattr(ev, "variance", None)
+            if v_override is not None:
+                try:
+                    inp.v = float(v_override)
+                    continue
+                except Exception:
+                    pass
+            rolled.append(inp)
+        for inp, v in zip(rolled, draws("var", len(rolled))):
+            inp.v = float(v)
+        for inp, r in zip(inputs, draws("crit", len(inputs))):
+            inp.rcrit = float(r)
+            inp.is_crit = bool(inp.can_crit and inp.rcrit <= inp.crit_chance)
+        return inputs
+
+    def _post(self, ctx: Any, inp: "_DamageInputs", dmg: int) -> int:
+        """Target-side caps applied after composition: Magic 35% cap, then state thresholds."""
+        stats = getattr(ctx, "stats", None)
 
         # Magic passive: cap non-periodic hits to 35% max HP.
-        eff_target = self._snap(stats, ctx, target)
-        if target_type == 5 and not is_periodic and eff_target is not None:
+        eff_target = self._snap(stats, ctx, inp.target)
+        if inp.target_type == 5 and not inp.is_periodic and eff_target is not None:
             try:
                 cap = int(float(eff_target.max_hp) * 0.35)
                 if cap < 0:
@@ -234,33 +256,211 @@ class DamagePipeline:
         # State thresholds (ignore/clamp).
         if stats is not None and hasattr(stats, "apply_damage_thresholds"):
             try:
-                dmg = int(stats.apply_damage_thresholds(ctx, target_id=target_id, dmg=int(dmg)))
+                dmg = int(stats.apply_damage_thresholds(ctx, target_id=inp.target_id, dmg=int(dmg)))
             except Exception:
                 pass
+        return dmg
+
+    def _finish(self, ctx: Any, inp: "_DamageInputs", base: int, dmg: int) -> ResolvedDamage:
+        """Apply target caps/thresholds to the composed damage and build the trace (ctx.trace_level)."""
+        level = trace_level(ctx)
+
+        # --- Undead immortality: immune to all damage ---
+        if inp.undead_immune:
+            if level == TRACE_OFF:
+                return ResolvedDamage(0, None)
+            trace: Dict[str, Any] = {"S1_base": 0, "S7_variance_roll": 0.0, "undead_immune": True}
+            return ResolvedDamage(final_damage=0, trace=trace)
+
+        target_type = inp.target_type
+        dmg = self._post(ctx, inp, dmg)
+        if level == TRACE_OFF:
+            return ResolvedDamage(max(0, int(dmg)), None)
 
         trace: Dict[str, Any] = {
             "S1_base": int(base),
-            "S7_variance_roll": float(v),
+            "S7_variance_roll": float(inp.v),
         }
-        if getattr(ctx, "trace_extended", False):
+        if level >= TRACE_EXTENDED:
+            mul_type, type_reason = type_multiplier(inp.attack_type, target_type)
             trace.update({
-                "S2_power": float(power),
-                "S3_mul_state": float(mul_state),
-                "S4_attack_type": int(attack_type),
+                "S2_power": float(inp.power),
+                "S3_mul_state": float(inp.mul_state),
+                "S4_attack_type": int(inp.attack_type),
                 "S5_target_type": int(target_type),
                 "S6_mul_type": float(mul_type),
                 "S6_type_reason": str(type_reason),
-                "S6_mul_weather": float(mul_weather),
-                "S6_weather_state": int(wid),
-                "S6_flat_weather": int(flat_weather),
-                "S6_mul_beast": float(mul_beast),
-                "S6_mul_aquatic": float(mul_aquatic),
-                "S6_mul_dragonkin": float(mul_dragonkin),
-                "S8_crit_roll": float(rcrit),
-                "S8_is_crit": bool(is_crit),
-                "S8_crit_mult": float(crit_mult if is_crit else 1.0),
-                "S9_flat_state": int(flat_state),
-                "S10_is_periodic": bool(is_periodic),
+                "S6_mul_weather": float(_weather_row(inp.wid)[type_index(inp.attack_type)]),
+                "S6_weather_state": int(inp.wid),
+                "S6_flat_weather": int(inp.flat_weather),
+                "S6_mul_beast": float(inp.mul_beast),
+                "S6_mul_aquatic": float(inp.mul_aquatic),
+                "S6_mul_dragonkin": float(inp.mul_dragonkin),
+                "S8_crit_roll": float(inp.rcrit),
+                "S8_is_crit": bool(inp.is_crit),
+                "S8_crit_mult": float(inp.crit_mult if inp.is_crit else 1.0),
+                "S9_flat_state": int(inp.flat_state),
+                "S10_is_periodic": bool(inp.is_periodic),
             })
 
         return ResolvedDamage(final_damage=max(0, int(dmg)), trace=trace)
+
+    def resolve(self, ctx: Any, dmg_event) -> ResolvedDamage:
+        inp = self._prepare(ctx, dmg_event)
+        if inp.undead_immune:
+            return self._finish(ctx, inp, 0, 0)
+
+        # --- S1: base damage ---
+        base = int(inp.points * (1.0 + inp.power / 20.0))
+
+        # --- Compose ---
+        a = type_index(inp.attack_type)
+        dmg_f = float(base)
+        dmg_f *= float(inp.mul_state)
+        dmg_f *= TYPE_MULT_TABLE[a][type_index(inp.target_type)]
+        dmg_f *= _weather_row(inp.wid)[a]
+        dmg_f *= float(inp.mul_beast)
+        dmg_f *= float(inp.mul_aquatic)
+        dmg_f *= float(inp.mul_dragonkin)
+        dmg_f *= float(inp.v)
+        if inp.is_crit:
+            dmg_f *= float(inp.crit_mult)
+
+        dmg = int(dmg_f)
+        dmg += int(inp.flat_state) + int(inp.flat_weather)
+        return self._finish(ctx, inp, base, dmg)
+
+    def resolve_batch(self, ctx: Any, dmg_events: Sequence[Any]) -> List[ResolvedDamage]:
+        """Resolve many DamageEvents against the same ctx state; results match resolve() per event.
+
+        Events are resolved independently (no damage is applied in between), consuming RNG
+        in event order exactly like repeated resolve() calls (one draws() call per stream
+        when the RNG has it, e.g. BlockRNG). The numeric composition runs through
+        compose_damage_batch (vectorized when NumPy is available).
+        """
+        draws = getattr(self.rng, "draws", None)
+        if draws is not None:
+            inputs = self._prepare_batch(ctx, dmg_events, draws)
+        else:
+            inputs = [self._prepare(ctx, ev) for ev in dmg_events]
+        if not inputs:
+            return []
+        bases, dmgs = compose_damage_batch(
+            points=[i.points for i in inputs],
+            power=[i.power for i in inputs],
+            mul_state=[i.mul_state for i in inputs],
+            attack_type=[i.attack_type for i in inputs],
+            target_type=[i.target_type for i in inputs],
+            weather_id=[i.wid for i in inputs],
+            mul_beast=[i.mul_beast for i in inputs],
+            mul_aquatic=[i.mul_aquatic for i in inputs],
+            mul_dragonkin=[i.mul_dragonkin for i in inputs],
+            variance=[i.v for i in inputs],
+            crit_mult=[(i.crit_mult if i.is_crit else 1.0) for i in inputs],
+            flat=[int(i.flat_state) + int(i.flat_weather) for i in inputs],
+        )
+        return [self._finish(ctx, inp, int(b), int(d)) for inp, b, d in zip(inputs, bases, dmgs)]
+
+
+@dataclass
+class _DamageInputs:
+    points: int
+    power: float
+    target: Any
+    target_id: int
+    mul_state: float
+    flat_state: int
+    is_periodic: bool
+    attack_type: int
+    target_type: int
+    wid: int
+    flat_weather: int
+    mul_beast: float
+    mul_aquatic: float
+    mul_dragonkin: float
+    undead_immune: bool
+    crit_chance: float
+    crit_mult: float
+    can_crit: bool
+    v: float = 1.0
+    rcrit: float = 1.0
+    is_crit: bool = False
+
+
+def _weather_row(wid: int) -> Tuple[float, ...]:
+    return WEATHER_DAMAGE_MULT_TABLE.get(wid, NEUTRAL_DAMAGE_MULT_ROW)
+
+
+_NP_TYPE_TABLE = None
+_NP_WEATHER: Optional[Tuple[Dict[int, int], Any]] = None
+
+
+def _np_tables():
+    global _NP_TYPE_TABLE, _NP_WEATHER
+    if _NP_TYPE_TABLE is None:
+        _NP_TYPE_TABLE = np.array(TYPE_MULT_TABLE, dtype=np.float64)
+        wids = sorted(WEATHER_DAMAGE_MULT_TABLE)
+        rows = [NEUTRAL_DAMAGE_MULT_ROW] + [WEATHER_DAMAGE_MULT_TABLE[w] for w in wids]
+        _NP_WEATHER = ({w: i + 1 for i, w in enumerate(wids)}, np.array(rows, dtype=np.float64))
+    return _NP_TYPE_TABLE, _NP_WEATHER
+
+
+def compose_damage_batch(
+    *,
+    points: Sequence[int],
+    power: Sequence[float],
+    mul_state: Sequence[float],
+    attack_type: Sequence[int],
+    target_type: Sequence[int],
+    weather_id: Sequence[int],
+    mul_beast: Sequence[float],
+    mul_aquatic: Sequence[float],
+    mul_dragonkin: Sequence[float],
+    variance: Sequence[float],
+    crit_mult: Sequence[float],
+    flat: Sequence[int],
+) -> Tuple[Sequence[int], Sequence[int]]:
+    """Vectorized S1..S9 damage composition (before target caps/thresholds).
+
+    Inputs are per-event columns (any mix of events and battles); `crit_mult` is 1.0 for
+    non-crits and `flat` is flat_state + flat_weather. Returns (base, damage) columns.
+    Multiplication order matches DamagePipeline.resolve, so results are bit-identical.
+    """
+    if np is None:
+        bases: List[int] = []
+        dmgs: List[int] = []
+        for k in range(len(points)):
+            base = int(points[k] * (1.0 + power[k] / 20.0))
+            a = type_index(int(attack_type[k]))
+            dmg_f = float(base)
+            dmg_f *= float(mul_state[k])
+            dmg_f *= TYPE_MULT_TABLE[a][type_index(int(target_type[k]))]
+            dmg_f *= _weather_row(int(weather_id[k]))[a]
+            dmg_f *= float(mul_beast[k])
+            dmg_f *= float(mul_aquatic[k])
+            dmg_f *= float(mul_dragonkin[k])
+            dmg_f *= float(variance[k])
+            dmg_f *= float(crit_mult[k])
+            bases.append(base)
+            dmgs.append(int(dmg_f) + int(flat[k]))
+        return bases, dmgs
+
+    type_table, (weather_rows, weather_table) = _np_tables()
+    unknown = TYPE_UNKNOWN_INDEX
+    a = np.asarray(attack_type, dtype=np.int64)
+    t = np.asarray(target_type, dtype=np.int64)
+    a = np.where((a >= 0) & (a < unknown), a, unknown)
+    t = np.where((t >= 0) & (t < unknown), t, unknown)
+    w = np.fromiter((weather_rows.get(int(x), 0) for x in weather_id), dtype=np.int64, count=len(a))
+
+    base = np.trunc(np.asarray(points, dtype=np.float64) * (1.0 + np.asarray(power, dtype=np.float64) / 20.0))
+    dmg_f = base * np.asarray(mul_state, dtype=np.float64)
+    dmg_f *= type_table[a, t]
+    dmg_f *= weather_table[w, a]
+    dmg_f *= np.asarray(mul_beast, dtype=np.float64)
+    dmg_f *= np.asarray(mul_aquatic, dtype=np.float64)
+    dmg_f *= np.asarray(mul_dragonkin, dtype=np.float64)
+    dmg_f *= np.asarray(variance, dtype=np.float64)
+    dmg_f *= np.asarray(crit_mult, dtype=np.float64)
+    dmg = np.trunc(dmg_f).astype(np.int64) + np.asarray(flat, dtype=np.int64)
+    return base.astype(np.int64).tolist(), dmg.tolist()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+"""Dense state storage (drop-in alternative to StateManager).
+
+Hot state ids get a fixed column in a preallocated int32 `[num_pets, K]` table
+(row per pet id, allocated on first write); everything else, and values that do
+not fit in int32, falls back to a per-pet dict. The public API matches
+StateManager (get/set/clear_pet/snapshot_pet), plus whole-table helpers for batch
+simulation and RL observation export. make_state_manager() picks the backend for a
+battle context (main.run_battle(state_backend=...), main.py --state-backend).
+
+NumPy is optional: without it the table is a flat `array('i')` with the same layout.
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from engine.core.team_manager import STATE_SWAP_IN_LOCK, STATE_SWAP_OUT_LOCK, STATE_TURN_LOCK
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.state_manager import StateChange, StateManager
+from engine.resolver import stats_resolver as _sr
+
+STATE_IS_DEAD = 1
+
+# Column order is part of the export layout (state_matrix()); append only.
+DENSE_STATE_IDS: tuple = (
+    STATE_IS_DEAD,
+    _sr.STATE_MAX_HEALTH_BONUS,
+    _sr.STATE_MOD_MAX_HEALTH_PERCENT,
+    _sr.STATE_STAT_POWER,
+    _sr.STATE_STAT_SPEED,
+    _sr.STATE_MOD_SPEED_PERCENT,
+    _sr.STATE_MOD_DAMAGE_DEALT_PERCENT,
+    _sr.STATE_MOD_DAMAGE_TAKEN_PERCENT,
+    _sr.STATE_ADD_FLAT_DAMAGE_TAKEN,
+    _sr.STATE_ADD_FLAT_DAMAGE_DEALT,
+    _sr.STATE_ADD_PERIODIC_DAMAGE_TAKEN,
+    _sr.STATE_MOD_HEALING_DEALT_PERCENT,
+    _sr.STATE_MOD_HEALING_TAKEN_PERCENT,
+    _sr.STATE_IGNORE_DAMAGE_BELOW,
+    _sr.STATE_IGNORE_DAMAGE_ABOVE,
+    HitCheck._STATE_STAT_ACCURACY,
+    HitCheck._STATE_STAT_DODGE,
+    STATE_TURN_LOCK,
+    STATE_SWAP_OUT_LOCK,
+    STATE_SWAP_IN_LOCK,
+)
+
+STATE_BACKENDS = ("dict", "dense")
+
+_I32_MIN = -(2 ** 31)
+_I32_MAX = 2 ** 31 - 1
+
+
+class DenseStateManager:
+    def __init__(self, num_pets: int = 8, state_ids: Optional[Sequence[int]] = None):
+        ids = tuple(int(s) for s in (state_ids if state_ids is not None else DENSE_STATE_IDS))
+        self._state_ids = ids
+        self._cols: Dict[int, int] = {sid: i for i, sid in enumerate(ids)}
+        self._k = len(ids)
+        self._cap = max(1, int(num_pets))
+        self._dense = self._alloc(self._cap * self._k)
+
+        # pet_id -> row index
+        self._rows: Dict[int, int] = {}
+        # pet_id -> state ids ever set, in first-set order (presence + snapshot order)
+        self._keys: Dict[int, Dict[int, None]] = {}
+        # pet_id -> state_id -> value for rare ids / values outside int32
+        self._sparse: Dict[int, Dict[int, int]] = {}
+        # pet_id -> state ids written since the last pop_changes() (None: not tracking)
+        self._changed: Optional[Dict[int, Dict[int, None]]] = None
+
+    def track_changes(self, enabled: bool = True) -> None:
+        self._changed = {} if enabled else None
+
+    def pop_changes(self, pet_id: int) -> List[int]:
+        """State ids set or cleared on pet_id since the last call (needs track_changes())."""
+        if not self._changed:
+            return []
+        return list(self._changed.pop(int(pet_id), ()))
+
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """Compact copy (raw int32 table + index dicts); restore() rewinds to it."""
+        n = len(self._rows) * self._k
+        return (
+            tuple(self._rows),
+            tuple((pid, tuple(keys)) for pid, keys in self._keys.items()),
+            tuple((pid, tuple(sp.items())) for pid, sp in self._sparse.items()),
+            self._dense[:n].tobytes(),
+        )
+
+    def restore(self, state: Tuple[Any, ...]) -> None:
+        rows, keys, sparse, raw = state
+        self._rows = {pid: i for i, pid in enumerate(rows)}
+        self._keys = {pid: dict.fromkeys(ids) for pid, ids in keys}
+        self._sparse = {pid: dict(items) for pid, items in sparse}
+        self._cap = max(self._cap, len(rows))
+        dense = self._alloc(self._cap * self._k)
+        if np is not None:
+            dense[:len(raw) // 4] = np.frombuffer(raw, dtype=np.int32)
+        else:
+            dense[:len(raw) // 4] = array("i", raw)
+        self._dense = dense
+        if self._changed is not None:
+            self._changed = {}
+
+    @staticmethod
+    def _alloc(n: int) -> Any:
+        if np is not None:
+            return np.zeros(n, dtype=np.int32)
+        return array("i", bytes(4 * n))
+
+    @property
+    def state_ids(self) -> tuple:
+        return self._state_ids
+
+    @property
+    def pet_ids(self) -> List[int]:
+        """Pet ids in row order (row i of state_matrix() belongs to pet_ids[i])."""
+        return list(self._rows.keys())
+
+    def _row(self, pid: int) -> int:
+        row = self._rows.get(pid)
+        if row is None:
+            row = len(self._rows)
+            if row >= self._cap:
+                grow = self._cap
+                if np is not None:
+                    self._dense = np.concatenate([self._dense, np.zeros(grow * self._k, dtype=np.int32)])
+                else:
+                    self._dense.extend(array("i", bytes(4 * grow * self._k)))
+                self._cap += grow
+            self._rows[pid] = row
+        return row
+
+    def get(self, pet_id: int, state_id: int, default: int = 0) -> int:
+        pet_id = int(pet_id)
+        state_id = int(state_id)
+        keys = self._keys.get(pet_id)
+        if keys is None or state_id not in keys:
+            return int(default)
+        sp = self._sparse.get(pet_id)
+        if sp is not None and state_id in sp:
+            return sp[state_id]
+        return int(self._dense[self._rows[pet_id] * self._k + self._cols[state_id]])
+
+    def set(self, pet_id: int, state_id: int, value: int) -> StateChange:
+        pid = int(pet_id); sid = int(state_id); v = int(value)
+        keys = self._keys.get(pid)
+        if keys is None:
+            keys = self._keys[pid] = {}
+        keys[sid] = None
+        if self._changed is not None:
+            self._changed.setdefault(pid, {})[sid] = None
+
+        col = self._cols.get(sid)
+        if col is not None and _I32_MIN <= v <= _I32_MAX:
+            row = self._row(pid)  # may grow (and replace) the table
+            self._dense[row * self._k + col] = v
+            sp = self._sparse.get(pid)
+            if sp is not None:
+                sp.pop(sid, None)
+        else:
+            self._sparse.setdefault(pid, {})[sid] = v
+        return StateChange(pet_id=pid, state_id=sid, value=v)
+
+    def clear_pet(self, pet_id: int) -> None:
+        pid = int(pet_id)
+        old = self._keys.pop(pid, None)
+        if old and self._changed is not None:
+            self._changed.setdefault(pid, {}).update(old)
+        self._sparse.pop(pid, None)
+        row = self._rows.get(pid)
+        if row is not None:
+            lo = row * self._k
+            if np is not None:
+                self._dense[lo:lo + self._k] = 0
+            else:
+                self._dense[lo:lo + self._k] = array("i", bytes(4 * self._k))
+
+    def snapshot_pet(self, pet_id: int) -> Dict[int, int]:
+        pid = int(pet_id)
+        keys = self._keys.get(pid)
+        if not keys:
+            return {}
+        return {sid: self.get(pid, sid) for sid in keys}
+
+    # ---- whole-table helpers (batch simulation / observation export) ----
+
+    def state_matrix(self) -> Any:
+        """Copy of the dense table, shape [len(pet_ids), K] (list of rows without numpy).
+
+        Unset cells and rare (sparse) states read as 0.
+        """
+        n = len(self._rows)
+        if np is not None:
+            return self._dense[: n * self._k].reshape(n, self._k).copy()
+        k = self._k
+        return [list(self._dense[r * k:(r + 1) * k]) for r in range(n)]
+
+    def clear_pets(self, pet_ids: Sequence[int]) -> None:
+        rows = []
+        for pet_id in pet_ids:
+            pid = int(pet_id)
+            old = self._keys.pop(pid, None)
+            if old and self._changed is not None:
+                self._changed.setdefault(pid, {}).update(old)
+            self._sparse.pop(pid, None)
+            row = self._rows.get(pid)
+            if row is not None:
+                rows.append(row)
+        if not rows:
+            return
+        if np is not None:
+            self._dense.reshape(self._cap, self._k)[rows, :] = 0
+        else:
+            for row in rows:
+                lo = row * self._k
+                self._dense[lo:lo + self._k] = array("i", bytes(4 * self._k))
+
+    def copy(self) -> "DenseStateManager":
+        out = DenseStateManager.__new__(DenseStateManager)
+        out._state_ids = self._state_ids
+        out._cols = self._cols
+        out._k = self._k
+        out._cap = self._cap
+        out._dense = self._dense.copy() if np is not None else array("i", self._dense)
+        out._rows = dict(self._rows)
+        out._keys = {pid: dict(keys) for pid, keys in self._keys.items()}
+        out._sparse = {pid: dict(sp) for pid, sp in self._sparse.items()}
+        out._changed = None
+        return out
+
+
+def make_state_manager(backend: str = "dict", num_pets: int = 8) -> Any:
+    """StateManager ("dict") or DenseStateManager ("dense") for a new battle context."""
+    if backend == "dict":
+        return StateManager()
+    if backend == "dense":
+        return DenseStateManager(num_pets=num_pets)
+    raise ValueError(f"state backend must be one of {STATE_BACKENDS}, not {backend!r}")
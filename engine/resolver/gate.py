@@ -1,5 +1,10 @@
 from dataclasses import dataclass
-from typing import Any, Tuple
+from typing import Any, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
 
 @dataclass
 class GateCheck:
@@ -30,3 +35,17 @@ class GateCheck:
         r = float(self.rng.rand_gate())
         passed = (r <= c)
         return passed, c, r
+
+    def compute_batch(self, chances: Sequence[Any]) -> List[Tuple[bool, float, float]]:
+        """compute() for many gates; one gate roll per chance, drawn in order."""
+        rolls = [float(self.rng.rand_gate()) for _ in chances]
+        norm = [self._normalize_chance(c) for c in chances]
+        passed = resolve_gates(norm, rolls)
+        return [(bool(p), c, r) for p, c, r in zip(passed, norm, rolls)]
+
+
+def resolve_gates(chances: Sequence[float], rolls: Sequence[float]) -> Sequence[bool]:
+    """Vectorized gate outcomes for normalized chances (0..1) and pre-drawn gate rolls."""
+    if np is None:
+        return [r <= c for c, r in zip(chances, rolls)]
+    return (np.asarray(rolls, dtype=np.float64) <= np.asarray(chances, dtype=np.float64)).tolist()
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
 
 from engine.constants.weather import get_weather_effect
+from engine.core.trace import TRACE_EXTENDED, TRACE_OFF, trace_level
 
 
 @dataclass
 class ResolvedHeal:
+    __slots__ = ("final_heal", "trace")
     final_heal: int
-    trace: Dict[str, Any]
+    trace: Optional[Dict[str, Any]]  # None at TRACE_OFF
 
 
 class HealPipeline:
@@ -24,6 +31,7 @@ class HealPipeline:
     Notes:
       - By default, heals do not crit in this v1 engine (configurable via ctx.heal_can_crit).
       - Elemental passive: ignore negative weather effects (e.g. Darkness healing reduction).
+      - resolve_batch() resolves many events at once via compose_heal_batch.
     """
 
     def __init__(self, rng):
@@ -35,7 +43,8 @@ class HealPipeline:
         except Exception:
             return -1
 
-    def resolve(self, ctx: Any, heal_event) -> ResolvedHeal:
+    def _prepare(self, ctx: Any, heal_event) -> "_HealInputs":
+        """Gather ctx-dependent inputs for one event and consume its RNG rolls (variance, crit)."""
         points = int(getattr(heal_event, "points", 0) or 0)
         actor = getattr(heal_event, "source_actor", None)
         target = getattr(heal_event, "target", None)
@@ -56,9 +65,6 @@ class HealPipeline:
             except Exception:
                 power = float(getattr(actor, "power", 0) or 0)
 
-        # --- S1 base ---
-        base = int(points * (1.0 + power / 20.0))
-
         # --- State/Aura heal multipliers ---
         mul_state = 1.0
         if stats is not None and hasattr(stats, "heal_multiplier"):
@@ -107,27 +113,110 @@ class HealPipeline:
             if rcrit <= crit_chance:
                 is_crit = True
 
-        heal_f = float(base)
-        heal_f *= float(mul_state)
-        heal_f *= float(mul_weather)
-        heal_f *= float(v)
-        if is_crit:
-            heal_f *= float(crit_mult)
+        return _HealInputs(
+            points=points, power=power, mul_state=mul_state, wid=wid, mul_weather=mul_weather,
+            v=v, rcrit=rcrit, is_crit=is_crit, crit_mult=crit_mult,
+        )
 
-        heal = int(heal_f)
+    def _finish(self, ctx: Any, inp: "_HealInputs", base: int, heal: int) -> ResolvedHeal:
+        level = trace_level(ctx)
+        if level == TRACE_OFF:
+            return ResolvedHeal(max(0, int(heal)), None)
 
         trace: Dict[str, Any] = {
             "S1_base": int(base),
-            "S7_variance_roll": float(v),
+            "S7_variance_roll": float(inp.v),
         }
-        if getattr(ctx, "trace_extended", False):
+        if level >= TRACE_EXTENDED:
             trace.update({
-                "S2_power": float(power),
-                "S8_mul_state": float(mul_state),
-                "S9_mul_weather": float(mul_weather),
-                "S9_weather_state": int(wid),
-                "S10_crit_roll": float(rcrit),
-                "S10_is_crit": bool(is_crit),
+                "S2_power": float(inp.power),
+                "S8_mul_state": float(inp.mul_state),
+                "S9_mul_weather": float(inp.mul_weather),
+                "S9_weather_state": int(inp.wid),
+                "S10_crit_roll": float(inp.rcrit),
+                "S10_is_crit": bool(inp.is_crit),
             })
 
         return ResolvedHeal(final_heal=max(0, int(heal)), trace=trace)
+
+    def resolve(self, ctx: Any, heal_event) -> ResolvedHeal:
+        inp = self._prepare(ctx, heal_event)
+
+        # --- S1 base ---
+        base = int(inp.points * (1.0 + inp.power / 20.0))
+
+        heal_f = float(base)
+        heal_f *= float(inp.mul_state)
+        heal_f *= float(inp.mul_weather)
+        heal_f *= float(inp.v)
+        if inp.is_crit:
+            heal_f *= float(inp.crit_mult)
+
+        return self._finish(ctx, inp, base, int(heal_f))
+
+    def resolve_batch(self, ctx: Any, heal_events: Sequence[Any]) -> List[ResolvedHeal]:
+        """Resolve many HealEvents against the same ctx state; results match resolve() per event.
+
+        RNG is consumed in event order (variance, crit per event) like repeated resolve() calls.
+        """
+        inputs = [self._prepare(ctx, ev) for ev in heal_events]
+        if not inputs:
+            return []
+        bases, heals = compose_heal_batch(
+            points=[i.points for i in inputs],
+            power=[i.power for i in inputs],
+            mul_state=[i.mul_state for i in inputs],
+            mul_weather=[i.mul_weather for i in inputs],
+            variance=[i.v for i in inputs],
+            crit_mult=[(i.crit_mult if i.is_crit else 1.0) for i in inputs],
+        )
+        return [self._finish(ctx, inp, int(b), int(h)) for inp, b, h in zip(inputs, bases, heals)]
+
+
+@dataclass
+class _HealInputs:
+    points: int
+    power: float
+    mul_state: float
+    wid: int
+    mul_weather: float
+    v: float
+    rcrit: float
+    is_crit: bool
+    crit_mult: float
+
+
+def compose_heal_batch(
+    *,
+    points: Sequence[int],
+    power: Sequence[float],
+    mul_state: Sequence[float],
+    mul_weather: Sequence[float],
+    variance: Sequence[float],
+    crit_mult: Sequence[float],
+) -> Tuple[Sequence[int], Sequence[int]]:
+    """Vectorized heal composition; `crit_mult` is 1.0 for non-crits. Returns (base, heal) columns.
+
+    Same multiplication order as HealPipeline.resolve (bit-identical results). Heals are not
+    clamped at 0 here; ResolvedHeal does that.
+    """
+    if np is None:
+        bases: List[int] = []
+        heals: List[int] = []
+        for k in range(len(points)):
+            base = int(points[k] * (1.0 + power[k] / 20.0))
+            heal_f = float(base)
+            heal_f *= float(mul_state[k])
+            heal_f *= float(mul_weather[k])
+            heal_f *= float(variance[k])
+            heal_f *= float(crit_mult[k])
+            bases.append(base)
+            heals.append(int(heal_f))
+        return bases, heals
+
+    base = np.trunc(np.asarray(points, dtype=np.float64) * (1.0 + np.asarray(power, dtype=np.float64) / 20.0))
+    heal_f = base * np.asarray(mul_state, dtype=np.float64)
+    heal_f *= np.asarray(mul_weather, dtype=np.float64)
+    heal_f *= np.asarray(variance, dtype=np.float64)
+    heal_f *= np.asarray(crit_mult, dtype=np.float64)
+    return base.astype(np.int64).tolist(), np.trunc(heal_f).astype(np.int64).tolist()
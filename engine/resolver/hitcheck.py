@@ -1,5 +1,10 @@
 from dataclasses import dataclass
-from typing import Any, Tuple
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
 
 from engine.constants.weather import get_weather_effect
 
@@ -15,10 +20,8 @@ class HitCheck:
     _STATE_STAT_ACCURACY: int = 41
     _STATE_STAT_DODGE: int = 73
 
-    def compute(self, ctx: Any, actor: Any, target: Any, accuracy: Any, dont_miss: bool = False) -> Tuple[bool, str]:
-        if dont_miss:
-            return True, "DONT_MISS"
-
+    def _inputs(self, ctx: Any, actor: Any, target: Any, accuracy: Any) -> Tuple[float, float, float, int, int]:
+        """(raw accuracy, accuracy state sum, dodge state sum, weather id, actor type) for one check."""
         # Accuracy override context (Prop145/139): when set, it overrides the
         # per-effect Accuracy parameter for the remainder of the current turn.
         override = None
@@ -28,37 +31,34 @@ class HitCheck:
             override = None
 
         acc = float(override) if override is not None else (float(accuracy) if accuracy is not None else 1.0)
-        # DB2 exports typically use 0..100; normalize to 0..1
-        if acc > 1.0:
-            acc = acc / 100.0
-        # Apply accuracy modifiers.
+
+        acc_state = 0.0
+        dodge_state = 0.0
         if self.stats is not None and ctx is not None:
             try:
                 a_id = int(getattr(actor, "id", 0) or 0)
                 t_id = int(getattr(target, "id", 0) or 0)
-                acc += float(self.stats.sum_state(ctx, a_id, self._STATE_STAT_ACCURACY)) / 100.0
-                acc -= float(self.stats.sum_state(ctx, t_id, self._STATE_STAT_DODGE)) / 100.0
+                acc_state = float(self.stats.sum_state(ctx, a_id, self._STATE_STAT_ACCURACY))
+                dodge_state = float(self.stats.sum_state(ctx, t_id, self._STATE_STAT_DODGE))
             except Exception:
                 pass
 
-        # Apply weather hit chance additive.
+        wid = 0
+        actor_type = -1
         if self.weather is not None and ctx is not None:
             try:
                 wid = int(getattr(self.weather, "current", lambda _ctx: 0)(ctx))
-                we = get_weather_effect(wid)
-                if we is not None and float(we.hit_chance_add) != 0.0:
-                    # Elementals ignore negative weather effects.
-                    actor_type = int(getattr(actor, "pet_type", -1) or -1)
-                    if not (actor_type == 6 and float(we.hit_chance_add) < 0.0):
-                        acc += float(we.hit_chance_add)
+                actor_type = int(getattr(actor, "pet_type", -1) or -1)
             except Exception:
-                pass
+                wid = 0
+        return acc, acc_state, dodge_state, wid, actor_type
+
+    def compute(self, ctx: Any, actor: Any, target: Any, accuracy: Any, dont_miss: bool = False) -> Tuple[bool, str]:
+        if dont_miss:
+            return True, "DONT_MISS"
 
-        # Clamp
-        if acc < 0.0:
-            acc = 0.0
-        if acc > 1.0:
-            acc = 1.0
+        acc_raw, acc_state, dodge_state, wid, actor_type = self._inputs(ctx, actor, target, accuracy)
+        acc = _final_accuracy(acc_raw, acc_state, dodge_state, wid, actor_type)
 
         r = self.rng.rand_hit()  # always consume for determinism
         if acc <= 0.0:
@@ -66,4 +66,107 @@ class HitCheck:
         hit = (r <= acc)
         return hit, ("HIT" if hit else "MISS")
 
+    def compute_batch(
+        self,
+        ctx: Any,
+        actors: Sequence[Any],
+        targets: Sequence[Any],
+        accuracies: Sequence[Any],
+        dont_miss: Optional[Sequence[bool]] = None,
+    ) -> List[Tuple[bool, str]]:
+        """compute() for many checks against the same ctx state.
+
+        Hit rolls are drawn in check order and skipped for dont_miss checks, exactly like
+        repeated compute() calls (in one draws("hit", n) call when the RNG has it, e.g.
+        BlockRNG); the accuracy math runs through resolve_hits().
+        """
+        n = len(actors)
+        dm = list(dont_miss) if dont_miss is not None else [False] * n
+        cols: List[Tuple[float, float, float, int, int]] = [
+            self._inputs(ctx, actors[k], targets[k], accuracies[k]) for k in range(n) if not dm[k]
+        ]
+        draws = getattr(self.rng, "draws", None)
+        if draws is not None:
+            rolls = draws("hit", len(cols))
+        else:
+            rand_hit = self.rng.rand_hit
+            rolls = [rand_hit() for _ in cols]
+
+        hits = resolve_hits(
+            accuracy=[c[0] for c in cols],
+            accuracy_state=[c[1] for c in cols],
+            dodge_state=[c[2] for c in cols],
+            weather_id=[c[3] for c in cols],
+            actor_type=[c[4] for c in cols],
+            rolls=rolls,
+        )
+        out: List[Tuple[bool, str]] = []
+        it = iter(hits)
+        for k in range(n):
+            if dm[k]:
+                out.append((True, "DONT_MISS"))
+            else:
+                hit = bool(next(it))
+                out.append((hit, "HIT" if hit else "MISS"))
+        return out
+
+
+def _weather_hit_add(wid: int, actor_type: int) -> float:
+    we = get_weather_effect(wid)
+    if we is None or float(we.hit_chance_add) == 0.0:
+        return 0.0
+    # Elementals ignore negative weather effects.
+    if actor_type == 6 and float(we.hit_chance_add) < 0.0:
+        return 0.0
+    return float(we.hit_chance_add)
+
+
+def _final_accuracy(acc: float, acc_state: float, dodge_state: float, wid: int, actor_type: int) -> float:
+    # DB2 exports typically use 0..100; normalize to 0..1
+    if acc > 1.0:
+        acc = acc / 100.0
+    # Apply accuracy modifiers.
+    acc += acc_state / 100.0
+    acc -= dodge_state / 100.0
+    # Apply weather hit chance additive.
+    add = _weather_hit_add(wid, actor_type)
+    if add != 0.0:
+        acc += add
+    # Clamp
+    if acc < 0.0:
+        acc = 0.0
+    if acc > 1.0:
+        acc = 1.0
+    return acc
+
+
+def resolve_hits(
+    *,
+    accuracy: Sequence[float],
+    accuracy_state: Sequence[float],
+    dodge_state: Sequence[float],
+    weather_id: Sequence[int],
+    actor_type: Sequence[int],
+    rolls: Sequence[float],
+) -> Sequence[bool]:
+    """Vectorized hit resolution from pre-drawn hit rolls (one per check).
+
+    `accuracy` is the raw per-effect accuracy (0..1 or 0..100); state sums are the raw
+    Stat_Accuracy / Stat_Dodge totals. Same arithmetic order as HitCheck.compute.
+    """
+    if np is None:
+        out: List[bool] = []
+        for k in range(len(rolls)):
+            acc = _final_accuracy(float(accuracy[k]), float(accuracy_state[k]), float(dodge_state[k]), int(weather_id[k]), int(actor_type[k]))
+            out.append(acc > 0.0 and rolls[k] <= acc)
+        return out
 
+    acc = np.asarray(accuracy, dtype=np.float64)
+    acc = np.where(acc > 1.0, acc / 100.0, acc)
+    acc = acc + np.asarray(accuracy_state, dtype=np.float64) / 100.0
+    acc = acc - np.asarray(dodge_state, dtype=np.float64) / 100.0
+    add = np.fromiter((_weather_hit_add(int(w), int(t)) for w, t in zip(weather_id, actor_type)), dtype=np.float64, count=len(acc))
+    acc = np.where(add != 0.0, acc + add, acc)
+    acc = np.clip(acc, 0.0, 1.0)
+    r = np.asarray(rolls, dtype=np.float64)
+    return ((acc > 0.0) & (r <= acc)).tolist()
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+"""Rounds-to-kill distributions (static evaluator, no rollouts).
+
+For one ability, the actor is assumed to cast it every round it is usable; the damage of
+a round is the convolution of
+
+    the ability's cast turns (if usable that round)
+    + every DoT payload already ticking on the target (TURN_START / TURN_END)
+
+all taken from damage_distribution, so hit chance, variance, crits, type/weather, state
+modifiers and the Magic 35% per-hit cap are exact for the current state. Rounds are then
+folded over the target's HP to get P(target dies in round n), n = 1 (the next round) ..
+max_rounds.
+
+Modeled round-to-round effects:
+  - cooldowns (CooldownManager + cooldown_mods) and slot/ability lockouts, ticked at
+    TURN_START before the actions like the engine does: a remaining cooldown / lockout
+    of w rounds allows the first cast in round max(1, w), and a cooldown of C then
+    allows a cast every C rounds (the ability deals nothing in between);
+  - DoT durations (AuraInstance.remaining_duration / just_applied / tickdown_first_round);
+  - Undead: a pet already in its immortality round dies at the end of the current round
+    whatever happens; otherwise immortality does not move the kill round (the pet dies at
+    the end of the round its HP reached 0);
+  - Mechanical: the first death revives at 20% max HP (overkill of that round is lost).
+
+Not modeled: the target's own actions (heals, swaps, shields applied later), new auras
+applied by the ability itself, and state changes between rounds.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from engine.core.battle_loop import selected_abilities
+from engine.core.events import PERIODIC_EVENTS
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.damage_distribution import (
+    DEFAULT_VARIANCE_RANGE,
+    DamageDistribution,
+    ability_distribution,
+    turn_distribution,
+)
+from engine.resolver.racial_passives import PET_TYPE_MECHANICAL, PET_TYPE_UNDEAD
+
+DEFAULT_MAX_ROUNDS = 10
+
+
+@dataclass
+class KillTurn:
+    ability_id: int
+    slot_index: int = 0
+    # round number (1 = next round) -> P(target dies in that round)
+    rounds: Dict[int, float] = field(default_factory=dict)
+    # P(target still alive after max_rounds)
+    survive: float = 1.0
+    # rounds before the ability can be used (cooldown / lockout); 0 = usable next round
+    wait: int = 0
+    # damage of one cast (all cast turns) and of the next round (cast if usable + DoTs)
+    per_use: DamageDistribution = field(default_factory=DamageDistribution.point)
+    first_round: DamageDistribution = field(default_factory=DamageDistribution.point)
+    unmodeled: List[int] = field(default_factory=list)  # prop ids of rows not modeled
+
+    def prob_by(self, n: int) -> float:
+        """P(target dead by the end of round n)."""
+        return sum(p for r, p in self.rounds.items() if r <= n)
+
+    @property
+    def lethal_chance(self) -> float:
+        """P(target dies next round)."""
+        return self.rounds.get(1, 0.0)
+
+    @property
+    def lethal_threshold(self) -> int:
+        """Highest target HP that next round kills for certain (0 if a miss is possible)."""
+        return self.first_round.min
+
+    @property
+    def min_rounds(self) -> Optional[int]:
+        return min(self.rounds) if self.rounds else None
+
+    @property
+    def expected_rounds(self) -> Optional[float]:
+        """Mean kill round, conditioned on a kill within max_rounds."""
+        total = sum(self.rounds.values())
+        if total <= 0.0:
+            return None
+        return sum(r * p for r, p in self.rounds.items()) / total
+
+
+def _ability_wait(ctx: Any, actor_id: int, ability_id: int, slot_index: int) -> int:
+    # Remaining cooldown / lockout w ticks down at the next TURN_START, before the
+    # actions: the ability is usable in round max(1, w), i.e. after w - 1 idle rounds.
+    wait = 0
+    cds = getattr(ctx, "cooldowns", None)
+    if cds is not None:
+        wait = int(cds.get(actor_id, ability_id))
+    teams = getattr(ctx, "teams", None)
+    if teams is not None:
+        try:
+            if slot_index > 0:
+                wait = max(wait, int(teams.slot_locks.get(actor_id, {}).get(slot_index, 0)))
+            wait = max(wait, int(teams.ability_locks.get(actor_id, {}).get(ability_id, 0)))
+        except Exception:
+            pass
+    return max(0, wait - 1)
+
+
+def _ability_cooldown(ctx: Any, actor_id: int, ability_id: int, slot_index: int) -> int:
+    # Same rule as AbilityExecutor.use_ability_id (base cooldown + opcode 246 slot modifier).
+    scripts = getattr(ctx, "scripts", None)
+    cd = 0
+    if scripts is not None and hasattr(scripts, "get_ability_cooldown"):
+        cd = int(scripts.get_ability_cooldown(ability_id) or 0)
+    mods = getattr(ctx, "cooldown_mods", None)
+    if cd > 0 and slot_index > 0 and mods is not None:
+        try:
+            cd = max(0, cd + int(mods.get((actor_id, slot_index), 0)))
+        except Exception:
+            pass
+    return cd
+
+
+def _aura_ticks(aura: Any) -> Optional[int]:
+    """Rounds (from the next one) in which the aura still ticks; None = permanent."""
+    d = int(getattr(aura, "remaining_duration", 0))
+    if d == -1:
+        return None
+    if getattr(aura, "just_applied", False) and not getattr(aura, "tickdown_first_round", False):
+        d += 1  # the first TURN_END after apply does not decrement
+    return max(0, d)
+
+
+def dot_schedule(
+    ctx: Any,
+    target: Any,
+    *,
+    variance_range: Tuple[float, float] = DEFAULT_VARIANCE_RANGE,
+) -> List[Tuple[Optional[int], DamageDistribution]]:
+    """(ticks left or None, damage per tick) for every periodic payload ticking on the target."""
+    am = getattr(ctx, "aura", None)
+    if am is None:
+        return []
+    pets = getattr(ctx, "pets", None) or {}
+    tid = int(getattr(target, "id", 0) or 0)
+    out: List[Tuple[Optional[int], DamageDistribution]] = []
+    for event in PERIODIC_EVENTS:
+        if hasattr(am, "subscribers"):
+            payloads = am.subscribers(event, tid)
+        else:
+            payloads = [(a, AuraManager.event_rows(a, event)) for a in am.list_owner(tid).values()]
+        for aura, rows in payloads:
+            caster = pets.get(int(getattr(aura, "caster_pet_id", 0) or 0))
+            if not rows or caster is None:
+                continue
+            ticks = _aura_ticks(aura)
+            if ticks == 0:
+                continue
+            dist = turn_distribution(ctx, caster, target, rows, variance_range=variance_range).distribution
+            if dist.pmf != {0: 1.0}:
+                out.append((ticks, dist))
+    return out
+
+
+def _kill_rounds(
+    hp: int, revive_hp: int, round_dists: Sequence[DamageDistribution]
+) -> Tuple[Dict[int, float], float]:
+    # alive states: (revived, damage taken since last (re)spawn) -> probability
+    alive: Dict[Tuple[int, int], float] = {(0, 0): 1.0}
+    rounds: Dict[int, float] = {}
+    for r, dist in enumerate(round_dists, start=1):
+        if not alive:
+            break
+        nxt: Dict[Tuple[int, int], float] = {}
+        killed = 0.0
+        for (revived, taken), p in alive.items():
+            need = (revive_hp if revived else hp) - taken
+            for d, q in dist.pmf.items():
+                if d < need:
+                    key = (revived, taken + d)
+                elif not revived and revive_hp > 0:
+                    key = (1, 0)
+                else:
+                    killed += p * q
+                    continue
+                nxt[key] = nxt.get(key, 0.0) + p * q
+        if killed > 0.0:
+            rounds[r] = killed
+        alive = nxt
+    return rounds, sum(alive.values())
+
+
+def kill_turn(
+    ctx: Any,
+    actor: Any,
+    target: Any,
+    ability_id: int,
+    *,
+    slot_index: int = 0,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+    dots: Optional[List[Tuple[Optional[int], DamageDistribution]]] = None,
+    variance_range: Tuple[float, float] = DEFAULT_VARIANCE_RANGE,
+) -> KillTurn:
+    """Rounds-to-kill distribution of `target` when `actor` spams `ability_id`.
+
+    `dots` is dot_schedule(ctx, target); pass it in when evaluating several abilities
+    against the same target.
+    """
+    aid = int(ability_id)
+    actor_id = int(getattr(actor, "id", 0) or 0)
+    out = KillTurn(ability_id=aid, slot_index=int(slot_index))
+
+    per_use = DamageDistribution.point(0)
+    for turn in ability_distribution(ctx, actor, target, aid, variance_range=variance_range):
+        per_use = per_use.convolve(turn.distribution)
+        out.unmodeled.extend(turn.unmodeled)
+    out.per_use = per_use
+    out.wait = _ability_wait(ctx, actor_id, aid, int(slot_index))
+    cooldown = _ability_cooldown(ctx, actor_id, aid, int(slot_index))
+    if dots is None:
+        dots = dot_schedule(ctx, target, variance_range=variance_range)
+
+    # Per-round damage: cast when usable, plus the DoTs still ticking that round.
+    round_dists: List[DamageDistribution] = []
+    dot_cache: Dict[Tuple[int, ...], DamageDistribution] = {}
+    next_use = out.wait + 1
+    for r in range(1, int(max_rounds) + 1):
+        live = tuple(i for i, (ticks, _) in enumerate(dots) if ticks is None or ticks >= r)
+        dot_dist = dot_cache.get(live)
+        if dot_dist is None:
+            dot_dist = DamageDistribution.point(0)
+            for i in live:
+                dot_dist = dot_dist.convolve(dots[i][1])
+            dot_cache[live] = dot_dist
+        if r >= next_use:
+            round_dists.append(dot_dist.convolve(per_use))
+            next_use = r + max(1, cooldown)
+        else:
+            round_dists.append(dot_dist)
+    if round_dists:
+        out.first_round = round_dists[0]
+
+    racial = getattr(ctx, "racial", None)
+    state = getattr(racial, "state", None)
+    tid = int(getattr(target, "id", 0) or 0)
+    ttype = int(getattr(target, "pet_type", -1) or -1)
+    if ttype == PET_TYPE_UNDEAD and state is not None and state.undead_immortality.get(tid, False):
+        out.rounds, out.survive = {1: 1.0}, 0.0
+        return out
+
+    revive_hp = 0
+    if ttype == PET_TYPE_MECHANICAL and state is not None and not state.mechanical_revived.get(tid, False):
+        revive_hp = max(1, int(int(getattr(target, "max_hp", 0) or 0) * 0.2))
+    hp = int(getattr(target, "hp", 0) or 0)
+    if hp <= 0:
+        out.rounds, out.survive = {1: 1.0}, 0.0
+        return out
+    out.rounds, out.survive = _kill_rounds(hp, revive_hp, round_dists)
+    return out
+
+
+def kill_turns(
+    ctx: Any,
+    team_id: int,
+    *,
+    max_rounds: int = DEFAULT_MAX_ROUNDS,
+    variance_range: Tuple[float, float] = DEFAULT_VARIANCE_RANGE,
+) -> List[KillTurn]:
+    """KillTurn for each selected ability of team_id's active pet vs the opposing active pet."""
+    teams = ctx.teams
+    actor = ctx.pets.get(int(teams.active_pet_id(int(team_id))))
+    target = ctx.pets.get(int(teams.active_pet_id(1 - int(team_id))))
+    if actor is None or target is None:
+        return []
+    dots = dot_schedule(ctx, target, variance_range=variance_range)
+    return [
+        kill_turn(ctx, actor, target, ability_id, slot_index=slot, max_rounds=max_rounds,
+                  dots=dots, variance_range=variance_range)
+        for slot, ability_id in selected_abilities(actor)
+        if ability_id > 0
+    ]
@@ -15,8 +15,8 @@ Implements all 10 racial passives according to WoW pet battle rules:
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Set
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Set, Tuple
 
 # Pet type IDs
 PET_TYPE_HUMANOID = 0
@@ -73,6 +73,19 @@ class RacialPassiveManager:
         """Reset all racial passive state (for new battle)."""
         self.state = RacialPassiveState()
 
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """Compact copy of the per-pet passive state; restore() rewinds to it."""
+        return tuple(
+            tuple(v.items()) if isinstance(v, dict) else v
+            for v in (getattr(self.state, f.name) for f in fields(RacialPassiveState))
+        )
+
+    def restore(self, state: Tuple[Any, ...]) -> None:
+        self.state = RacialPassiveState(**{
+            f.name: (dict(v) if isinstance(v, tuple) else v)
+            for f, v in zip(fields(RacialPassiveState), state)
+        })
+
     def _pet_type(self, pet: Any) -> int:
         """Get pet type from pet object."""
         try:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 @dataclass
 class StateChange:
@@ -13,6 +13,17 @@ class StateManager:
     def __init__(self):
         # pet_id -> state_id -> value
         self._m: Dict[int, Dict[int, int]] = {}
+        # pet_id -> state ids written since the last pop_changes() (None: not tracking)
+        self._changed: Optional[Dict[int, Dict[int, None]]] = None
+
+    def track_changes(self, enabled: bool = True) -> None:
+        self._changed = {} if enabled else None
+
+    def pop_changes(self, pet_id: int) -> List[int]:
+        """State ids set or cleared on pet_id since the last call (needs track_changes())."""
+        if not self._changed:
+            return []
+        return list(self._changed.pop(int(pet_id), ()))
 
     def get(self, pet_id: int, state_id: int, default: int = 0) -> int:
         return int(self._m.get(int(pet_id), {}).get(int(state_id), default))
@@ -20,10 +31,23 @@ class StateManager:
     def set(self, pet_id: int, state_id: int, value: int) -> StateChange:
         pid = int(pet_id); sid = int(state_id); v = int(value)
         self._m.setdefault(pid, {})[sid] = v
+        if self._changed is not None:
+            self._changed.setdefault(pid, {})[sid] = None
         return StateChange(pet_id=pid, state_id=sid, value=v)
 
     def clear_pet(self, pet_id: int) -> None:
-        self._m.pop(int(pet_id), None)
+        old = self._m.pop(int(pet_id), None)
+        if old and self._changed is not None:
+            self._changed.setdefault(int(pet_id), {}).update(dict.fromkeys(old))
 
     def snapshot_pet(self, pet_id: int) -> Dict[int, int]:
         return dict(self._m.get(int(pet_id), {}))
+
+    def checkpoint(self) -> Tuple[Tuple[int, Tuple[Tuple[int, int], ...]], ...]:
+        """Compact copy of every pet's states; restore() rewinds to it."""
+        return tuple((pid, tuple(m.items())) for pid, m in self._m.items())
+
+    def restore(self, state: Tuple[Tuple[int, Tuple[Tuple[int, int], ...]], ...]) -> None:
+        self._m = {int(pid): dict(items) for pid, items in state}
+        if self._changed is not None:
+            self._changed = {}
@@ -11,10 +11,16 @@ We keep the interface intentionally small:
   - `set_from_aura(...)` to update current weather
   - `detect_from_ctx(...)` fallback scanner
   - `clear_if_gone(...)` used from TickEngine when auras expire
+
+Once bound to an AuraManager (`bind(...)`, done lazily by the first `current(ctx)`),
+the manager is event-driven: AuraManager reports stored/removed auras and `current()`
+is a field read instead of a scan over every owner's auras. Handlers attach aura meta
+after apply(), so stored auras are queued (one entry per live aura, dropped again on
+removal) and their `Weather_*` binds read on the next `current()`/`clear_if_gone()`.
 """
 
 from dataclasses import dataclass
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from engine.constants.weather import WEATHER_STATE_IDS
 
@@ -37,6 +43,10 @@ def _extract_weather_state_id(aura_meta: Any) -> Optional[int]:
     return None
 
 
+def _aura_key(aura: Any) -> Tuple[int, int]:
+    return (int(getattr(aura, "owner_pet_id", 0) or 0), int(getattr(aura, "aura_id", 0) or 0))
+
+
 @dataclass
 class WeatherSnapshot:
     state_id: int
@@ -49,13 +59,118 @@ class WeatherManager:
         self._state_id: int = 0
         self._aura_id: int = 0
 
+        # Event-driven tracking (set by bind()).
+        self._aura_mgr: Any = None
+        # (owner_pet_id, aura_id) -> weather state id, for every stored aura seen with a Weather_* bind
+        self._live: Dict[Tuple[int, int], int] = {}
+        # (owner_pet_id, aura_id) -> aura stored since the last read (meta may have been
+        # attached after apply()); bounded by the live auras since removals drop entries.
+        self._pending: Dict[Tuple[int, int], Any] = {}
+
     def clear(self) -> None:
         self._state_id = 0
         self._aura_id = 0
 
+    def bind(self, aura_mgr: Any) -> bool:
+        """Subscribe to AuraManager apply/expire hooks. Returns False if unsupported."""
+        add_listener = getattr(aura_mgr, "add_listener", None)
+        if add_listener is None:
+            return False
+        if self._aura_mgr is aura_mgr:
+            return True
+        add_listener(self)
+        self._aura_mgr = aura_mgr
+        self._live = {}
+        self._pending = {}
+        # Seed from auras applied before binding.
+        for mp in getattr(aura_mgr, "_auras", {}).values():
+            for aura in (mp or {}).values():
+                self._track(aura)
+        self._drop_if_gone()
+        return True
+
     def on_aura_applied(self, aura: Any) -> None:
         """Hook for aura handlers; keeps weather cache up-to-date."""
         self.set_from_aura(aura)
+        if self._aura_mgr is not None and aura is not None:
+            self._track(aura)
+
+    def on_aura_stored(self, aura: Any) -> None:
+        """AuraManager hook: an aura was applied/refreshed (meta may still be pending)."""
+        self._pending[_aura_key(aura)] = aura
+
+    def on_aura_removed(self, aura: Any) -> None:
+        """AuraManager hook: an aura was removed or expired."""
+        key = _aura_key(aura)
+        if self._pending.get(key) is aura:
+            del self._pending[key]
+        if self._live.pop(key, None) is not None:
+            self._drop_if_gone()
+
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """(state id, aura id, bound, live binds, pending aura keys); restore() rewinds to it."""
+        pending = []
+        if self._aura_mgr is not None:
+            for key, aura in self._pending.items():
+                if self._aura_mgr.get(*key) is aura:
+                    pending.append(key)
+        return (self._state_id, self._aura_id, self._aura_mgr is not None, tuple(self._live.items()), tuple(pending))
+
+    def restore(self, state: Tuple[Any, ...], aura_mgr: Any = None) -> None:
+        """Rewind to a checkpoint(); a bound checkpoint re-binds to `aura_mgr` (restored first)."""
+        self._state_id, self._aura_id = int(state[0]), int(state[1])
+        self._live = {}
+        self._pending = {}
+        if not state[2] or aura_mgr is None:
+            return
+        if self._aura_mgr is not aura_mgr:
+            aura_mgr.add_listener(self)
+            self._aura_mgr = aura_mgr
+        self._live = dict(state[3])
+        for key in state[4]:
+            aura = aura_mgr.get(*key)
+            if aura is not None:
+                self._pending[tuple(key)] = aura
+
+    def _track(self, aura: Any) -> None:
+        sid = _extract_weather_state_id(getattr(aura, "meta", {}) or {})
+        if sid:
+            self._live[_aura_key(aura)] = int(sid)
+
+    def _resolve_pending(self) -> None:
+        pending = self._pending
+        self._pending = {}
+        for key, aura in pending.items():
+            if self._aura_mgr.get(*key) is aura:
+                self._track(aura)
+
+    def _drop_if_gone(self) -> None:
+        if not self._aura_id:
+            return
+        aid = int(self._aura_id)
+        for _, live_aura_id in self._live:
+            if live_aura_id == aid:
+                return
+        self._state_id = 0
+        self._aura_id = 0
+
+    def _detect_live(self) -> int:
+        # Rare path (weather cleared while another weather aura is live). Walk the owner maps
+        # so ties on remaining duration resolve in the same order as the full scan.
+        best: Optional[WeatherSnapshot] = None
+        for owner_id, mp in getattr(self._aura_mgr, "_auras", {}).items():
+            for aura_id, aura in (mp or {}).items():
+                sid = self._live.get((owner_id, aura_id))
+                if not sid:
+                    continue
+                rem = int(getattr(aura, "remaining_duration", 0) or 0)
+                if best is None or rem > best.remaining:
+                    best = WeatherSnapshot(state_id=int(sid), aura_id=int(aura_id), remaining=rem)
+        if best is None:
+            return 0
+        self._state_id = int(best.state_id)
+        self._aura_id = int(best.aura_id)
+        return int(self._state_id)
 
     @property
     def active_state_id(self) -> int:
@@ -80,6 +195,11 @@ class WeatherManager:
         if self._state_id:
             return int(self._state_id)
 
+        if self._aura_mgr is not None:
+            if self._pending:
+                self._resolve_pending()
+            return self._detect_live()
+
         aura_mgr = getattr(ctx, "aura", None)
         if aura_mgr is None:
             return 0
@@ -105,6 +225,11 @@ class WeatherManager:
 
     def clear_if_gone(self, ctx: Any) -> None:
         """Clear cache if the cached aura no longer exists."""
+        if self._aura_mgr is not None:
+            # Removals are already pushed by AuraManager; just drain queued applies.
+            if self._pending:
+                self._resolve_pending()
+            return
         if not self._state_id or not self._aura_id:
             return
         aura_mgr = getattr(ctx, "aura", None)
@@ -122,6 +247,14 @@ class WeatherManager:
 
     def current(self, ctx: Any) -> int:
         """Return current weather state id (0 if none)."""
+        if self._aura_mgr is not None or self.bind(getattr(ctx, "aura", None)):
+            if self._pending:
+                self._resolve_pending()
+            if not self._state_id and self._live:
+                self._detect_live()
+            return int(self._state_id)
+
+        # Unbound fallback (aura manager without listener hooks): scan.
         sid = int(self._state_id) if self._state_id else int(self.detect_from_ctx(ctx))
         if sid:
             self.clear_if_gone(ctx)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Convert battle event logs between JSONL (.jsonl[.gz|.xz]) and binary (.wpev)."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from engine.core.event_binary import BINARY_SUFFIX, binary_to_jsonl, is_binary_event_file, jsonl_to_binary
+
+
+def convert(src: Path, dst: Path) -> int:
+    if is_binary_event_file(src):
+        return binary_to_jsonl(src, dst)
+    return jsonl_to_binary(src, dst)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert event logs between JSONL and binary .wpev")
+    parser.add_argument("--input", type=str, required=True, help="Event file or directory")
+    parser.add_argument("--output", type=str, required=True, help="Output file or directory")
+    parser.add_argument("--to", choices=["binary", "jsonl"], default="binary",
+                        help="Target format when converting a directory")
+    args = parser.parse_args()
+
+    src = Path(args.input)
+    dst = Path(args.output)
+    if not src.is_dir():
+        n = convert(src, dst)
+        print(f"{src} -> {dst}: {n} records")
+        return
+
+    pattern = "*.jsonl*" if args.to == "binary" else f"*{BINARY_SUFFIX}"
+    total = 0
+    for p in sorted(src.rglob(pattern)):
+        stem = p.name.split(".")[0]
+        out = dst / p.parent.relative_to(src) / (stem + (BINARY_SUFFIX if args.to == "binary" else ".jsonl"))
+        out.parent.mkdir(parents=True, exist_ok=True)
+        total += convert(p, out)
+    print(f"Converted {total} records into: {dst}")
+
+
+if __name__ == "__main__":
+    main()
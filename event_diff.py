@@ -1,25 +1,28 @@
 #!/usr/bin/env python3
-"""Analyze JSONL event logs and emit a bug list (event diff)."""
+"""Analyze JSONL event logs and emit a bug list (event diff).
+
+Files are streamed one battle at a time (a battle starts at BATTLE_START or when the
+record's "battle" key changes, as in shard files). Within a battle, DAMAGE_APPLIED and
+ABILITY_EFFECTS are joined through dicts keyed by (battle, round, actor, target,
+ability); ABILITY_EFFECTS snapshots are rebuilt from keyframes + diffs. Directories are
+analyzed in parallel (one file per task) and issues are printed as files complete.
+"""
 from __future__ import annotations
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from engine.core.event_log import iter_event_records
+from engine.core.snapshots import SnapshotReconstructor
 
-def _load_events(path: Path) -> List[Dict[str, Any]]:
-    events = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                events.append(json.loads(line))
-            except Exception:
-                events.append({"event": "__PARSE_ERROR__", "raw": line})
-    return events
+
+EVENT_GLOBS = ("*.jsonl", "*.jsonl.gz", "*.jsonl.xz", "*.wpev")
+
+JoinKey = Tuple[Any, Any, Any, Any, Any]
 
 
 def _hp_delta_from_diff(diff: Dict[str, Any]) -> Optional[int]:
@@ -29,26 +32,51 @@ def _hp_delta_from_diff(diff: Dict[str, Any]) -> Optional[int]:
     return hp.get("delta")
 
 
-def analyze_events(path: Path) -> List[Dict[str, Any]]:
-    issues: List[Dict[str, Any]] = []
-    events = _load_events(path)
-    current_cast: Optional[Dict[str, Any]] = None
+def _join_key(battle: Any, payload: Dict[str, Any]) -> JoinKey:
+    return (battle, payload.get("round_no"), payload.get("actor_id"),
+            payload.get("target_id"), payload.get("ability_id"))
 
-    for rec in events:
+
+def iter_battles(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+    """Yield (battle key, records) per battle; the key is the records' "battle" or an index."""
+    battle: List[Dict[str, Any]] = []
+    key: Any = None
+    index = 0
+    for rec in records:
+        rec_key = rec.get("battle", key)
+        if battle and (rec.get("event") == "BATTLE_START" or rec_key != key):
+            yield (key if key is not None else index), battle
+            battle = []
+            index += 1
+        key = rec_key
+        battle.append(rec)
+    if battle:
+        yield (key if key is not None else index), battle
+
+
+def analyze_battle(battle: Any, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    issues: List[Dict[str, Any]] = []
+    snapshots = SnapshotReconstructor()
+    # join table: key -> DAMAGE_APPLIED records not yet matched by an ABILITY_EFFECTS
+    damage: Dict[JoinKey, List[Tuple[Any, Dict[str, Any]]]] = {}
+    has_effects = False
+
+    def issue(kind: str, seq: Any, payload: Dict[str, Any], details: Dict[str, Any]) -> None:
+        issues.append({
+            "type": kind,
+            "seq": seq,
+            "battle": battle,
+            "round_no": payload.get("round_no"),
+            "ability_id": payload.get("ability_id"),
+            "details": details,
+        })
+
+    for rec in records:
         ev = rec.get("event")
-        payload = rec.get("payload") or {}
+        payload = snapshots.feed(rec) or {}
         seq = rec.get("seq")
 
-        if ev == "ABILITY_CAST_START":
-            current_cast = {
-                "ability_id": payload.get("ability_id"),
-                "actor_id": payload.get("actor_id"),
-                "target_id": payload.get("target_id"),
-                "seq": seq,
-                "damage": None,
-            }
-
-        elif ev == "DAMAGE_APPLIED":
+        if ev == "DAMAGE_APPLIED":
             # direct consistency check
             hp_before = payload.get("target_hp_before")
             hp_after = payload.get("target_hp_after")
@@ -56,69 +84,69 @@ def analyze_events(path: Path) -> List[Dict[str, Any]]:
             if isinstance(hp_before, int) and isinstance(hp_after, int) and isinstance(dmg, int):
                 expected_after = max(hp_before - dmg, 0)
                 if expected_after != hp_after:
-                    issues.append({
-                        "type": "damage_hp_mismatch",
-                        "seq": seq,
-                        "ability_id": payload.get("ability_id"),
-                        "details": {"hp_before": hp_before, "damage": dmg, "hp_after": hp_after},
-                    })
-            if current_cast is not None:
-                current_cast["damage"] = dmg
-                current_cast["hp_before"] = hp_before
+                    issue("damage_hp_mismatch", seq, payload,
+                          {"hp_before": hp_before, "damage": dmg, "hp_after": hp_after})
+            damage.setdefault(_join_key(battle, payload), []).append((seq, payload))
 
         elif ev == "ABILITY_EFFECTS":
-            target_diff = payload.get("target_diff") or {}
-            delta = _hp_delta_from_diff(target_diff)
-            target_after = (payload.get("target_after") or {})
+            has_effects = True
+            delta = _hp_delta_from_diff(payload.get("target_diff") or {})
+            target_before = payload.get("target_before") or {}
+            target_after = payload.get("target_after") or {}
             max_hp = target_after.get("max_hp")
             hp = target_after.get("hp")
 
             if isinstance(hp, int) and isinstance(max_hp, int):
                 if hp < 0 or hp > max_hp:
-                    issues.append({
-                        "type": "hp_out_of_range",
-                        "seq": seq,
-                        "ability_id": payload.get("ability_id"),
-                        "details": {"hp": hp, "max_hp": max_hp},
-                    })
-
-            if current_cast is not None:
-                dmg = current_cast.get("damage")
-                hp_before = current_cast.get("hp_before")
+                    issue("hp_out_of_range", seq, payload, {"hp": hp, "max_hp": max_hp})
+
+            pending = damage.get(_join_key(battle, payload))
+            if pending:
+                _, dmg_payload = pending.pop(0)
+                dmg = dmg_payload.get("actual_damage")
+                hp_before = dmg_payload.get("target_hp_before")
+                snap_hp = target_before.get("hp")
+                if isinstance(snap_hp, int) and isinstance(hp_before, int) and snap_hp != hp_before:
+                    issue("hp_before_mismatch", seq, payload, {"snapshot_hp": snap_hp, "hp_before": hp_before})
                 if isinstance(delta, int) and isinstance(dmg, int) and isinstance(hp_before, int):
                     expected_delta = -min(dmg, hp_before)
                     if delta != expected_delta:
-                        issues.append({
-                            "type": "diff_damage_mismatch",
-                            "seq": seq,
-                            "ability_id": payload.get("ability_id"),
-                            "details": {"diff_delta": delta, "damage": dmg, "hp_before": hp_before},
-                        })
-                elif isinstance(delta, int) and dmg is None and delta != 0:
-                    issues.append({
-                        "type": "diff_without_damage",
-                        "seq": seq,
-                        "ability_id": payload.get("ability_id"),
-                        "details": {"diff_delta": delta},
-                    })
-
-        elif ev == "ABILITY_CAST_END":
-            current_cast = None
+                        issue("diff_damage_mismatch", seq, payload,
+                              {"diff_delta": delta, "damage": dmg, "hp_before": hp_before})
+            elif isinstance(delta, int) and delta != 0:
+                issue("diff_without_damage", seq, payload, {"diff_delta": delta})
 
         elif ev == "__PARSE_ERROR__":
-            issues.append({
-                "type": "parse_error",
-                "seq": seq,
-                "details": {"raw": rec.get("raw")},
-            })
+            issue("parse_error", seq, {}, {"raw": rec.get("raw")})
 
+    # Unmatched damage only counts when the battle logged ABILITY_EFFECTS at all.
+    if has_effects:
+        for rows in damage.values():
+            for seq, payload in rows:
+                issue("damage_without_effects", seq, payload, {"damage": payload.get("actual_damage")})
     return issues
 
 
+def iter_issues(path: Path) -> Iterator[Dict[str, Any]]:
+    """Issues of one event file, battle by battle (one battle in memory at a time)."""
+    for battle, records in iter_battles(iter_event_records(path)):
+        yield from analyze_battle(battle, records)
+
+
+def analyze_events(path: Path) -> List[Dict[str, Any]]:
+    return list(iter_issues(path))
+
+
+def _analyze_file(path: Path) -> Tuple[Path, List[Dict[str, Any]]]:
+    return path, analyze_events(path)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Event diff checker for battle JSONL logs")
-    parser.add_argument("--input", type=str, required=True, help="JSONL file or directory")
+    parser.add_argument("--input", type=str, required=True, help="Event file (.jsonl / .jsonl.gz / .jsonl.xz / .wpev) or directory")
     parser.add_argument("--output", type=str, default="logs/reports/event_diff_report.json", help="Output report")
+    parser.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = CPU count, 1 = in-process)")
+    parser.add_argument("--quiet", action="store_true", help="Do not print issues as they are found")
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -126,21 +154,31 @@ def main() -> None:
 
     paths: List[Path] = []
     if input_path.is_dir():
-        paths = sorted(input_path.rglob("*.jsonl"))
+        paths = sorted(p for pattern in EVENT_GLOBS for p in input_path.rglob(pattern))
     else:
         paths = [input_path]
 
-    for p in paths:
-        issues = analyze_events(p)
-        outputs["files"].append({"path": str(p), "issue_count": len(issues)})
-        for issue in issues:
-            issue["file"] = str(p)
-            outputs["issues"].append(issue)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    jobs = max(1, min(jobs, len(paths)))
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        # results come back in input order, each file as soon as it (and those before it) finish
+        results = pool.map(_analyze_file, paths, chunksize=8) if pool else map(_analyze_file, paths)
+        for p, issues in results:
+            outputs["files"].append({"path": str(p), "issue_count": len(issues)})
+            for issue in issues:
+                issue["file"] = str(p)
+                outputs["issues"].append(issue)
+                if not args.quiet:
+                    print(json.dumps(issue, ensure_ascii=False), flush=True)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(json.dumps(outputs, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Report written to: {out_path}")
+    print(f"Report written to: {out_path} ({len(outputs['issues'])} issues in {len(paths)} files)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Load battle event logs into a local SQLite database and run prebuilt queries.
+
+    python event_warehouse.py ingest --input logs/events --db logs/events.sqlite
+    python event_warehouse.py query damage_per_ability --db logs/events.sqlite
+
+Ingestion is incremental: a file whose size and mtime are unchanged is skipped. In a
+changed file, battles whose records hash to the stored digest are kept, changed ones
+are reloaded and battles no longer in the file are deleted, so both appended logs and
+rewritten --events-shard files stay current. A battle is identified by (source file,
+battle key), the key being the records' "battle" or the battle's index in the file.
+Rows are bulk-inserted with executemany, one transaction per file, in WAL mode.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from engine.core.event_log import iter_event_records
+from event_diff import EVENT_GLOBS, iter_battles
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    battles INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS battles (
+    battle_id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    battle_key TEXT NOT NULL,
+    seed INTEGER,
+    level INTEGER,
+    rarity_id INTEGER,
+    team0_pet_ids TEXT,
+    team1_pet_ids TEXT,
+    winner INTEGER,
+    reason TEXT,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    digest TEXT,
+    UNIQUE (source, battle_key)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    battle_id INTEGER NOT NULL,
+    round_no INTEGER NOT NULL,
+    weather INTEGER,
+    weather_duration INTEGER,
+    pet0_id INTEGER,
+    pet1_id INTEGER,
+    pet0_speed INTEGER,
+    pet1_speed INTEGER,
+    team0_active_id INTEGER,
+    team1_active_id INTEGER,
+    PRIMARY KEY (battle_id, round_no)
+);
+CREATE TABLE IF NOT EXISTS events (
+    battle_id INTEGER NOT NULL,
+    seq INTEGER,
+    event TEXT NOT NULL,
+    round_no INTEGER,
+    pet_id INTEGER,
+    target_id INTEGER,
+    ability_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS casts (
+    battle_id INTEGER NOT NULL,
+    seq INTEGER,
+    round_no INTEGER,
+    actor_id INTEGER,
+    target_id INTEGER,
+    ability_id INTEGER,
+    ability_name TEXT,
+    hit INTEGER NOT NULL,
+    damage INTEGER
+);
+CREATE TABLE IF NOT EXISTS damage (
+    battle_id INTEGER NOT NULL,
+    seq INTEGER,
+    round_no INTEGER,
+    actor_id INTEGER,
+    target_id INTEGER,
+    ability_id INTEGER,
+    base_points INTEGER,
+    base_damage INTEGER,
+    variance REAL,
+    type_mult REAL,
+    type_reason TEXT,
+    is_crit INTEGER,
+    actual_damage INTEGER,
+    target_hp_before INTEGER,
+    target_hp_after INTEGER
+);
+CREATE TABLE IF NOT EXISTS aura_ops (
+    battle_id INTEGER NOT NULL,
+    seq INTEGER,
+    round_no INTEGER,
+    owner_id INTEGER,
+    aura_id INTEGER,
+    op TEXT NOT NULL,
+    remaining_duration INTEGER,
+    stacks INTEGER,
+    caster_pet_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS events_event ON events (event);
+CREATE INDEX IF NOT EXISTS events_pet ON events (pet_id);
+CREATE INDEX IF NOT EXISTS events_ability ON events (ability_id);
+CREATE INDEX IF NOT EXISTS casts_ability ON casts (ability_id);
+CREATE INDEX IF NOT EXISTS casts_actor ON casts (actor_id);
+CREATE INDEX IF NOT EXISTS damage_ability ON damage (ability_id);
+CREATE INDEX IF NOT EXISTS damage_actor ON damage (actor_id);
+CREATE INDEX IF NOT EXISTS damage_target ON damage (target_id);
+CREATE INDEX IF NOT EXISTS aura_ops_aura ON aura_ops (aura_id);
+CREATE INDEX IF NOT EXISTS aura_ops_owner ON aura_ops (owner_id);
+"""
+
+_INSERT = {
+    "rounds": "INSERT OR REPLACE INTO rounds VALUES (?,?,?,?,?,?,?,?,?,?)",
+    "events": "INSERT INTO events VALUES (?,?,?,?,?,?,?)",
+    "casts": "INSERT INTO casts VALUES (?,?,?,?,?,?,?,?,?)",
+    "damage": "INSERT INTO damage VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+    "aura_ops": "INSERT INTO aura_ops VALUES (?,?,?,?,?,?,?,?,?)",
+}
+
+# Prebuilt queries (query --name). A miss is a cast that dealt no damage (no
+# DAMAGE_APPLIED or 0 damage); aura uptime is the share of the battle's rounds from
+# apply to removal (or battle end), over battles where the aura appeared.
+QUERIES: Dict[str, str] = {
+    "damage_per_ability": """
+        SELECT ability_id, COUNT(*) AS hits, SUM(actual_damage) AS total_damage,
+               ROUND(AVG(actual_damage), 1) AS avg_damage, MAX(actual_damage) AS max_damage,
+               ROUND(AVG(is_crit), 4) AS crit_rate
+        FROM damage GROUP BY ability_id ORDER BY total_damage DESC""",
+    "miss_rates": """
+        SELECT ability_id, COUNT(*) AS casts, SUM(hit = 0 OR damage = 0) AS misses,
+               ROUND(1.0 * SUM(hit = 0 OR damage = 0) / COUNT(*), 4) AS miss_rate
+        FROM casts GROUP BY ability_id ORDER BY miss_rate DESC, casts DESC""",
+    "aura_uptime": """
+        WITH applied AS (
+            SELECT a.battle_id, a.owner_id, a.aura_id, a.round_no AS start_round,
+                   (SELECT MIN(r.round_no) FROM aura_ops r
+                    WHERE r.battle_id = a.battle_id AND r.owner_id = a.owner_id
+                      AND r.aura_id = a.aura_id AND r.op = 'remove' AND r.seq > a.seq) AS end_round
+            FROM aura_ops a WHERE a.op = 'apply'
+        ), spans AS (
+            SELECT p.aura_id, p.battle_id,
+                   COALESCE(p.end_round, b.rounds) - p.start_round + 1 AS rounds_up
+            FROM applied p JOIN battles b USING (battle_id)
+        )
+        SELECT s.aura_id, COUNT(DISTINCT s.battle_id) AS battles, SUM(s.rounds_up) AS rounds_up,
+               ROUND(1.0 * SUM(s.rounds_up) / (SELECT SUM(b.rounds) FROM battles b WHERE b.battle_id IN
+                   (SELECT battle_id FROM spans t WHERE t.aura_id = s.aura_id)), 4) AS uptime
+        FROM spans s GROUP BY s.aura_id ORDER BY uptime DESC""",
+    "events_by_type": """
+        SELECT event, COUNT(*) AS n FROM events GROUP BY event ORDER BY n DESC""",
+    "win_rates": """
+        SELECT team0_pet_ids, team1_pet_ids, COUNT(*) AS battles,
+               ROUND(AVG(winner = 0), 4) AS team0_win_rate, ROUND(AVG(rounds), 2) AS avg_rounds
+        FROM battles GROUP BY team0_pet_ids, team1_pet_ids ORDER BY battles DESC""",
+}
+
+
+def connect(db_path: Any) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(battles)")}
+    if "digest" not in cols:  # databases from before per-battle digests: reloaded once
+        conn.execute("ALTER TABLE battles ADD COLUMN digest TEXT")
+    return conn
+
+
+def _digest(records: Iterable[Dict[str, Any]]) -> str:
+    h = hashlib.sha1()
+    for rec in records:
+        h.update(json.dumps(rec, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _delete_battle(conn: sqlite3.Connection, battle_id: int) -> None:
+    for table in _INSERT:
+        conn.execute(f"DELETE FROM {table} WHERE battle_id = ?", (battle_id,))
+    conn.execute("DELETE FROM battles WHERE battle_id = ?", (battle_id,))
+
+
+def _aura_rows(battle_id: int, seq: Any, round_no: Any, owner: Any, diff: Dict[str, Any]) -> List[Tuple]:
+    rows = []
+    for key, op in (("auras_added", "apply"), ("auras_changed", "change"), ("auras_removed", "remove")):
+        for aid, aura in (diff.get(key) or {}).items():
+            if op == "change":
+                aura = aura.get("after") or {}
+            rows.append((battle_id, seq, round_no, owner, int(aid), op, aura.get("remaining_duration"),
+                         aura.get("stacks"), aura.get("caster_pet_id")))
+    return rows
+
+
+def _battle_rows(battle_id: int, records: Iterable[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, List[Tuple]]]:
+    """(battles row fields, table -> rows) for one battle's records."""
+    info: Dict[str, Any] = {"rounds": 0}
+    rows: Dict[str, List[Tuple]] = {name: [] for name in _INSERT}
+    rounds: Dict[int, List[Any]] = {}
+    cast: Optional[List[Any]] = None
+    round_no: Any = None
+
+    for rec in records:
+        ev = rec.get("event")
+        p = rec.get("payload") or {}
+        seq = rec.get("seq")
+        round_no = p.get("round_no", round_no)
+        pet_id = p.get("actor_id", p.get("pet_id"))
+        rows["events"].append((battle_id, seq, ev, round_no, pet_id, p.get("target_id"), p.get("ability_id")))
+
+        if ev == "BATTLE_START":
+            info.update(seed=p.get("seed"), level=p.get("level"), rarity_id=p.get("rarity_id"),
+                        team0_pet_ids=json.dumps(p.get("team0_pet_ids")),
+                        team1_pet_ids=json.dumps(p.get("team1_pet_ids")))
+        elif ev == "ROUND_START":
+            info["rounds"] = max(info["rounds"], int(round_no or 0))
+            rounds[round_no] = [battle_id, round_no, p.get("weather"), p.get("weather_duration")] + [None] * 6
+        elif ev == "TURN_ORDER" and round_no in rounds:
+            rounds[round_no][4:8] = [p.get("pet0_id"), p.get("pet1_id"), p.get("pet0_speed"), p.get("pet1_speed")]
+        elif ev == "ROUND_END" and round_no in rounds:
+            rounds[round_no][8:10] = [p.get("team0_active_id"), p.get("team1_active_id")]
+        elif ev == "ABILITY_CAST_START":
+            cast = [battle_id, seq, round_no, p.get("actor_id"), p.get("target_id"), p.get("ability_id"),
+                    p.get("ability_name"), 0, None]
+        elif ev == "DAMAGE_APPLIED":
+            rows["damage"].append((
+                battle_id, seq, round_no, p.get("actor_id"), p.get("target_id"), p.get("ability_id"),
+                p.get("base_points"), p.get("base_damage"), p.get("variance"), p.get("type_mult"),
+                p.get("type_reason"), p.get("is_crit"), p.get("actual_damage"),
+                p.get("target_hp_before"), p.get("target_hp_after"),
+            ))
+            if cast is not None:
+                cast[7] = 1
+                cast[8] = (cast[8] or 0) + int(p.get("actual_damage") or 0)
+        elif ev == "ABILITY_EFFECTS":
+            for role in ("actor", "target"):
+                owner = p.get(f"{role}_id")
+                for part in ("sync", "diff"):
+                    rows["aura_ops"].extend(_aura_rows(battle_id, seq, round_no, owner, p.get(f"{role}_{part}") or {}))
+        elif ev == "ABILITY_CAST_END" and cast is not None:
+            rows["casts"].append(tuple(cast))
+            cast = None
+        elif ev == "BATTLE_END":
+            info.update(winner=p.get("winner"), reason=p.get("reason"))
+
+    rows["rounds"] = [tuple(r) for r in rounds.values()]
+    return info, rows
+
+
+def ingest_file(conn: sqlite3.Connection, path: Path) -> int:
+    """Sync the battles of `path` into the database; returns how many were (re)loaded."""
+    st = path.stat()
+    source = str(path)
+    known = conn.execute("SELECT size, mtime_ns FROM files WHERE path = ?", (source,)).fetchone()
+    if known == (st.st_size, st.st_mtime_ns):
+        return 0
+    loaded = {key: (battle_id, digest) for battle_id, key, digest in
+              conn.execute("SELECT battle_id, battle_key, digest FROM battles WHERE source = ?", (source,))}
+
+    added = 0
+    seen = set()
+    with conn:
+        for key, records in iter_battles(iter_event_records(path)):
+            key = str(key)
+            seen.add(key)
+            digest = _digest(records)
+            if key in loaded:
+                battle_id, old = loaded[key]
+                if old == digest:
+                    continue
+                _delete_battle(conn, battle_id)  # rewritten since it was loaded
+            cur = conn.execute("INSERT INTO battles (source, battle_key, digest) VALUES (?, ?, ?)",
+                               (source, key, digest))
+            battle_id = cur.lastrowid
+            info, rows = _battle_rows(battle_id, records)
+            cols = sorted(info)
+            conn.execute(f"UPDATE battles SET {', '.join(c + ' = ?' for c in cols)} WHERE battle_id = ?",
+                         [info[c] for c in cols] + [battle_id])
+            for table, table_rows in rows.items():
+                if table_rows:
+                    conn.executemany(_INSERT[table], table_rows)
+            added += 1
+        for key, (battle_id, _) in loaded.items():
+            if key not in seen:
+                _delete_battle(conn, battle_id)
+        conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                     (source, st.st_size, st.st_mtime_ns, len(seen)))
+    return added
+
+
+def ingest(conn: sqlite3.Connection, input_path: Path) -> Tuple[int, int]:
+    """(files scanned, battles added) for an event file or a directory of them."""
+    if input_path.is_dir():
+        paths = sorted(p for pattern in EVENT_GLOBS for p in input_path.rglob(pattern))
+    else:
+        paths = [input_path]
+    added = 0
+    for p in paths:
+        added += ingest_file(conn, p)
+    return len(paths), added
+
+
+def run_query(conn: sqlite3.Connection, name_or_sql: str, limit: Optional[int] = None) -> Tuple[List[str], List[Tuple]]:
+    """(column names, rows) of a prebuilt query (QUERIES) or raw SQL."""
+    sql = QUERIES.get(name_or_sql, name_or_sql)
+    if limit:
+        sql = f"SELECT * FROM ({sql}) LIMIT {int(limit)}"
+    cur = conn.execute(sql)
+    return [d[0] for d in cur.description], cur.fetchall()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite warehouse for battle event logs")
+    parser.add_argument("--db", type=str, default="logs/events.sqlite", help="Database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="Load new battles from event files")
+    p_ingest.add_argument("--input", type=str, default="logs/events", help="Event file or directory")
+    p_query = sub.add_parser("query", help="Run a prebuilt query or raw SQL")
+    p_query.add_argument("name", help=f"One of {', '.join(QUERIES)} or a SELECT statement")
+    p_query.add_argument("--limit", type=int, default=50)
+    p_query.add_argument("--json", action="store_true", help="Print rows as JSON objects")
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = connect(db_path)
+    try:
+        if args.command == "ingest":
+            files, added = ingest(conn, Path(args.input))
+            total = conn.execute("SELECT COUNT(*) FROM battles").fetchone()[0]
+            print(f"Scanned {files} files, added {added} battles ({total} total) into: {db_path}")
+            return
+        cols, rows = run_query(conn, args.name, args.limit)
+        if args.json:
+            for row in rows:
+                print(json.dumps(dict(zip(cols, row)), ensure_ascii=False))
+            return
+        widths = [max(len(str(c)), *(len(str(r[i])) for r in rows)) if rows else len(str(c))
+                  for i, c in enumerate(cols)]
+        print("  ".join(str(c).ljust(w) for c, w in zip(cols, widths)))
+        for row in rows:
+            print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -65,6 +65,8 @@ def analyze_events():
 
     # 检查ABILITY_EFFECT中的HP变化是否一致
     hp_effect_mismatches = 0
+    # (target_id, |damage|) lookup instead of scanning every damage event
+    damage_index = {(de.get('target_id'), abs(de.get('damage', 0))) for de in damage_events}
     for ae in ability_effects:
         actor_hp = ae.get('actor', {}).get('hp_change', 0)
         target_hp = ae.get('target', {}).get('hp_change', 0)
@@ -72,12 +74,7 @@ def analyze_events():
         # 检查伤害是否记录在target上
         if target_hp < 0:
             # 应该有一个对应的damage事件
-            found = False
-            for de in damage_events:
-                if (de.get('target_id') == ae.get('target', {}).get('id') and
-                    abs(de.get('damage', 0)) == abs(target_hp)):
-                    found = True
-                    break
+            found = (ae.get('target', {}).get('id'), abs(target_hp)) in damage_index
             if not found:
                 hp_effect_mismatches += 1
                 if hp_effect_mismatches <= 5:
@@ -99,17 +96,13 @@ def analyze_events():
     print(f"治疗事件: {len(heal_events)}")
 
     heal_mismatches = 0
+    heal_index = {(he.get('target_id'), he.get('heal', 0)) for he in heal_events}
     for ae in ability_effects:
         actor_hp = ae.get('actor', {}).get('hp_change', 0)
         target_hp = ae.get('target', {}).get('hp_change', 0)
 
         if target_hp > 0:
-            found = False
-            for he in heal_events:
-                if (he.get('target_id') == ae.get('target', {}).get('id') and
-                    he.get('heal', 0) == target_hp):
-                    found = True
-                    break
+            found = (ae.get('target', {}).get('id'), target_hp) in heal_index
             if not found:
                 heal_mismatches += 1
                 if heal_mismatches <= 5:
@@ -137,27 +130,16 @@ def analyze_events():
 
     # 检查Aura应用和移除是否平衡
     aura_issues = 0
+    aura_closed = {(e.get('aura_id'), e.get('owner_id')) for e in aura_refresh + aura_remove}
     for apply_event in aura_apply:
         aura_id = apply_event.get('aura_id')
         owner_id = apply_event.get('owner_id')
 
         # 应该有对应的移除或刷新
-        found = False
-        for refresh in aura_refresh:
-            if (refresh.get('aura_id') == aura_id and
-                refresh.get('owner_id') == owner_id):
-                found = True
-                break
+        found = (aura_id, owner_id) in aura_closed
 
         if not found:
-            # 检查是否有后续移除
-            for remove in aura_remove:
-                if (remove.get('aura_id') == aura_id and
-                    remove.get('owner_id') == owner_id):
-                    found = True
-                    break
-
-            if not found and aura_issues <= 3:
+            if aura_issues <= 3:
                 aura_issues += 1
                 issues.append({
                     'type': 'AURA_UNBALANCED',
@@ -181,17 +163,13 @@ def analyze_events():
 
     # 检查状态是否一致
     state_issues = 0
+    state_changed = {(sc.get('state_id'), sc.get('target_id')) for sc in state_change}
     for ss in state_set:
         state_id = ss.get('state_id')
         value = ss.get('value')
         target_id = ss.get('target_id')
 
-        found = False
-        for sc in state_change:
-            if (sc.get('state_id') == state_id and
-                sc.get('target_id') == target_id):
-                found = True
-                break
+        found = (state_id, target_id) in state_changed
 
         if not found and state_issues <= 3:
             state_issues += 1
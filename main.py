@@ -37,9 +37,12 @@ from typing import Any, Dict, List, Optional, Tuple
 # Engine imports
 from engine.core.team_manager import TeamManager
 from engine.core.event_bus import EventBus
+from engine.core.event_binary import BinaryEventWriter, is_binary_event_file
+from engine.core.event_log import JsonlEventWriter
+from engine.core.snapshots import KEYFRAME_EVENT, SnapshotTracker
 from engine.resolver.aura_manager import AuraManager
 from engine.resolver.cooldown import CooldownManager
-from engine.resolver.state_manager import StateManager
+from engine.resolver.dense_state_manager import STATE_BACKENDS, make_state_manager
 from engine.resolver.stats_resolver import StatsResolver
 from engine.resolver.weather_manager import WeatherManager
 from engine.resolver.racial_passives import RacialPassiveManager
@@ -199,95 +202,12 @@ class BattleLogger:
         self.log(f"  ⚡ 速度: {pet0_name}={speed0} vs {pet1_name}={speed1} | 先手: {first}")
 
 
-class EventLogger:
-    """JSONL event logger for battle events."""
+class EventLogger(JsonlEventWriter):
+    """JSONL event logger for battle events (one buffered handle per battle)."""
 
-    def __init__(self, event_file: str):
+    def __init__(self, event_file: str, **kwargs: Any):
+        super().__init__(event_file, **kwargs)
         self.event_file = event_file
-        self.seq = 0
-
-    def log(self, event: str, payload: Optional[Dict[str, Any]] = None) -> None:
-        self.seq += 1
-        record = {
-            "seq": self.seq,
-            "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "event": event,
-            "payload": payload or {},
-        }
-        with open(self.event_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
-
-
-def _snapshot_pet(ctx: "BattleContext", pet: PetInstance) -> Dict[str, Any]:
-    auras = {}
-    for aura_id, aura in ctx.aura.list_owner(pet.id).items():
-        auras[int(aura_id)] = {
-            "remaining_duration": int(aura.remaining_duration),
-            "stacks": int(aura.stacks),
-            "caster_pet_id": int(aura.caster_pet_id),
-            "source_effect_id": int(aura.source_effect_id),
-            "tickdown_first_round": bool(aura.tickdown_first_round),
-            "just_applied": bool(aura.just_applied),
-        }
-    return {
-        "pet_id": int(pet.id),
-        "name": pet.name_zh,
-        "hp": int(pet.hp),
-        "max_hp": int(pet.max_hp),
-        "alive": bool(pet.alive),
-        "power": int(pet.power),
-        "speed": int(pet.speed),
-        "states": ctx.states.snapshot_pet(pet.id),
-        "auras": auras,
-    }
-
-
-def _diff_snapshot(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
-    diff: Dict[str, Any] = {}
-    for k in ("hp", "max_hp", "alive", "power", "speed"):
-        if before.get(k) != after.get(k):
-            b = before.get(k)
-            a = after.get(k)
-            entry = {"before": b, "after": a}
-            if isinstance(b, int) and isinstance(a, int):
-                entry["delta"] = a - b
-            diff[k] = entry
-
-    # states diff
-    states_before = before.get("states", {}) or {}
-    states_after = after.get("states", {}) or {}
-    state_changes: Dict[str, Any] = {}
-    for sid in set(states_before.keys()) | set(states_after.keys()):
-        bv = states_before.get(sid, 0)
-        av = states_after.get(sid, 0)
-        if bv != av:
-            state_changes[str(sid)] = {"before": bv, "after": av}
-    if state_changes:
-        diff["states_changed"] = state_changes
-
-    # auras diff
-    a_before = before.get("auras", {}) or {}
-    a_after = after.get("auras", {}) or {}
-    added = {}
-    removed = {}
-    changed = {}
-    for aid in set(a_before.keys()) | set(a_after.keys()):
-        b = a_before.get(aid)
-        a = a_after.get(aid)
-        if b is None and a is not None:
-            added[str(aid)] = a
-        elif a is None and b is not None:
-            removed[str(aid)] = b
-        elif b != a:
-            changed[str(aid)] = {"before": b, "after": a}
-    if added:
-        diff["auras_added"] = added
-    if removed:
-        diff["auras_removed"] = removed
-    if changed:
-        diff["auras_changed"] = changed
-
-    return diff
 
 
 # =============================================================================
@@ -464,6 +384,7 @@ class BattleContext:
         data_loader: DataLoader,
         seed: Optional[int] = None,
         event_logger: Optional[EventLogger] = None,
+        state_backend: str = "dict",
     ):
         self.pets = pets
         self.teams = teams
@@ -474,11 +395,13 @@ class BattleContext:
         self.rng = RandomRNG(seed=seed)
 
         # 状态管理器
-        self.states = StateManager()
+        self.states = make_state_manager(state_backend, num_pets=len(pets))
         self.aura = AuraManager()
         self.cooldowns = CooldownManager()
         self.weather = WeatherManager()
-        self.event_bus = EventBus()
+        self.weather.bind(self.aura)
+        # No history: events only go to the event logger (if any), so payloads are skipped otherwise.
+        self.event_bus = EventBus(capacity=0)
         if event_logger is not None:
             self.event_bus.set_logger(event_logger)
 
@@ -501,6 +424,18 @@ class BattleContext:
         # DoT追踪
         self.dots: Dict[int, List[dict]] = {}  # pet_id -> list of DoT effects
 
+        # ABILITY_EFFECTS diffs (created by the first keyframe)
+        self.snapshots: Optional[SnapshotTracker] = None
+
+    def emit_keyframe(self) -> None:
+        """Emit full snapshots of all pets (SNAPSHOT_KEYFRAME); later diffs are against these."""
+        if self.snapshots is None:
+            self.snapshots = SnapshotTracker(self)
+        self.event_bus.emit(KEYFRAME_EVENT, {
+            "round_no": int(self.btl.round_no),
+            "pets": self.snapshots.keyframe(),
+        })
+
     def get_active_weather_name(self) -> str:
         """获取当前天气名称"""
         if self.btl.current_weather == 0:
@@ -521,9 +456,17 @@ class AbilityExecutor:
     def execute_ability(self, actor: PetInstance, target: PetInstance,
                         ability_id: int, ability_name_zh: str) -> dict:
         """执行技能"""
-        actor_before = _snapshot_pet(self.ctx, actor)
-        target_before = _snapshot_pet(self.ctx, target)
-        self.ctx.event_bus.emit("ABILITY_CAST_START", {
+        # Snapshots are only needed for ABILITY_EFFECTS; skip them when nobody listens.
+        # The event carries diffs only: *_sync = changes since the pet's last diff (between
+        # casts), *_diff = changes made by this cast; keyframes hold the full snapshots.
+        want_effects = self.ctx.event_bus.has_subscribers("ABILITY_EFFECTS")
+        if want_effects:
+            if self.ctx.snapshots is None:
+                self.ctx.emit_keyframe()
+            tracker = self.ctx.snapshots
+            actor_sync = tracker.diff(actor)
+            target_sync = tracker.diff(target)
+        self.ctx.event_bus.emit_lazy("ABILITY_CAST_START", lambda: {
             "actor_id": actor.id,
             "actor_name": actor.name_zh,
             "target_id": target.id,
@@ -597,7 +540,7 @@ class AbilityExecutor:
             PET_TYPE_NAMES_ZH.get(pet_type_enum, "物理"),
             mult, reason, is_crit
         )
-        self.ctx.event_bus.emit("DAMAGE_APPLIED", {
+        self.ctx.event_bus.emit_lazy("DAMAGE_APPLIED", lambda: {
             "actor_id": actor.id,
             "actor_name": actor.name_zh,
             "target_id": target.id,
@@ -615,31 +558,31 @@ class AbilityExecutor:
             "target_hp_before": int(hp_before),
             "target_hp_after": int(target.hp),
         })
-        actor_after = _snapshot_pet(self.ctx, actor)
-        target_after = _snapshot_pet(self.ctx, target)
-        self.ctx.event_bus.emit("ABILITY_EFFECTS", {
-            "actor_id": actor.id,
-            "target_id": target.id,
-            "ability_id": int(ability_id),
-            "ability_name": ability_name_zh,
-            "round_no": int(self.ctx.btl.round_no),
-            "calc": {
-                "base_points": int(base_points),
-                "base_damage": int(base_damage),
-                "variance": float(variance),
-                "type_mult": float(mult),
-                "type_reason": reason,
-                "is_crit": bool(is_crit),
-                "actual_damage": int(actual_damage),
-            },
-            "actor_before": actor_before,
-            "actor_after": actor_after,
-            "target_before": target_before,
-            "target_after": target_after,
-            "actor_diff": _diff_snapshot(actor_before, actor_after),
-            "target_diff": _diff_snapshot(target_before, target_after),
-        })
-        self.ctx.event_bus.emit("ABILITY_CAST_END", {
+        if want_effects:
+            effects = {
+                "actor_id": actor.id,
+                "target_id": target.id,
+                "ability_id": int(ability_id),
+                "ability_name": ability_name_zh,
+                "round_no": int(self.ctx.btl.round_no),
+                "calc": {
+                    "base_points": int(base_points),
+                    "base_damage": int(base_damage),
+                    "variance": float(variance),
+                    "type_mult": float(mult),
+                    "type_reason": reason,
+                    "is_crit": bool(is_crit),
+                    "actual_damage": int(actual_damage),
+                },
+                "actor_diff": tracker.diff(actor),
+                "target_diff": tracker.diff(target),
+            }
+            if actor_sync:
+                effects["actor_sync"] = actor_sync
+            if target_sync:
+                effects["target_sync"] = target_sync
+            self.ctx.event_bus.emit("ABILITY_EFFECTS", effects)
+        self.ctx.event_bus.emit_lazy("ABILITY_CAST_END", lambda: {
             "actor_id": actor.id,
             "target_id": target.id,
             "ability_id": int(ability_id),
@@ -777,6 +720,8 @@ def run_battle(
     ability_override_by_pet_slot: Optional[Dict[int, Dict[int, int]]] = None,
     verbose: bool = True,
     event_log_file: Optional[str] = None,
+    event_writer: Optional[Any] = None,
+    state_backend: str = "dict",
 ) -> int:
     """运行战斗
 
@@ -784,11 +729,50 @@ def run_battle(
       - 等级: level (默认 25)
       - 品质: rarity_id (默认 4 = 精良蓝色)
 
+    event_log_file: 本场战斗的事件文件 (.jsonl / .jsonl.gz / .jsonl.xz / 二进制 .wpev)，战斗结束时关闭
+    event_writer: 共享的事件写入器 (例如多场战斗共用一个分片文件)，由调用方负责关闭
+    state_backend: 状态存储 "dict" (StateManager) 或 "dense" (DenseStateManager)
+
     返回获胜队伍ID (0或1)，-1为平局
     """
+    event_logger = event_writer
+    if event_logger is None and event_log_file:
+        if is_binary_event_file(event_log_file):
+            event_logger = BinaryEventWriter(event_log_file)
+        else:
+            event_logger = EventLogger(event_log_file)
+    try:
+        return _run_battle(
+            data_loader, team0_pet_ids, team1_pet_ids,
+            level=level, rarity_id=rarity_id, seed=seed, max_rounds=max_rounds,
+            log_file=log_file, ability_slot=ability_slot,
+            ability_choices_by_pet=ability_choices_by_pet,
+            ability_override_by_pet_slot=ability_override_by_pet_slot,
+            verbose=verbose, event_logger=event_logger, state_backend=state_backend,
+        )
+    finally:
+        if event_logger is not None and event_writer is None:
+            event_logger.close()
+
+
+def _run_battle(
+    data_loader: DataLoader,
+    team0_pet_ids: List[int],
+    team1_pet_ids: List[int],
+    level: int = 25,
+    rarity_id: int = 4,
+    seed: Optional[int] = None,
+    max_rounds: int = 25,
+    log_file: Optional[str] = None,
+    ability_slot: int = 1,
+    ability_choices_by_pet: Optional[Dict[int, List[int]]] = None,
+    ability_override_by_pet_slot: Optional[Dict[int, Dict[int, int]]] = None,
+    verbose: bool = True,
+    event_logger: Optional[JsonlEventWriter] = None,
+    state_backend: str = "dict",
+) -> int:
     # 创建日志
     logger = BattleLogger(log_file=log_file, verbose=verbose)
-    event_logger = EventLogger(event_log_file) if event_log_file else None
 
     # 创建宠物
     pets: Dict[int, PetInstance] = {}
@@ -853,6 +837,7 @@ def run_battle(
         data_loader=data_loader,
         seed=seed,
         event_logger=event_logger,
+        state_backend=state_backend,
     )
     executor = AbilityExecutor(ctx)
 
@@ -861,13 +846,15 @@ def run_battle(
     logger.log(f"随机种子: {seed}")
     logger.log(f"等级: {level} | 品质: {'蓝色(精良)' if rarity_id == 4 else f'品质{rarity_id}'}")
     logger.log("")
-    ctx.event_bus.emit("BATTLE_START", {
+    ctx.event_bus.emit_lazy("BATTLE_START", lambda: {
         "seed": seed,
         "level": int(level),
         "rarity_id": int(rarity_id),
         "team0_pet_ids": team0_pet_ids,
         "team1_pet_ids": team1_pet_ids,
     })
+    if ctx.event_bus.has_subscribers("ABILITY_EFFECTS"):
+        ctx.emit_keyframe()
 
     logger.log("队伍0:")
     for pid in team0_ids:
@@ -906,11 +893,13 @@ def run_battle(
         ctx.racial.on_round_start(ctx, all_pets)
 
         logger.round_start(round_no)
-        ctx.event_bus.emit("ROUND_START", {
+        ctx.event_bus.emit_lazy("ROUND_START", lambda: {
             "round_no": int(round_no),
             "weather": int(ctx.btl.current_weather),
             "weather_duration": int(ctx.btl.weather_duration),
         })
+        if ctx.snapshots is not None and ctx.snapshots.is_keyframe_round(round_no):
+            ctx.emit_keyframe()
 
         # 显示天气
         if ctx.btl.current_weather != 0:
@@ -944,7 +933,7 @@ def run_battle(
                 first_name = pet1.name_zh
 
         logger.speed_info(pet0.name_zh, speed0, pet1.name_zh, speed1, first_name)
-        ctx.event_bus.emit("TURN_ORDER", {
+        ctx.event_bus.emit_lazy("TURN_ORDER", lambda: {
             "round_no": int(round_no),
             "pet0_id": int(pet0.id),
             "pet1_id": int(pet1.id),
@@ -984,7 +973,7 @@ def run_battle(
                     revived = ctx.racial.on_pet_death(ctx, target)
                     passive_name = RACIAL_PASSIVE_DESC_ZH.get(target.pet_type, "").split("：")[0]
                     logger.pet_death(target.name_zh, revived, passive_name)
-                    ctx.event_bus.emit("PET_DEATH", {
+                    ctx.event_bus.emit_lazy("PET_DEATH", lambda: {
                         "pet_id": int(target.id),
                         "pet_name": target.name_zh,
                         "revived": bool(revived),
@@ -999,7 +988,7 @@ def run_battle(
             if pet:
                 status = f"HP:{pet.hp}/{pet.max_hp}" if pet.alive else "已阵亡"
                 logger.log(f"  队伍{tid}: {pet.name_zh} {status}")
-        ctx.event_bus.emit("ROUND_END", {
+        ctx.event_bus.emit_lazy("ROUND_END", lambda: {
             "round_no": int(round_no),
             "team0_active_id": int(teams.active_pet_id(0)),
             "team1_active_id": int(teams.active_pet_id(1)),
@@ -1014,7 +1003,7 @@ def run_battle(
             logger.log("")
             logger.header(f"战斗结束 - 队伍{winner}获胜!")
             logger.log(f"日志已保存到: {logger.log_file}")
-            ctx.event_bus.emit("BATTLE_END", {
+            ctx.event_bus.emit_lazy("BATTLE_END", lambda: {
                 "winner": int(winner),
                 "reason": "all_dead",
             })
@@ -1028,7 +1017,7 @@ def run_battle(
     logger.log("")
     logger.header("战斗结束 - 平局 (回合上限)")
     logger.log(f"日志已保存到: {logger.log_file}")
-    ctx.event_bus.emit("BATTLE_END", {
+    ctx.event_bus.emit_lazy("BATTLE_END", lambda: {
         "winner": -1,
         "reason": "round_limit",
     })
@@ -1065,7 +1054,7 @@ def ensure_active_alive(teams: TeamManager, pets: Dict[int, PetInstance],
             team.active_index = idx
             logger.swap(f"队伍{team_id}", old_name, pet.name_zh, forced=True)
             if ctx is not None:
-                ctx.event_bus.emit("PET_SWAP", {
+                ctx.event_bus.emit_lazy("PET_SWAP", lambda: {
                     "team_id": int(team_id),
                     "old_pet_name": old_name,
                     "new_pet_name": pet.name_zh,
@@ -1123,6 +1112,7 @@ def main():
     parser.add_argument("--rounds", type=int, default=25, help="最大回合数")
     parser.add_argument("--log", type=str, help="日志文件路径")
     parser.add_argument("--help-rules", action="store_true", help="显示游戏规则")
+    parser.add_argument("--state-backend", choices=STATE_BACKENDS, default="dict", help="状态存储后端")
     args = parser.parse_args()
 
     if args.help_rules:
@@ -1154,6 +1144,7 @@ def main():
         seed=args.seed,
         max_rounds=args.rounds,
         log_file=args.log,
+        state_backend=args.state_backend,
     )
 
 
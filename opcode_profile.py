@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Per-opcode dispatch profile (engine.effects.profiler) as a table or JSON.
+
+    python opcode_profile.py --records battles.jsonl --factory mysim:make_ctx
+    python opcode_profile.py --battles 50 --sort calls
+
+With --records every stored battle is replayed (engine.core.replay) through the ctx
+factory it was recorded with; without it, seeded 3v3 battles on the benchmark
+fixtures are run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from battle_replay import _factory
+from engine.effects.profiler import SORT_KEYS, DispatchProfiler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-opcode EffectDispatcher counters and timers")
+    parser.add_argument("--records", type=str, default=None, help="Battle record JSONL to replay")
+    parser.add_argument("--factory", type=str, default=None, help="ctx factory as module:function (with --records)")
+    parser.add_argument("--battles", type=int, default=20, help="Fixture battles to run without --records")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="total_ms", help="Table order")
+    parser.add_argument("--limit", type=int, default=None, help="Show the top N opcodes")
+    parser.add_argument("--json", action="store_true", help="Print the snapshot as JSON")
+    args = parser.parse_args()
+
+    prof = DispatchProfiler()
+    if args.records:
+        if not args.factory:
+            parser.error("--records needs --factory")
+        from engine.core.replay import load_records, replay
+
+        factory = _factory(args.factory)
+
+        def profiled_factory(spec, seed):
+            ctx, pets = factory(spec, seed)
+            prof.attach(ctx.dispatcher)
+            return ctx, pets
+
+        records = load_records(args.records)
+        for rec in records:
+            replay(rec, profiled_factory)
+        source = f"{len(records)} recorded battles"
+    else:
+        from benchmarks.macro import run_loop_battle
+
+        for seed in range(args.battles):
+            run_loop_battle(seed, setup=lambda ctx: prof.attach(ctx.dispatcher))
+        source = f"{args.battles} fixture battles"
+
+    if args.json:
+        print(json.dumps(prof.snapshot(), indent=2))
+    else:
+        print(f"# {source}")
+        print(prof.format_table(sort=args.sort, limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
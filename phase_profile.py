@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Per-phase BattleLoop.run_round timings (engine.core.phases) as a table or JSON.
+
+    python phase_profile.py --records battles.jsonl --factory mysim:make_ctx
+    python phase_profile.py --battles 50 --depth 1 --export phases.json
+
+With --records every stored battle is replayed (engine.core.replay) through the ctx
+factory it was recorded with; without it, seeded 3v3 battles on the benchmark
+fixtures are run. All battles feed one set of histograms.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from battle_replay import _factory
+from engine.core.battle_loop import BattleLoop
+from engine.core.phases import PhaseTimer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-phase round timings and histograms")
+    parser.add_argument("--records", type=str, default=None, help="Battle record JSONL to replay")
+    parser.add_argument("--factory", type=str, default=None, help="ctx factory as module:function (with --records)")
+    parser.add_argument("--battles", type=int, default=20, help="Fixture battles to run without --records")
+    parser.add_argument("--depth", type=int, default=None, help="Hide phases nested deeper than this")
+    parser.add_argument("--json", action="store_true", help="Print the snapshot as JSON")
+    parser.add_argument("--export", type=str, default=None, help="Also write the snapshot to this JSON file")
+    args = parser.parse_args()
+
+    timer = PhaseTimer()
+
+    def timed_loop() -> BattleLoop:
+        loop = BattleLoop()
+        timer.attach(loop)
+        return loop
+
+    if args.records:
+        if not args.factory:
+            parser.error("--records needs --factory")
+        from engine.core.replay import load_records, replay
+
+        factory = _factory(args.factory)
+        records = load_records(args.records)
+        for rec in records:
+            loop = timed_loop()
+            replay(rec, factory, loop=loop)
+            timer.detach(loop)
+        source = f"{len(records)} recorded battles"
+    else:
+        from benchmarks.macro import run_loop_battle
+
+        for seed in range(args.battles):
+            loop = timed_loop()
+            run_loop_battle(seed, loop=loop)
+            timer.detach(loop)
+        source = f"{args.battles} fixture battles"
+
+    if args.export:
+        timer.export(args.export)
+    if args.json:
+        print(json.dumps(timer.snapshot(), indent=2))
+    else:
+        print(f"# {source}")
+        print(timer.format_table(max_depth=args.depth))
+
+
+if __name__ == "__main__":
+    main()
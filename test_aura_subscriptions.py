@@ -0,0 +1,96 @@
+from benchmarks.fixtures import ABILITY_DOT, ABILITY_HIT, AURA_DOT, make_ctx, row
+from engine.core.ability_executor import AbilityExecutor
+from engine.core.actions import ActionKind, BattleAction
+from engine.core.battle_loop import BattleLoop
+from engine.core.events import Event
+from engine.resolver.aura_manager import AuraManager
+
+
+def _apply(am: AuraManager, owner: int, aura_id: int, duration: int = 2):
+    ar = am.apply(
+        owner_pet_id=owner,
+        caster_pet_id=owner,
+        aura_id=aura_id,
+        duration=duration,
+        tickdown_first_round=False,
+        source_effect_id=99,
+    )
+    assert ar.aura is not None
+    return ar.aura
+
+
+def test_subscribers_follow_payloads_attached_after_apply() -> None:
+    am = AuraManager()
+    dot = _apply(am, 1, 10)
+    dot.periodic_payloads[Event.TURN_END.value] = ["tick"]
+    thorns = _apply(am, 1, 11)
+    thorns.periodic_payloads[Event.ON_DAMAGE_TAKEN.value] = ["reflect"]
+    _apply(am, 1, 12)  # no payloads
+
+    assert [a.aura_id for a, _ in am.subscribers(Event.TURN_END.value, 1)] == [10]
+    assert am.subscribers(Event.ON_DAMAGE_TAKEN.value, 1) == [(thorns, ["reflect"])]
+    assert am.subscribers(Event.TURN_START.value, 1) == []
+    assert not am.has_subscribers(Event.ON_SWAP_IN.value)
+
+
+def test_subscribers_dropped_on_remove_and_expire() -> None:
+    am = AuraManager()
+    legacy = _apply(am, 2, 20, duration=1)
+    legacy.periodic_timing = Event.TURN_START.value
+    legacy.periodic_effect_rows = ["hot"]
+    dot = _apply(am, 2, 21)
+    dot.periodic_payloads[Event.TURN_START.value] = ["dot"]
+
+    assert [a.aura_id for a, _ in am.subscribers(Event.TURN_START.value, 2)] == [20, 21]
+
+    am.remove(2, 21)
+    assert [a.aura_id for a, _ in am.subscribers(Event.TURN_START.value, 2)] == [20]
+
+    am.tick(2)
+    am.tick(2)
+    assert am.get(2, 20) is None
+    assert not am.has_subscribers(Event.TURN_START.value)
+
+
+def _mark(state_id: int):
+    return [row(900, 31, "State,StateValue", f"{state_id},1")]
+
+
+def test_damage_triggers_run_for_the_struck_pet_and_the_attacker() -> None:
+    ctx, pets = make_ctx()
+    _apply(ctx.aura, 4, 300).periodic_payloads[Event.ON_DAMAGE_TAKEN.value] = _mark(50)
+    _apply(ctx.aura, 1, 301).periodic_payloads[Event.ON_DAMAGE_DEALT.value] = _mark(51)
+    _apply(ctx.aura, 1, 302).periodic_payloads[Event.ON_ABILITY.value] = _mark(52)
+    _apply(ctx.aura, 4, 303).periodic_payloads[Event.ON_HEAL_TAKEN.value] = _mark(53)
+
+    AbilityExecutor().use_ability_id(ctx, ctx.pets[1], ctx.pets[4], ABILITY_HIT)
+    assert ctx.pets[4].hp < ctx.pets[4].max_hp
+    assert (ctx.states.get(4, 50), ctx.states.get(1, 51), ctx.states.get(1, 52)) == (1, 1, 1)
+    assert ctx.states.get(4, 53) == 0
+
+
+def test_apply_and_swap_triggers_run_from_the_battle_loop() -> None:
+    ctx, pets = make_ctx()
+    ctx.scripts.periodic = {AURA_DOT: {Event.ON_APPLY.value: _mark(60)}}
+    _apply(ctx.aura, 1, 310).periodic_payloads[Event.ON_SWAP_OUT.value] = _mark(61)
+    _apply(ctx.aura, 2, 311).periodic_payloads[Event.ON_SWAP_IN.value] = _mark(62)
+    _apply(ctx.aura, 1, 312).periodic_payloads[Event.ON_ACTION.value] = _mark(63)
+
+    loop = BattleLoop()
+    loop.run_round(ctx, BattleAction(kind=ActionKind.SWAP, swap_index=1),
+                   BattleAction(kind=ActionKind.USE_ABILITY, ability_id=ABILITY_DOT, slot_index=3), pets)
+    assert ctx.teams.active_pet_id(0) == 2
+    assert (ctx.states.get(1, 61), ctx.states.get(2, 62), ctx.states.get(1, 63)) == (1, 1, 1)
+    assert ctx.aura.get(2, AURA_DOT) is not None and ctx.states.get(2, 60) == 1
+
+
+def test_removed_and_post_tick_triggers_run_at_turn_end() -> None:
+    ctx, pets = make_ctx()
+    _apply(ctx.aura, 5, 320, duration=1).periodic_payloads[Event.ON_AURA_REMOVED.value] = _mark(70)
+    _apply(ctx.aura, 6, 321).periodic_payloads[Event.POST_TICK.value] = _mark(71)
+
+    ex = AbilityExecutor()
+    ex.on_turn_end(ctx, pets)
+    assert (ctx.states.get(5, 70), ctx.states.get(6, 71)) == (0, 1)
+    ex.on_turn_end(ctx, pets)
+    assert ctx.aura.get(5, 320) is None and ctx.states.get(5, 70) == 1
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from engine.core.logs import LOG_DEBUG, LOG_KINDS, LOG_OFF, LOG_SUMMARY, ColumnarLog, MiniLog
+
+
+def _write(log) -> None:
+    row = SimpleNamespace(prop_id=24)
+    actor, target = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    log.warn(row, code="PARAM_LABEL_MISMATCH", detail={"x": 1})
+    for k in range(5):
+        log.damage(row, actor, target, SimpleNamespace(final_damage=100 + k, trace={"S1_base": k}))
+        log.gate(row, actor, target, 0.5, 0.25, True)
+    log.aura_apply(row, actor, target, 99, 3, False, "OK")
+    log.swap(1, 2, 3, False, "VOLUNTARY")
+
+
+def test_minilog_levels_and_ring_buffer() -> None:
+    full = MiniLog()
+    _write(full)
+    assert full.level == LOG_DEBUG and len(full.records) == 13
+    assert full.records[1] == ("damage", 24, 100, {"S1_base": 0})
+
+    summary = MiniLog(level=LOG_SUMMARY)
+    _write(summary)
+    assert [r[0] for r in summary.records] == ["damage"] * 5 + ["aura_apply", "swap"]
+    assert summary.records[0][3] is None
+
+    off = MiniLog(level=LOG_OFF)
+    _write(off)
+    assert not off.records
+
+    ring = MiniLog(capacity=4)
+    _write(ring)
+    assert list(ring.records) == list(full.records)[-4:]
+
+
+def test_columnar_log_export_matches_records_in_ring_order() -> None:
+    log = ColumnarLog(level=LOG_DEBUG)
+    _write(log)
+    cols = log.export()
+    assert len(log) == 13
+    assert [cols["kinds"][k] for k in cols["kind"]] == [r[0] for r in _records()]
+    assert list(cols["value"][1:11:2]) == [100, 101, 102, 103, 104]
+    assert cols["strings"][cols["text"][0]] == "PARAM_LABEL_MISMATCH"
+
+    ring = ColumnarLog(level=LOG_DEBUG, capacity=5)
+    _write(ring)
+    tail = ring.export()
+    assert ring.total == 13 and len(ring) == 5
+    for name in ColumnarLog.COLUMNS:
+        assert list(tail[name]) == list(cols[name])[-5:]
+
+    summary = ColumnarLog()
+    _write(summary)
+    assert [LOG_KINDS[k] for k in summary.export()["kind"]] == ["damage"] * 5 + ["aura_apply", "swap"]
+
+
+def _records():
+    log = MiniLog()
+    _write(log)
+    return log.records
@@ -0,0 +1,24 @@
+import benchmarks.macro  # noqa: F401  (registers benchmarks)
+import benchmarks.micro  # noqa: F401
+from benchmarks.harness import compare, get_benchmarks, load_baseline, make_baseline, run_benchmarks, save_baseline
+
+
+def test_suite_runs_and_baseline_round_trips(tmp_path) -> None:
+    selected = get_benchmarks(["dispatch.op0024", "param_parser.*", "battle_loop.3v3"])
+    assert [b.name for b in selected] == ["dispatch.op0024", "param_parser.parse", "battle_loop.3v3"]
+    results = run_benchmarks(selected, min_time=0.001, repeat=1)
+    assert all(r["ns_per_op"] > 0 for r in results.values())
+    assert results["battle_loop.3v3"]["unit"] == "battle"
+
+    path = tmp_path / "base.json"
+    save_baseline(path, make_baseline(results))
+    assert load_baseline(path)["results"] == results
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    base = {"results": {"a": {"ns_per_op": 100.0}, "b": {"ns_per_op": 100.0}, "c": {"ns_per_op": 100.0},
+                        "d": {"skipped": "no pandas"}, "gone": {"ns_per_op": 1.0}}}
+    cur = {"results": {"a": {"ns_per_op": 109.0}, "b": {"ns_per_op": 125.0}, "c": {"ns_per_op": 80.0},
+                       "d": {"ns_per_op": 5.0}, "new": {"ns_per_op": 1.0}}}
+    rows = {r["name"]: r["status"] for r in compare(base, cur, threshold=0.10)}
+    assert rows == {"a": "ok", "b": "regression", "c": "improvement", "d": "skipped"}
@@ -0,0 +1,58 @@
+from engine.core import rng as rng_mod
+from engine.core.rng import BlockRNG, CounterRNG, battle_seed, uniform_block
+
+
+def test_counter_rng_streams_are_independent_and_reproducible() -> None:
+    a = CounterRNG.for_battle(2024, 7)
+    b = CounterRNG(seed=battle_seed(2024, 7))
+    seq_a = [(a.rand_hit(), a.rand_crit(), a.rand_variance()) for _ in range(50)]
+    seq_b = [(b.rand_hit(), b.rand_crit(), b.rand_variance()) for _ in range(50)]
+    assert seq_a == seq_b
+    assert all(0.95 <= v < 1.05 for _, _, v in seq_a)
+
+    # Extra hit/gate rolls do not shift the crit stream.
+    c = CounterRNG.for_battle(2024, 7)
+    for _ in range(13):
+        c.rand_hit(); c.rand_gate()
+    assert [c.rand_crit() for _ in range(50)] == [x[1] for x in seq_a]
+
+    assert CounterRNG.for_battle(2024, 8).rand_hit() != seq_a[0][0]
+    assert a.split("rollout", 1).rand_hit() == CounterRNG(seed=a.seed).split("rollout", 1).rand_hit()
+
+
+def test_counter_rng_jump_and_block_match_scalar_draws() -> None:
+    r = CounterRNG(seed=99)
+    ref = [r.rand_hit() for _ in range(300)]
+
+    j = CounterRNG(seed=99)
+    j.jump(120, "hit")
+    assert j.rand_hit() == ref[120]
+
+    blk = CounterRNG(seed=99)
+    assert list(blk.block("hit", 100)) == ref[:100]
+    assert list(blk.block("hit", 200)) == ref[100:]
+    assert blk.used["hit"] == 300 and blk.used["crit"] == 0
+
+
+def test_uniform_block_without_numpy_matches_numpy(monkeypatch) -> None:
+    key = CounterRNG(seed=5)._keys["var"]
+    expected = list(uniform_block(key, 10, 64))
+
+    monkeypatch.setattr(rng_mod, "np", None)
+    assert rng_mod.uniform_block(key, 10, 64) == expected
+
+
+def test_block_rng_matches_source_and_restores_checkpoints() -> None:
+    ref = CounterRNG(seed=42)
+    blk = BlockRNG(CounterRNG(seed=42), block_size=5)
+
+    def draws(r, n):
+        return [(r.rand_hit(), r.rand_variance(), r.rand_crit()) for _ in range(n)] + [(r.rand_gate(),)]
+
+    assert draws(blk, 12) == draws(ref, 12)
+    assert blk.used == ref.used == {"hit": 12, "gate": 1, "var": 12, "crit": 12}
+
+    cp = blk.checkpoint()
+    ahead = draws(blk, 7)
+    blk.restore(cp)
+    assert draws(blk, 7) == ahead
@@ -0,0 +1,125 @@
+import random
+from types import SimpleNamespace
+
+from engine.core.rng import BlockRNG, CounterRNG, SeqRNG
+from engine.model.damage import DamageEvent
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.gate import GateCheck
+from engine.resolver.heal_pipeline import HealPipeline
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import STATE_MOD_DAMAGE_TAKEN_PERCENT, StatsResolver
+
+
+def _ctx(seed: int) -> SimpleNamespace:
+    r = random.Random(seed)
+    rng = SeqRNG(
+        seq_var=[r.uniform(0.9, 1.1) for _ in range(64)],
+        seq_crit=[r.random() for _ in range(64)],
+        seq_hit=[r.random() for _ in range(64)],
+        seq_gate=[r.random() for _ in range(64)],
+    )
+    pets = [
+        SimpleNamespace(id=i, pet_type=t, power=p, speed=250, hp=hp, max_hp=1400)
+        for i, (t, p, hp) in enumerate([(7, 290, 500), (5, 310, 1400), (3, 260, 900), (8, 275, 1400)], start=1)
+    ]
+    ctx = SimpleNamespace(
+        rng=rng,
+        pets={p.id: p for p in pets},
+        states=StateManager(),
+        aura=AuraManager(),
+        stats=StatsResolver(),
+        trace_extended=True,
+    )
+    ctx.states.set(2, STATE_MOD_DAMAGE_TAKEN_PERCENT, 25)
+    return ctx
+
+
+def _events(ctx: SimpleNamespace):
+    pets = list(ctx.pets.values())
+    out = []
+    for k in range(24):
+        actor = pets[k % 4]
+        target = pets[(k + 1 + k // 4) % 4]
+        out.append(DamageEvent(
+            source_actor=actor,
+            target=target,
+            ability_id=0,
+            effect_id=k,
+            points=10 + 3 * k,
+            is_periodic=(k % 5 == 0),
+            attack_type_override=(k % 11) - 1,
+        ))
+    return out
+
+
+def test_resolve_batch_matches_scalar_resolve() -> None:
+    for seed in range(5):
+        ctx_a = _ctx(seed)
+        scalar = [DamagePipeline(ctx_a.rng).resolve(ctx_a, ev) for ev in _events(ctx_a)]
+
+        ctx_b = _ctx(seed)
+        batch = DamagePipeline(ctx_b.rng).resolve_batch(ctx_b, _events(ctx_b))
+
+        assert [(r.final_damage, r.trace) for r in batch] == [(r.final_damage, r.trace) for r in scalar]
+        assert ctx_a.rng.used == ctx_b.rng.used
+
+
+def test_resolve_batch_heals_matches_scalar_resolve() -> None:
+    ctx_a = _ctx(3)
+    ctx_a.heal_can_crit = True
+    scalar = [HealPipeline(ctx_a.rng).resolve(ctx_a, ev) for ev in _events(ctx_a)]
+
+    ctx_b = _ctx(3)
+    ctx_b.heal_can_crit = True
+    batch = HealPipeline(ctx_b.rng).resolve_batch(ctx_b, _events(ctx_b))
+
+    assert [(r.final_heal, r.trace) for r in batch] == [(r.final_heal, r.trace) for r in scalar]
+    assert ctx_a.rng.used == ctx_b.rng.used
+
+
+def test_hit_and_gate_batches_match_scalar_checks() -> None:
+    checks = [(ev.source_actor, ev.target, [0, 35, 50, 0.8, 100, 140][k % 6], k % 7 == 3) for k, ev in enumerate(_events(_ctx(0)))]
+    chances = [None, 0, 0.25, 50, 100, 250, "x", 0.9]
+
+    ctx_a = _ctx(4)
+    ctx_a.states.set(1, HitCheck._STATE_STAT_DODGE, 20)
+    hc = HitCheck(rng=ctx_a.rng, stats=ctx_a.stats)
+    scalar_hits = [hc.compute(ctx_a, a, t, acc, dont_miss=dm) for a, t, acc, dm in checks]
+    scalar_gates = [GateCheck(ctx_a.rng).compute(c) for c in chances]
+
+    ctx_b = _ctx(4)
+    ctx_b.states.set(1, HitCheck._STATE_STAT_DODGE, 20)
+    hc = HitCheck(rng=ctx_b.rng, stats=ctx_b.stats)
+    batch_hits = hc.compute_batch(ctx_b, *map(list, zip(*checks)))
+    batch_gates = GateCheck(ctx_b.rng).compute_batch(chances)
+
+    assert batch_hits == scalar_hits
+    assert batch_gates == scalar_gates
+    assert ctx_a.rng.used == ctx_b.rng.used
+
+
+def test_block_rng_batches_draw_each_stream_once_and_match_scalar() -> None:
+    def setup():
+        ctx = _ctx(1)
+        ctx.rng = BlockRNG(CounterRNG(seed=9), block_size=7)  # batches cross block boundaries
+        events = _events(ctx)
+        for ev in events[::3]:
+            ev.variance = 1.0  # overridden: no variance roll
+        return ctx, events
+
+    ctx_a, events = setup()
+    scalar = [DamagePipeline(ctx_a.rng).resolve(ctx_a, ev) for ev in events]
+    hc = HitCheck(rng=ctx_a.rng, stats=ctx_a.stats)
+    scalar_hits = [hc.compute(ctx_a, ev.source_actor, ev.target, 80, dont_miss=k % 4 == 0) for k, ev in enumerate(events)]
+
+    ctx_b, events = setup()
+    batch = DamagePipeline(ctx_b.rng).resolve_batch(ctx_b, events)
+    hc = HitCheck(rng=ctx_b.rng, stats=ctx_b.stats)
+    batch_hits = hc.compute_batch(ctx_b, [ev.source_actor for ev in events], [ev.target for ev in events],
+                                  [80] * len(events), [k % 4 == 0 for k in range(len(events))])
+
+    assert [(r.final_damage, r.trace) for r in batch] == [(r.final_damage, r.trace) for r in scalar]
+    assert batch_hits == scalar_hits
+    assert ctx_a.rng.used == ctx_b.rng.used == {"hit": 18, "gate": 0, "var": 16, "crit": 24}
@@ -0,0 +1,102 @@
+import random
+from types import SimpleNamespace
+
+from engine.model.damage import DamageEvent
+from engine.model.effect_row import EffectRow
+from engine.resolver.damage_distribution import event_distribution, row_distribution, turn_distribution
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import StatsResolver
+
+
+class _UniformRNG:
+    def __init__(self, seed: int):
+        self._r = random.Random(seed)
+
+    def rand_hit(self) -> float:
+        return self._r.random()
+
+    def rand_gate(self) -> float:
+        return self._r.random()
+
+    def rand_variance(self) -> float:
+        return 0.95 + self._r.random() * 0.1
+
+    def rand_crit(self) -> float:
+        return self._r.random()
+
+
+def _ctx() -> SimpleNamespace:
+    rng = _UniformRNG(11)
+    stats = StatsResolver()
+    actor = SimpleNamespace(id=1, pet_type=0, power=280, speed=260, hp=1500, max_hp=1500)
+    target = SimpleNamespace(id=2, pet_type=1, power=260, speed=250, hp=1500, max_hp=1500)
+    return SimpleNamespace(
+        rng=rng,
+        pets={1: actor, 2: target},
+        states=StateManager(),
+        stats=stats,
+        damage_pipeline=DamagePipeline(rng),
+        hitcheck=HitCheck(rng=rng, stats=stats),
+    )
+
+
+def _row(effect_id: int, raw: str) -> EffectRow:
+    return EffectRow(ability_id=1, turn_id=1, effect_id=effect_id, prop_id=24, order_index=effect_id,
+                     param_label="Points,Accuracy,IsPeriodic", param_raw=raw, aura_ability_id=None)
+
+
+def test_event_distribution_is_normalized_and_matches_fixed_variance() -> None:
+    ctx = _ctx()
+    actor, target = ctx.pets[1], ctx.pets[2]
+    ev = DamageEvent(source_actor=actor, target=target, ability_id=1, effect_id=1, points=20)
+
+    dist = event_distribution(ctx, ev, hit_chance=0.9)
+    assert abs(sum(dist.pmf.values()) - 1.0) < 1e-9
+    assert abs(dist.pmf[0] - 0.1) < 1e-9
+
+    fixed = DamageEvent(source_actor=actor, target=target, ability_id=1, effect_id=1, points=20, variance=1.0)
+    ctx.crit_chance = 1e-12
+    expected = DamagePipeline(ctx.rng).resolve(ctx, fixed).final_damage
+    assert abs(event_distribution(ctx, fixed).pmf[expected] - 1.0) < 1e-9
+
+
+def test_row_distribution_matches_sampled_mean() -> None:
+    ctx = _ctx()
+    actor, target = ctx.pets[1], ctx.pets[2]
+    dist = row_distribution(ctx, actor, target, _row(1, "30,85,0"))
+
+    n = 20000
+    total = 0
+    for _ in range(n):
+        hit, _ = ctx.hitcheck.compute(ctx, actor, target, 85)
+        if hit:
+            ev = DamageEvent(source_actor=actor, target=target, ability_id=1, effect_id=1, points=30)
+            total += ctx.damage_pipeline.resolve(ctx, ev).final_damage
+    assert abs(total / n - dist.mean) < 0.02 * dist.mean
+
+
+def test_row_distribution_honors_dont_miss() -> None:
+    ctx = _ctx()
+    actor, target = ctx.pets[1], ctx.pets[2]
+    assert row_distribution(ctx, actor, target, _row(1, "30,50,0")).pmf.get(0, 0.0) > 0.4
+
+    ctx.acc_ctx = SimpleNamespace(dont_miss=True)
+    dist = row_distribution(ctx, actor, target, _row(1, "30,50,0"))
+    assert 0 not in dist.pmf
+    assert abs(sum(dist.pmf.values()) - 1.0) < 1e-9
+
+
+def test_turn_distribution_convolves_multi_hit_rows() -> None:
+    ctx = _ctx()
+    actor, target = ctx.pets[1], ctx.pets[2]
+    one = row_distribution(ctx, actor, target, _row(1, "10,100,0"))
+    rows = [_row(1, "10,100,0"), _row(2, "10,100,0"),
+            EffectRow(ability_id=1, turn_id=1, effect_id=3, prop_id=31, order_index=3,
+                      param_label="", param_raw="0,0,0,0,0,0", aura_ability_id=None)]
+    turn = turn_distribution(ctx, actor, target, rows)
+
+    assert turn.modeled_rows == 2 and turn.unmodeled == [31]
+    assert abs(turn.distribution.mean - 2 * one.mean) < 1e-9
+    assert abs(turn.distribution.variance - 2 * one.variance) < 1e-6
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from engine.resolver.dense_state_manager import DENSE_STATE_IDS, DenseStateManager, make_state_manager
+from engine.resolver.state_manager import StateManager
+
+
+def test_dense_state_manager_matches_dict_backend() -> None:
+    rng = random.Random(7)
+    ref = StateManager()
+    dense = DenseStateManager(num_pets=2)
+    state_ids = list(DENSE_STATE_IDS[:6]) + [141, 900_001]
+
+    for _ in range(2000):
+        pid = rng.randint(1, 6)
+        sid = rng.choice(state_ids)
+        op = rng.random()
+        if op < 0.5:
+            v = rng.choice([0, 1, -3, 250, 2 ** 40])
+            assert dense.set(pid, sid, v) == ref.set(pid, sid, v)
+        elif op < 0.55:
+            ref.clear_pet(pid)
+            dense.clear_pet(pid)
+        else:
+            assert dense.get(pid, sid, -7) == ref.get(pid, sid, -7)
+        assert dense.snapshot_pet(pid) == ref.snapshot_pet(pid)
+        assert list(dense.snapshot_pet(pid)) == list(ref.snapshot_pet(pid))
+
+
+def test_dense_state_matrix_copy_and_bulk_clear() -> None:
+    sm = DenseStateManager(num_pets=1)
+    sm.set(10, DENSE_STATE_IDS[0], 1)
+    sm.set(20, DENSE_STATE_IDS[2], 5)
+    sm.set(20, 141, 3)  # sparse-only state
+
+    clone = sm.copy()
+    sm.clear_pets([20])
+
+    assert sm.pet_ids == [10, 20]
+    m = [list(r) for r in sm.state_matrix()]
+    assert m[0][0] == 1 and m[1] == [0] * len(DENSE_STATE_IDS)
+    assert sm.snapshot_pet(20) == {}
+    assert clone.snapshot_pet(20) == {DENSE_STATE_IDS[2]: 5, 141: 3}
+
+
+def test_checkpoint_restore_rewinds_both_backends() -> None:
+    for sm in (StateManager(), DenseStateManager(num_pets=1)):
+        sm.set(1, DENSE_STATE_IDS[0], 5)
+        sm.set(2, 900_001, 2 ** 40)
+        cp = sm.checkpoint()
+        sm.set(1, DENSE_STATE_IDS[0], 9)
+        sm.set(3, DENSE_STATE_IDS[1], 1)
+        sm.clear_pet(2)
+        sm.restore(cp)
+        assert sm.snapshot_pet(1) == {DENSE_STATE_IDS[0]: 5}
+        assert sm.snapshot_pet(2) == {900_001: 2 ** 40}
+        assert sm.snapshot_pet(3) == {}
+        sm.set(4, DENSE_STATE_IDS[2], 3)  # grows past the restored rows
+        assert sm.get(4, DENSE_STATE_IDS[2]) == 3 and sm.get(1, DENSE_STATE_IDS[0]) == 5
+
+
+def test_get_coerces_ids_and_backend_switch() -> None:
+    for sm in (make_state_manager("dict"), make_state_manager("dense", num_pets=2)):
+        sm.set(3, 7, 40)
+        sm.set(3, 999, 5)  # sparse in the dense backend
+        assert sm.get("3", "7") == 40 and sm.get(3.0, 999) == 5 and sm.get("4", 7, 1) == 1
+    assert isinstance(make_state_manager("dense"), DenseStateManager)
+    with pytest.raises(ValueError):
+        make_state_manager("numpy")
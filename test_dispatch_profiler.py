@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from benchmarks.fixtures import ABILITY_HIT, OPCODE_ROWS, make_ctx, row
+from engine.core.actions import ActionKind, BattleAction
+from engine.core.battle_loop import BattleLoop
+from engine.core.span_trace import SpanTracer
+from engine.effects.dispatcher import EffectDispatcher
+from engine.effects.profiler import DispatchProfiler
+
+
+class _Semantics:
+    """Knows opcode 9998 (which has no handler) and nothing else."""
+
+    def get(self, prop_id):
+        return object() if prop_id == 9998 else None
+
+
+def test_counts_outcomes_and_detaches_cleanly() -> None:
+    ctx, pets = make_ctx()
+    ctx.dispatcher = EffectDispatcher(semantic_registry=_Semantics())
+    actor, target = pets[0], pets[3]
+    prof = DispatchProfiler()
+
+    with prof.attached(ctx.dispatcher):
+        assert "dispatch" in vars(ctx.dispatcher)
+        for _ in range(3):
+            assert ctx.dispatcher.dispatch(ctx, actor, target, OPCODE_ROWS[24]).executed
+        ctx.dispatcher.dispatch(ctx, actor, target, row(1, 9999, "", ""))
+        ctx.dispatcher.dispatch(ctx, actor, target, row(1, 9998, "", ""))
+        broken = SimpleNamespace(**vars(ctx))
+        del broken.hitcheck  # handler raises -> HANDLER_ERROR
+        assert not ctx.dispatcher.dispatch(broken, actor, target, OPCODE_ROWS[24]).executed
+
+    assert "dispatch" not in vars(ctx.dispatcher)
+    ctx.dispatcher.dispatch(ctx, actor, target, OPCODE_ROWS[24])  # not counted any more
+
+    snap = prof.snapshot()
+    assert set(snap) == {24, 9998, 9999}
+    hit = snap[24]
+    assert (hit["calls"], hit["executed"], hit["not_executed"], hit["handler_error"]) == (4, 3, 1, 1)
+    assert hit["handler"] == "H_Prop24_DmgPointsStd"
+    assert 0 < hit["max_ns"] <= hit["total_ns"]
+    assert snap[9999]["no_handler"] == 1 and snap[9998]["no_handler_known"] == 1
+    assert snap[9999]["handler"] is None
+
+    table = prof.format_table(sort="calls").splitlines()
+    assert len(table) == 4 and table[1].split()[0] == "24"
+
+
+def test_stacks_with_span_tracer_on_the_same_dispatcher() -> None:
+    ctx, pets = make_ctx()
+    loop, tracer, prof = BattleLoop(), SpanTracer(), DispatchProfiler()
+    hit = BattleAction(kind=ActionKind.USE_ABILITY, ability_id=ABILITY_HIT, slot_index=1)
+
+    def effect_spans() -> int:
+        return sum(1 for e in tracer.events if e["cat"] == "effect")
+
+    tracer.attach(loop, ctx.dispatcher)
+    prof.attach(ctx.dispatcher)
+    loop.run_round(ctx, hit, hit, pets)
+    assert prof.snapshot()[24]["calls"] == 2 and effect_spans() == 2
+
+    prof.detach(ctx.dispatcher)
+    loop.run_round(ctx, hit, hit, pets)
+    assert prof.snapshot()[24]["calls"] == 2 and effect_spans() == 4
+
+    tracer.detach(loop)
+    assert "dispatch" not in vars(ctx.dispatcher)
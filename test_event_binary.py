@@ -0,0 +1,99 @@
+import json
+
+from engine.core.event_binary import (
+    FLAG_ZLIB,
+    ZDICT_BYTES,
+    BinaryEventReader,
+    BinaryEventWriter,
+    binary_to_jsonl,
+    jsonl_to_binary,
+)
+from engine.core.event_log import CLOCK_WALL, JsonlEventWriter, iter_event_records
+
+
+def _battle(writer, key, rounds: int = 2) -> None:
+    writer.battle = key
+    writer.log("BATTLE_START", {"seed": None, "team0_pet_ids": [1, 2], "team1_pet_ids": [3]})
+    for r in range(1, rounds + 1):
+        writer.log("ROUND_START", {"round_no": r, "weather": 0, "weather_duration": 0})
+        writer.log("DAMAGE_APPLIED", {
+            "actor_id": 100, "actor_name": "小鸡", "target_id": 200, "target_name": "火焰",
+            "ability_id": 42, "ability_name": "啄", "round_no": r, "base_points": 20,
+            "base_damage": 300, "variance": 0.97, "type_mult": 1.5, "type_reason": "STRONG",
+            "is_crit": r == 2, "actual_damage": 436, "target_hp_before": 1500, "target_hp_after": 1064,
+        })
+        snap = {"pet_id": 200, "hp": 1064, "states": {"1": 0}, "auras": {}}
+        writer.log("ABILITY_EFFECTS", {"target_before": snap, "target_after": dict(snap), "round_no": r})
+    # out of the fixed layout's range -> generic encoding, still lossless
+    writer.log("DAMAGE_APPLIED", {"actor_id": -1, "actual_damage": 10 ** 12})
+    writer.log("BATTLE_END", {"winner": 0, "reason": "all_dead"})
+
+
+def test_binary_round_trip_and_seek(tmp_path) -> None:
+    jl, wp = tmp_path / "s.jsonl", tmp_path / "s.wpev"
+    with JsonlEventWriter(jl, mode="w") as a, BinaryEventWriter(wp) as b:
+        for key in ("pet_1", "pet_2"):
+            _battle(a, key)
+            _battle(b, key)
+    expected = list(iter_event_records(jl))
+    assert list(iter_event_records(wp)) == expected
+    assert wp.stat().st_size * 2 < jl.stat().st_size
+
+    with BinaryEventReader(wp) as reader:
+        assert len(reader) == len(expected)
+        assert [b["key"] for b in reader.battles] == ["pet_1", "pet_2"]
+        rnd = list(reader.round("pet_2", 2))
+        assert [r["event"] for r in rnd] == ["ROUND_START", "DAMAGE_APPLIED", "ABILITY_EFFECTS",
+                                            "DAMAGE_APPLIED", "BATTLE_END"]
+        assert rnd[0]["seq"] == expected.index(rnd[0]) + 1
+        assert list(reader.battle(1)) == expected[len(expected) // 2:]
+        dmg = list(reader.records(events={"DAMAGE_APPLIED"}))
+        assert dmg == [r for r in expected if r["event"] == "DAMAGE_APPLIED"]
+
+    # converter: JSONL (wall-clock ts, no battle keys) -> binary -> identical JSONL text
+    src, back = tmp_path / "w.jsonl", tmp_path / "w2.jsonl"
+    with JsonlEventWriter(src, clock=CLOCK_WALL) as w:
+        _battle(w, None, rounds=1)
+    assert jsonl_to_binary(src, tmp_path / "w.wpev") == binary_to_jsonl(tmp_path / "w.wpev", back) == 6
+    assert back.read_text(encoding="utf-8") == src.read_text(encoding="utf-8")
+    assert isinstance(json.loads(back.read_text(encoding="utf-8").splitlines()[0])["ts"], str)
+
+
+def test_appended_battles_and_nested_back_references(tmp_path) -> None:
+    # two runs appended to one JSONL file: seq restarts at 1 for the second battle
+    src, wp = tmp_path / "a.jsonl", tmp_path / "a.wpev"
+    for _ in range(2):
+        with JsonlEventWriter(src) as w:
+            _battle(w, None, rounds=3)
+    z1, z2 = {"hp": 10, "x": 1}, {"hp": 20, "x": 2}
+    with JsonlEventWriter(src) as w:
+        w.log("ABILITY_EFFECTS", {"actor_before": [z1, [1, 2, 3, z1]], "target_before": [z2, [1, 2, 3, z2]]})
+    expected = list(iter_event_records(src))
+    assert [r["seq"] for r in expected].count(1) == 3
+
+    assert jsonl_to_binary(src, wp) == len(expected)
+    with BinaryEventReader(wp) as reader:
+        assert list(reader.records()) == expected
+        assert list(reader.battle(1)) == expected[len(expected) // 2:]  # the appended record joins it
+        assert list(reader.round(1, 2))[0]["seq"] == 5
+    assert binary_to_jsonl(wp, tmp_path / "b.jsonl") == len(expected)
+    assert (tmp_path / "b.jsonl").read_text(encoding="utf-8") == src.read_text(encoding="utf-8")
+
+
+def test_zlib_chunks_with_preset_dictionary_and_uncompressed_files(tmp_path) -> None:
+    jl, wz, wn = tmp_path / "m.jsonl", tmp_path / "z.wpev", tmp_path / "n.wpev"
+    with JsonlEventWriter(jl, mode="w") as a, BinaryEventWriter(wz, block_records=7) as b, \
+            BinaryEventWriter(wn, compression="none") as c:
+        for i in range(150):  # well past ZDICT_BYTES of records
+            for w in (a, b, c):
+                _battle(w, f"pet_{i}", rounds=3)
+    expected = list(iter_event_records(jl))
+    assert list(iter_event_records(wz)) == list(iter_event_records(wn)) == expected
+    assert wz.stat().st_size < 0.7 * wn.stat().st_size
+
+    with BinaryEventReader(wz) as z, BinaryEventReader(wn) as n:
+        assert z.flags & FLAG_ZLIB and not n.flags & FLAG_ZLIB
+        assert z._zdict is not None and z._zdict[1] == ZDICT_BYTES and n._zdict is None
+        # a round past the dictionary, read first thing: the dictionary is rebuilt on demand
+        assert list(z.round("pet_149", 3)) == list(n.round("pet_149", 3))
+        assert list(z.battle(0)) == list(n.battle(0)) == expected[:len(expected) // 150]
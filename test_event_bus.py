@@ -0,0 +1,50 @@
+from engine.core.event_bus import ANY_EVENT, EventBus
+from engine.core.events import Event
+
+
+def test_event_bus_default_keeps_history_and_logger() -> None:
+    seen = []
+    bus = EventBus()
+    bus.set_logger(type("L", (), {"log": lambda self, ev, p: seen.append((ev, p))})())
+    bus.emit(Event.ON_DAMAGE, payload=1)
+    assert bus.events == [(Event.ON_DAMAGE, 1)] and seen == [(Event.ON_DAMAGE, 1)]
+
+
+def test_event_bus_topics_lazy_payloads_and_bounded_history() -> None:
+    bus = EventBus(capacity=0)
+    built = []
+
+    def build():
+        built.append(1)
+        return {"x": 1}
+
+    assert not bus.has_subscribers("DAMAGE_APPLIED")
+    bus.emit_lazy("DAMAGE_APPLIED", build)
+    assert built == [] and len(bus.events) == 0
+
+    got, every = [], []
+    bus.subscribe("DAMAGE_APPLIED", lambda ev, p: got.append(p))
+    assert bus.has_subscribers("DAMAGE_APPLIED") and not bus.has_subscribers("ROUND_END")
+    bus.emit_lazy("DAMAGE_APPLIED", build)
+    bus.emit_lazy("ROUND_END", build)
+    assert got == [{"x": 1}] and built == [1]
+
+    bus.subscribe(ANY_EVENT, lambda ev, p: every.append(ev))
+    bus.emit("ROUND_END", None)
+    assert every == ["ROUND_END"]
+
+    bus.set_capacity(2)
+    for k in range(5):
+        bus.emit("ROUND_END", k)
+    assert list(bus.events) == [("ROUND_END", 3), ("ROUND_END", 4)]
+
+
+def test_event_bus_batched_delivery_is_deferred_and_ordered() -> None:
+    got = []
+    bus = EventBus(capacity=0, batched=True)
+    bus.subscribe(ANY_EVENT, lambda ev, p: got.append((ev, p)))
+    bus.emit("A", 1)
+    bus.emit("B", 2)
+    assert got == []
+    assert bus.flush() == 2
+    assert got == [("A", 1), ("B", 2)]
@@ -0,0 +1,35 @@
+from engine.core.event_log import JsonlEventWriter
+from event_diff import analyze_events, iter_battles
+
+
+def _cast(writer, round_no: int, damage: int, hp_before: int, delta: int, effects: bool = True) -> None:
+    cast = {"actor_id": 100, "target_id": 200, "ability_id": 42, "round_no": round_no}
+    writer.log("ABILITY_CAST_START", cast)
+    writer.log("DAMAGE_APPLIED", dict(cast, actual_damage=damage, target_hp_before=hp_before,
+                                      target_hp_after=max(hp_before - damage, 0)))
+    if effects:
+        hp_after = hp_before + delta
+        writer.log("ABILITY_EFFECTS", dict(
+            cast,
+            target_sync={"hp": {"before": None, "after": hp_before}, "max_hp": {"before": None, "after": 1000}},
+            target_diff={"hp": {"before": hp_before, "after": hp_after, "delta": delta}},
+        ))
+    writer.log("ABILITY_CAST_END", cast)
+
+
+def test_streaming_join_per_battle(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlEventWriter(path, mode="w") as w:
+        w.log("BATTLE_START", {})
+        _cast(w, 1, 300, 1000, -300)
+        _cast(w, 2, 300, 700, -250)          # effects disagree with the damage
+        w.log("BATTLE_START", {})             # second battle in the same file
+        _cast(w, 1, 300, 1000, -300)
+        _cast(w, 2, 100, 700, 0, effects=False)
+
+    assert [len(records) for _, records in iter_battles([{"event": "BATTLE_START"}, {}, {"event": "BATTLE_START"}])] == [2, 1]
+    issues = analyze_events(path)
+    assert [(i["type"], i["battle"], i["round_no"]) for i in issues] == [
+        ("diff_damage_mismatch", 0, 2),
+        ("damage_without_effects", 1, 2),
+    ]
@@ -0,0 +1,38 @@
+from engine.core.event_bus import EventBus
+from engine.core.event_log import CLOCK_WALL, JsonlEventWriter, iter_event_records
+
+
+def test_writer_buffers_in_blocks_and_uses_seq_clock(tmp_path) -> None:
+    path = tmp_path / "battle.jsonl"
+    writer = JsonlEventWriter(path, block_records=3)
+    bus = EventBus(capacity=0, logger=writer)
+    bus.emit("BATTLE_START", {"seed": 1})
+    bus.emit("ROUND_START", {"round_no": 1})
+    assert not path.exists()  # nothing written before the first block
+    bus.emit("ROUND_END", {"round_no": 1})
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+    bus.emit("BATTLE_END", None)
+    writer.close()
+    writer.close()
+
+    recs = list(iter_event_records(path))
+    assert [r["seq"] for r in recs] == [r["ts"] for r in recs] == [1, 2, 3, 4]
+    assert recs[-1] == {"seq": 4, "ts": 4, "event": "BATTLE_END", "payload": {}}
+
+
+def test_compressed_shards_round_trip(tmp_path) -> None:
+    for name in ("shard.jsonl.gz", "shard.jsonl.xz"):
+        path = tmp_path / name
+        with JsonlEventWriter(path, mode="w") as writer:
+            for battle in ("pet_1", "pet_2"):
+                writer.battle = battle
+                writer.log("DAMAGE_APPLIED", {"name": "火焰", "actual_damage": 7})
+        assert path.read_bytes()[:2] != b'{"'
+        recs = list(iter_event_records(path))
+        assert [(r["battle"], r["seq"]) for r in recs] == [("pet_1", 1), ("pet_2", 2)]
+        assert recs[0]["payload"]["name"] == "火焰"
+
+    wall = tmp_path / "wall.jsonl"
+    with JsonlEventWriter(wall, clock=CLOCK_WALL) as writer:
+        writer.log("BATTLE_START")
+    assert len(next(iter_event_records(wall))["ts"]) == len("2025-01-01 00:00:00")
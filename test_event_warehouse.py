@@ -0,0 +1,62 @@
+from engine.core.event_log import JsonlEventWriter
+from event_warehouse import connect, ingest, run_query
+
+
+def _battle(path, winner: int, key=None, mode: str = "a") -> None:
+    with JsonlEventWriter(path, mode=mode) as w:
+        w.battle = key
+        w.log("BATTLE_START", {"seed": 1, "team0_pet_ids": [40], "team1_pet_ids": [41]})
+        for r in (1, 2, 3, 4):
+            w.log("ROUND_START", {"round_no": r, "weather": 0, "weather_duration": 0})
+            cast = {"actor_id": 100, "target_id": 200, "ability_id": 42, "round_no": r}
+            w.log("ABILITY_CAST_START", cast)
+            if r != 2:  # round 2 misses
+                w.log("DAMAGE_APPLIED", dict(cast, actual_damage=100, is_crit=r == 3))
+            aura = {"remaining_duration": 2, "stacks": 1, "caster_pet_id": 100}
+            diff = {1: {"auras_added": {"7": aura}}, 3: {"auras_removed": {"7": aura}}}.get(r, {})
+            w.log("ABILITY_EFFECTS", dict(cast, target_diff=diff))
+            w.log("ABILITY_CAST_END", cast)
+        w.log("BATTLE_END", {"winner": winner, "reason": "all_dead"})
+
+
+def test_incremental_ingest_and_queries(tmp_path) -> None:
+    events = tmp_path / "events"
+    events.mkdir()
+    _battle(events / "a.jsonl", winner=0)
+    conn = connect(tmp_path / "w.sqlite")
+    assert ingest(conn, events) == (1, 1)
+    assert ingest(conn, events) == (1, 0)
+    _battle(events / "a.jsonl", winner=1)  # appended battle: only it is added
+    assert ingest(conn, events) == (1, 1)
+
+    _, rows = run_query(conn, "damage_per_ability")
+    assert rows == [(42, 6, 600, 100.0, 100, 0.3333)]
+    _, rows = run_query(conn, "miss_rates")
+    assert rows == [(42, 8, 2, 0.25)]
+    _, rows = run_query(conn, "aura_uptime")
+    assert rows == [(7, 2, 6, 0.75)]  # rounds 1-3 of 4, in both battles
+    _, rows = run_query(conn, "SELECT winner FROM battles ORDER BY battle_id")
+    assert rows == [(0,), (1,)]
+    conn.close()
+
+
+def test_rewritten_shard_replaces_stale_battles(tmp_path) -> None:
+    shard = tmp_path / "shard.jsonl"
+
+    def write(winners) -> None:
+        shard.unlink(missing_ok=True)
+        for key, winner in winners.items():
+            _battle(shard, winner, key=key)
+
+    conn = connect(tmp_path / "w.sqlite")
+    write({"pet_40": 0, "pet_41": 0})
+    assert ingest(conn, shard) == (1, 2)
+    write({"pet_40": 0, "pet_41": 1})  # same keys, one battle's outcome changed
+    assert ingest(conn, shard) == (1, 1)
+    write({"pet_41": 1})  # pet_40 dropped from the shard
+    assert ingest(conn, shard) == (1, 0)
+    _, rows = run_query(conn, "SELECT battle_key, winner FROM battles")
+    assert rows == [("pet_41", 1)]
+    _, rows = run_query(conn, "SELECT COUNT(*), COUNT(DISTINCT battle_id) FROM casts")
+    assert rows == [(4, 1)]
+    conn.close()
@@ -0,0 +1,151 @@
+import random
+from types import SimpleNamespace
+
+from engine.core.team_manager import TeamManager
+from engine.model.damage import DamageEvent
+from engine.model.effect_row import EffectRow
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.cooldown import CooldownManager
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.kill_turn import kill_turn, kill_turns
+from engine.resolver.racial_passives import RacialPassiveManager
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import StatsResolver
+
+
+class _UniformRNG:
+    def __init__(self, seed: int):
+        self._r = random.Random(seed)
+
+    def rand_hit(self) -> float:
+        return self._r.random()
+
+    def rand_variance(self) -> float:
+        return 0.95 + self._r.random() * 0.1
+
+    def rand_crit(self) -> float:
+        return self._r.random()
+
+
+def _row(ability_id: int, effect_id: int, points: int, accuracy: int = 100, periodic: int = 0) -> EffectRow:
+    return EffectRow(ability_id=ability_id, turn_id=1, effect_id=effect_id, prop_id=24, order_index=effect_id,
+                     param_label="Points,Accuracy,IsPeriodic", param_raw=f"{points},{accuracy},{periodic}",
+                     aura_ability_id=None)
+
+
+class _Scripts:
+    def __init__(self, casts, cooldowns):
+        self._casts = casts
+        self._cd = cooldowns
+
+    def get_ability_cast_turns(self, ability_id: int):
+        return [list(rows) for rows in self._casts.get(ability_id, [])]
+
+    def get_ability_cooldown(self, ability_id: int) -> int:
+        return self._cd.get(ability_id, 0)
+
+
+def _ctx(target_type: int = 1, target_hp: int = 1500) -> SimpleNamespace:
+    rng = _UniformRNG(5)
+    stats = StatsResolver()
+    actor = SimpleNamespace(id=1, pet_type=0, power=280, speed=260, hp=1500, max_hp=1500,
+                            selected_abilities=[10, 20, 0])
+    target = SimpleNamespace(id=2, pet_type=target_type, power=260, speed=250, hp=target_hp, max_hp=1500)
+    teams = TeamManager()
+    teams.register_team(0, [1])
+    teams.register_team(1, [2])
+    return SimpleNamespace(
+        rng=rng,
+        pets={1: actor, 2: target},
+        teams=teams,
+        states=StateManager(),
+        stats=stats,
+        aura=AuraManager(),
+        cooldowns=CooldownManager(),
+        racial=RacialPassiveManager(),
+        damage_pipeline=DamagePipeline(rng),
+        hitcheck=HitCheck(rng=rng, stats=stats),
+        scripts=_Scripts({10: [[_row(10, 1, 30, 90)]], 20: [[_row(20, 2, 45)], [_row(20, 3, 10)]]}, {20: 2}),
+    )
+
+
+def _simulate(ctx: SimpleNamespace, ability_id: int, dot_points: int, dot_ticks: int, trials: int) -> float:
+    actor, target = ctx.pets[1], ctx.pets[2]
+    cast_turns = ctx.scripts.get_ability_cast_turns(ability_id)
+    total = 0
+    for _ in range(trials):
+        hp = target.hp
+        cds = CooldownManager()
+        cds.restore(ctx.cooldowns.checkpoint())
+        r = 0
+        while hp > 0:
+            r += 1
+            cds.tick_down()  # TURN_START, before the action (as AbilityExecutor.on_turn_start)
+            if cds.get(1, ability_id) <= 0:
+                for rows in cast_turns:
+                    for row in rows:
+                        pts, acc, _ = (int(x) for x in row.param_raw.split(","))
+                        if ctx.hitcheck.compute(ctx, actor, target, acc)[0]:
+                            ev = DamageEvent(source_actor=actor, target=target, ability_id=ability_id,
+                                             effect_id=row.effect_id, points=pts)
+                            hp -= ctx.damage_pipeline.resolve(ctx, ev).final_damage
+                cds.set(1, ability_id, ctx.scripts.get_ability_cooldown(ability_id))
+            if r <= dot_ticks:
+                ev = DamageEvent(source_actor=actor, target=target, ability_id=99, effect_id=9,
+                                 points=dot_points, is_periodic=True)
+                hp -= ctx.damage_pipeline.resolve(ctx, ev).final_damage
+        total += r
+    return total / trials
+
+
+def _certain(kt, n: int) -> bool:
+    return list(kt.rounds) == [n] and abs(kt.rounds[n] - 1.0) < 1e-9
+
+
+def test_kill_turn_matches_simulation_with_cooldown_and_dot() -> None:
+    ctx = _ctx()
+    ctx.cooldowns.set(1, 20, 1)
+    aura = ctx.aura.apply(owner_pet_id=2, caster_pet_id=1, aura_id=99, duration=3,
+                          tickdown_first_round=False, source_effect_id=9).aura
+    aura.just_applied = False  # ticks in rounds 1..3
+    aura.periodic_payloads["TURN_END"] = [_row(99, 9, 15, 100, 1)]
+    ctx.aura.reindex(2, 99)
+
+    kts = kill_turns(ctx, 0, max_rounds=20)
+    assert [(kt.ability_id, kt.slot_index, kt.wait) for kt in kts] == [(10, 1, 0), (20, 2, 0)]
+    for kt in kts:
+        assert abs(sum(kt.rounds.values()) + kt.survive - 1.0) < 1e-9
+        assert kt.survive < 1e-9
+        sim = _simulate(ctx, kt.ability_id, 15, 3, 3000)
+        assert abs(sim - kt.expected_rounds) < 0.05 * kt.expected_rounds
+
+    ctx.cooldowns.set(1, 20, 3)  # first cast in round 3, then every 2 rounds
+    kt = kill_turn(ctx, ctx.pets[1], ctx.pets[2], 20, slot_index=2, max_rounds=20)
+    assert kt.wait == 2 and kt.first_round.max < kt.per_use.min
+    sim = _simulate(ctx, 20, 15, 3, 3000)
+    assert abs(sim - kt.expected_rounds) < 0.05 * kt.expected_rounds
+
+
+def test_magic_cap_and_racial_passives_shift_kill_round() -> None:
+    ctx = _ctx(target_type=1, target_hp=600)
+    ctx.scripts = _Scripts({30: [[_row(30, 1, 200)]]}, {})
+    assert _certain(kill_turn(ctx, ctx.pets[1], ctx.pets[2], 30), 1)
+
+    magic = _ctx(target_type=5, target_hp=1200)
+    magic.scripts = ctx.scripts
+    kt = kill_turn(magic, magic.pets[1], magic.pets[2], 30)
+    assert kt.per_use.max == int(1500 * 0.35)
+    assert _certain(kt, 3)
+
+    mech = _ctx(target_type=9, target_hp=600)
+    mech.scripts = ctx.scripts
+    assert _certain(kill_turn(mech, mech.pets[1], mech.pets[2], 30), 2)
+    mech.racial.state.mechanical_revived[2] = True
+    assert _certain(kill_turn(mech, mech.pets[1], mech.pets[2], 30), 1)
+
+    undead = _ctx(target_type=3, target_hp=1500)
+    undead.scripts = ctx.scripts
+    undead.racial.state.undead_immortality[2] = True
+    kt = kill_turn(undead, undead.pets[1], undead.pets[2], 30)
+    assert kt.per_use.pmf == {0: 1.0} and _certain(kt, 1)
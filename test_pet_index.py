@@ -0,0 +1,18 @@
+from types import SimpleNamespace
+
+from engine.core.pet_index import pet_index
+
+
+def test_index_follows_in_place_pet_replacement() -> None:
+    a, b = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    pets = [a, b]
+    ctx = SimpleNamespace(pets={1: a, 2: b})
+    assert pet_index(ctx, pets).get(2) is b
+
+    b2 = SimpleNamespace(id=2)  # same list, same length: only the pet changed
+    pets[1] = b2
+    ctx.pets[2] = b2
+    assert pet_index(ctx, pets).get(2) is b2
+
+    no_map = SimpleNamespace()
+    assert pet_index(no_map, pets).get(2) is b2 and 3 not in pet_index(no_map, pets)
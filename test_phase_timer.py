@@ -0,0 +1,51 @@
+import json
+import random
+
+from benchmarks.fixtures import make_ctx
+from engine.core.battle_loop import BattleLoop
+from engine.core.phases import PhaseTimer
+
+
+def _battle(loop, seed: int) -> int:
+    ctx, pets = make_ctx(team_size=2, seed=seed, hp=400)
+    choose = random.Random(seed)
+    for _ in range(60):
+        a0 = choose.choice(loop.legal_actions(ctx, 0))
+        a1 = choose.choice(loop.legal_actions(ctx, 1))
+        if loop.run_round(ctx, a0, a1, pets).winner_team_id is not None:
+            break
+    return loop.round_no
+
+
+def test_phases_nest_and_aggregate_across_battles(tmp_path) -> None:
+    timer = PhaseTimer()
+    rounds = 0
+    for seed in (1, 2):
+        loop = BattleLoop()
+        with timer.attached(loop):
+            rounds += _battle(loop, seed)
+        assert not vars(loop.ex).keys() & {"on_turn_start", "_sync_stats"} and "run_round" not in vars(loop)
+
+    snap = timer.snapshot()
+    assert snap["round"]["count"] == rounds
+    for path in ("round/turn_start", "round/turn_start/cooldowns", "round/turn_start/scheduler",
+                 "round/turn_start/ticks", "round/turn_start/stats_sync", "round/turn_end/ticks",
+                 "round/racial_start", "round/racial_end", "round/winner", "round/first_action"):
+        assert snap[path]["count"] == rounds, path
+    assert snap["round/ensure_active"]["count"] >= 2 * rounds
+    assert 0 < snap["round/second_action"]["count"] <= rounds
+    paths = list(snap)
+    assert paths[0] == "round" and paths.index("round/turn_start/stats_sync") < paths.index("round/racial_start")
+
+    st = timer.stats["round/turn_start"]
+    kids = sum(timer.stats[p].total_ns for p in snap if p.startswith("round/turn_start/"))
+    assert st.total_ns == kids + st.self_ns and st.self_ns >= 0
+    assert sum(snap["round"]["histogram_us"].values()) == rounds
+    assert snap["round"]["p50_us"] <= snap["round"]["p99_us"] <= snap["round"]["max_us"]
+
+    _battle(BattleLoop(), 3)  # detached loops are not timed
+    assert timer.snapshot()["round"]["count"] == rounds
+
+    timer.export(tmp_path / "phases.json")
+    assert json.loads((tmp_path / "phases.json").read_text())["phases"]["round"]["count"] == rounds
+    assert len(timer.format_table(max_depth=1).splitlines()) == 1 + sum(p.count("/") <= 1 for p in snap)
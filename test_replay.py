@@ -0,0 +1,157 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from engine.core.battle_loop import BattleLoop
+from engine.core.checkpoint import Checkpoints, capture, restore
+from engine.core.event_bus import EventBus
+from engine.core.logs import MiniLog
+from engine.core.replay import BattleRecorder, load_records, outcome_hash, replay, save_records, seek, verify_records
+from engine.core.rng import CounterRNG, SeqRNG
+from engine.core.trace import TRACE_EXTENDED
+from engine.core.team_manager import TeamManager
+from engine.effects.dispatcher import EffectDispatcher
+from engine.model.effect_row import EffectRow
+from engine.pets.pet_instance import PetInstance
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.cooldown import CooldownManager
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.heal_pipeline import HealPipeline
+from engine.resolver.hitcheck import HitCheck
+from engine.resolver.racial_passives import RacialPassiveManager
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import StatsResolver
+
+
+def _row(aid: int, prop: int, label: str, raw: str, aura: int = None) -> EffectRow:
+    return EffectRow(ability_id=aid, turn_id=1, effect_id=aid, prop_id=prop, order_index=1,
+                     param_label=label, param_raw=raw, aura_ability_id=aura)
+
+
+class _Scripts:
+    casts = {10: [[_row(10, 24, "Points,Accuracy,IsPeriodic", "30,90,0")]],
+             20: [[_row(20, 23, "Points,Accuracy", "25,100")]],
+             30: [[_row(30, 26, "Accuracy,Duration,TickDownFirstRound", "100,3,0", aura=31)]]}
+    dot = (_row(31, 24, "Points,Accuracy,IsPeriodic", "8,100,1"),)
+
+    def get_ability_cast_turns(self, aid):
+        return [list(r) for r in self.casts.get(aid, [])]
+
+    def get_ability_cooldown(self, aid):
+        return {20: 2}.get(aid, 0)
+
+    def get_aura_periodic(self, aid):
+        return {}
+
+    def get_aura_meta(self, aid):
+        return {}
+
+    def attach_periodic_to_aura(self, aura):
+        aura.periodic_payloads["TURN_END"] = list(self.dot)
+
+    def attach_meta_to_aura(self, aura):
+        pass
+
+
+def _make_ctx(spec, seed):
+    rng = CounterRNG(seed=seed)
+    stats = StatsResolver()
+    pets = {}
+    for i, speed in enumerate(spec["speeds"]):
+        pid = i + 1
+        pets[pid] = PetInstance(id=pid, pet_id=pid, rarity_id=4, breed_id=3, level=25, pet_type=i % 3,
+                                base_max_hp=900, base_power=280, base_speed=speed,
+                                max_hp=900, hp=900, power=280, speed=speed, abilities={1: 10, 2: 20, 3: 30})
+    teams = TeamManager()
+    teams.register_team(0, [1, 2])
+    teams.register_team(1, [3, 4])
+    ctx = SimpleNamespace(
+        rng=rng, pets=pets, teams=teams, states=StateManager(), stats=stats, aura=AuraManager(),
+        cooldowns=CooldownManager(), racial=RacialPassiveManager(), damage_pipeline=DamagePipeline(rng),
+        heal_pipeline=HealPipeline(rng), hitcheck=HitCheck(rng=rng, stats=stats), scripts=_Scripts(),
+        log=MiniLog(), acc_ctx=SimpleNamespace(), dispatcher=EffectDispatcher(),
+        event_bus=EventBus(), apply_damage=lambda t, amt, trace=None: t.take_damage(amt),
+        apply_heal=lambda t, amt, trace=None: t.receive_heal(amt))
+    return ctx, list(pets.values())
+
+
+def _record(seed: int, checkpoints=None):
+    spec = {"speeds": [260, 261, 262, 263]}
+    ctx, pets = _make_ctx(spec, seed)
+    ctx.trace_level = TRACE_EXTENDED  # what replay() traces the target round with
+    loop, rec, choose = BattleLoop(), BattleRecorder(spec, seed, checkpoints), random.Random(seed)
+    hashes, logs = [], []
+    for _ in range(40):
+        seen = len(ctx.log.records)
+        a0 = choose.choice(loop.legal_actions(ctx, 0))
+        a1 = choose.choice(loop.legal_actions(ctx, 1))
+        out = rec.run_round(loop, ctx, a0, a1, pets)
+        hashes.append(outcome_hash(ctx, out.winner_team_id))
+        logs.append(ctx.log.records[seen:])
+        if out.winner_team_id is not None:
+            break
+    return rec.finish(ctx), hashes, logs
+
+
+def test_records_round_trip_and_verify(tmp_path) -> None:
+    records = [_record(seed)[0] for seed in (1, 2, 3)]
+    path = tmp_path / "battles.jsonl"
+    assert save_records(path, records) == 3
+    loaded = load_records(path)
+    assert [r.to_dict() for r in loaded] == [r.to_dict() for r in records]
+    assert all(r.ok for r in verify_records(loaded, _make_ctx))
+
+    loaded[0].actions.pop()  # a truncated action list no longer reaches the stored outcome
+    assert [r.ok for r in verify_records(loaded, _make_ctx)] == [False, True, True]
+
+
+def test_fast_forward_traces_only_the_target_round() -> None:
+    record, hashes, logs = _record(5)
+    k = min(4, record.rounds)
+    res = replay(record, _make_ctx, until_round=k)
+    assert res.round_no == k
+    assert outcome_hash(res.ctx, res.winner) == hashes[k - 1]
+    assert res.ctx.log.records and res.ctx.log.records == logs[k - 1]
+
+    full = replay(record, _make_ctx)
+    assert full.winner == record.winner
+    assert outcome_hash(full.ctx, full.winner) == record.outcome_hash
+
+
+def test_seek_restores_nearest_checkpoint() -> None:
+    cps = Checkpoints(every=3)
+    record, hashes, logs = _record(3, cps)
+    assert record.rounds > 9 and cps.rounds == list(range(3, record.rounds + 1, 3))
+    assert cps.nbytes < 4096 * len(cps)
+
+    for k in range(1, record.rounds + 1):
+        res = seek(record, _make_ctx, k, cps)
+        assert res.start_round == (k - 1) // 3 * 3
+        assert res.round_no == k
+        assert outcome_hash(res.ctx, res.winner) == hashes[k - 1]
+        assert res.ctx.log.records == logs[k - 1]
+
+    lazy = Checkpoints(every=4)  # filled in by the first replay, used by the next
+    replay(record, _make_ctx, checkpoints=lazy)
+    assert lazy.rounds == list(range(4, record.rounds + 1, 4))
+    res = seek(record, _make_ctx, record.rounds, lazy)
+    assert res.start_round > 0 and outcome_hash(res.ctx, res.winner) == record.outcome_hash
+
+
+def test_checkpoints_reject_rngs_not_positioned_by_draw_counts() -> None:
+    spec = {"speeds": [260, 261, 262, 263]}
+    ctx, pets = _make_ctx(spec, 5)
+    loop = BattleLoop()
+    blob = capture(ctx, loop, pets)
+
+    ctx.rng = SeqRNG(seq_hit=[0.5, 0.5])
+    with pytest.raises(TypeError, match="SeqRNG"):
+        capture(ctx, loop, pets)
+    with pytest.raises(TypeError, match="SeqRNG"):
+        Checkpoints(every=1).maybe_capture(ctx, loop, pets)
+    pets[0].hp = 1
+    with pytest.raises(TypeError, match="SeqRNG"):
+        restore(blob, ctx, loop, pets)
+    assert pets[0].hp == 1
+    assert ctx.rng.seq_hit == [0.5, 0.5] and ctx.rng.used["hit"] == 0
@@ -0,0 +1,55 @@
+from benchmarks.fixtures import make_ctx
+from engine.core.actions import ActionKind, BattleAction
+from engine.core.battle_loop import BattleLoop
+from engine.core.scheduler import Scheduler
+
+
+def test_scheduler_delay_semantics() -> None:
+    sch = Scheduler()
+    sch.schedule(delay_turns=0, actor_id=1, target_id=2, effect_rows=["a"])
+    sch.schedule(delay_turns=1, actor_id=1, target_id=2, effect_rows=["b"])
+    sch.schedule(delay_turns=3, actor_id=1, target_id=2, effect_rows=["c"])
+
+    ready = sch.tick()
+    assert [p.effect_rows for p in ready] == [("a",), ("b",)]
+    assert sch.tick() == []
+    ready = sch.tick()
+    assert [p.effect_rows for p in ready] == [("c",)]
+    assert len(sch) == 0
+
+
+def test_scheduler_keeps_tuple_rows_by_reference() -> None:
+    sch = Scheduler()
+    rows = ("x", "y")
+    pkt = sch.schedule(delay_turns=2, actor_id=1, target_id=2, effect_rows=rows)
+    assert pkt.effect_rows is rows
+    assert sch.remaining_turns(pkt) == 2
+    sch.tick()
+    assert sch.remaining_turns(pkt) == 1
+
+
+def test_scheduler_cancel_by_tag_and_pet() -> None:
+    sch = Scheduler()
+    sch.schedule(delay_turns=2, actor_id=1, target_id=2, effect_rows=["a"], tag="timer_trig")
+    sch.schedule(delay_turns=2, actor_id=3, target_id=1, effect_rows=["b"])
+    sch.schedule(delay_turns=2, actor_id=3, target_id=4, effect_rows=["c"], tag="timer_trig")
+
+    assert sch.cancel() == 0
+    assert sch.cancel_pet(1) == 2
+    assert [p.effect_rows for p in sch.pending()] == [("c",)]
+    assert sch.cancel(tag="timer_trig") == 1
+    sch.tick()
+    assert sch.tick() == []
+
+
+def test_battle_loop_cancels_packets_of_swapped_out_and_dead_pets() -> None:
+    ctx, pets = make_ctx()
+    loop = BattleLoop()
+    sch = loop.ex.scheduler
+    for actor, target in ((1, 4), (5, 2), (2, 4), (6, 3)):
+        sch.schedule(delay_turns=3, actor_id=actor, target_id=target, effect_rows=[f"{actor}>{target}"])
+    ctx.pets[4].hp, ctx.pets[4].alive = 0, False
+
+    loop.run_round(ctx, BattleAction(kind=ActionKind.SWAP, swap_index=1), BattleAction(kind=ActionKind.PASS), pets)
+    assert (ctx.teams.active_pet_id(0), ctx.teams.active_pet_id(1)) == (2, 5)
+    assert [p.effect_rows for p in sch.pending()] == [("5>2",), ("6>3",)]
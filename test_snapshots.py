@@ -0,0 +1,69 @@
+import json
+import random
+from types import SimpleNamespace
+
+from engine.core.snapshots import KEYFRAME_EVENT, SnapshotReconstructor, SnapshotTracker, snapshot_pet
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.dense_state_manager import DenseStateManager
+from engine.resolver.state_manager import StateManager
+
+
+def _as_read(payload):
+    # what a reader gets back from a JSONL event file
+    return json.loads(json.dumps(payload))
+
+
+def _pet(pid: int) -> SimpleNamespace:
+    return SimpleNamespace(id=pid, name_zh=f"p{pid}", hp=1000, max_hp=1000, alive=True, power=250, speed=280)
+
+
+def _mutate(ctx, rng: random.Random) -> None:
+    for _ in range(rng.randint(0, 3)):
+        pet = ctx.pets[rng.choice(list(ctx.pets))]
+        op = rng.randrange(6)
+        if op == 0:
+            pet.hp = max(0, pet.hp - rng.randint(0, 300))
+            pet.alive = pet.hp > 0
+        elif op == 1:
+            ctx.states.set(pet.id, rng.choice((1, 7, 40, 9001)), rng.randint(-2, 3))
+        elif op == 2:
+            ctx.states.clear_pet(pet.id)
+        elif op == 3:
+            ctx.aura.apply_with_stack_limit(owner_pet_id=pet.id, caster_pet_id=100, aura_id=rng.randint(1, 4),
+                                            duration=rng.choice((-1, 1, 3)), max_stacks=3, source_effect_id=5)
+        elif op == 4:
+            ctx.aura.tick(pet.id)
+        else:
+            ctx.aura.remove(pet.id, rng.randint(1, 4))
+
+
+def test_tracker_diffs_reconstruct_full_snapshots() -> None:
+    for states in (StateManager(), DenseStateManager(num_pets=2, state_ids=(1, 7, 40))):
+        rng = random.Random(3)
+        ctx = SimpleNamespace(states=states, aura=AuraManager(), pets={100: _pet(100), 200: _pet(200)})
+        tracker = SnapshotTracker(ctx, keyframe_rounds=4)
+        recon = SnapshotReconstructor()
+        recon.feed({"event": "BATTLE_START", "payload": {}})
+        recon.feed({"event": KEYFRAME_EVENT, "payload": _as_read({"round_no": 0, "pets": tracker.keyframe()})})
+
+        for round_no in range(1, 60):
+            if tracker.is_keyframe_round(round_no):
+                recon.feed({"event": KEYFRAME_EVENT, "payload": _as_read({"pets": tracker.keyframe()})})
+            _mutate(ctx, rng)  # between casts (ticks, other pets' effects)
+            actor, target = ctx.pets[100], ctx.pets[200]
+            before = (snapshot_pet(ctx, actor), snapshot_pet(ctx, target))
+            payload = {"actor_id": 100, "target_id": 200,
+                       "actor_sync": tracker.diff(actor), "target_sync": tracker.diff(target)}
+            _mutate(ctx, rng)  # the cast
+            payload["actor_diff"] = tracker.diff(actor)
+            payload["target_diff"] = tracker.diff(target)
+            out = recon.feed({"event": "ABILITY_EFFECTS", "payload": _as_read(payload)})
+
+            assert out["actor_before"] == _as_read(before[0])
+            assert out["target_before"] == _as_read(before[1])
+            assert out["actor_after"] == _as_read(snapshot_pet(ctx, actor))
+            assert out["target_after"] == _as_read(snapshot_pet(ctx, target))
+
+        # untouched pets produce no diff at all
+        assert tracker.diff(ctx.pets[100]) == {}
+        assert ctx.states.pop_changes(100) == [] and ctx.aura.pop_changes(100) == []
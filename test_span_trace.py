@@ -0,0 +1,53 @@
+import json
+
+from benchmarks.fixtures import ABILITY_DOT, ABILITY_HIT, make_ctx
+from benchmarks.macro import run_loop_battle
+from engine.core.actions import ActionKind, BattleAction
+from engine.core.battle_loop import BattleLoop
+from engine.core.span_trace import SpanTracer
+
+
+def _within(inner, outer) -> bool:
+    return outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"] + 1e-3
+
+
+def test_nested_spans_export_as_chrome_trace(tmp_path) -> None:
+    tracer = SpanTracer()
+    loop = BattleLoop()
+    with tracer.battle("seed 4", seed=4):
+        rounds = run_loop_battle(4, setup=lambda ctx: tracer.attach(loop, ctx.dispatcher), loop=loop)
+    tracer.detach(loop)
+    assert "run_round" not in vars(loop) and "use_ability_id" not in vars(loop.ex)
+    assert "execute_turn" not in vars(loop.ex.turn_executor)
+
+    path = tmp_path / "trace.json"
+    assert tracer.export(path) == len(tracer.events)
+    events = [e for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"]
+    by_cat = {}
+    for e in events:
+        by_cat.setdefault(e["cat"], []).append(e)
+
+    battle, = by_cat["battle"]
+    assert len(by_cat["round"]) == rounds and all(_within(r, battle) for r in by_cat["round"])
+    assert [r["args"]["round"] for r in by_cat["round"]] == list(range(1, rounds + 1))
+    for child, parents in (("phase", "round"), ("ability", "phase"), ("cast_turn", "phase"), ("effect", "cast_turn")):
+        assert by_cat[child] and all(any(_within(c, p) for p in by_cat[parents]) for c in by_cat[child]), child
+
+    casts = [c for c in by_cat["ability"] if c["args"]["ability_id"] in (ABILITY_HIT, ABILITY_DOT)]
+    assert casts and all("executed" in c["args"] for c in casts)
+    hit = next(e for e in by_cat["effect"] if e["args"]["prop_id"] == 24)
+    assert hit["args"]["handler"] == "H_Prop24_DmgPointsStd"
+    assert hit["args"]["flow_control"] == "CONTINUE" and isinstance(hit["args"]["executed"], bool)
+    assert {t["args"]["source"] for t in by_cat["cast_turn"]} == {"cast", "tick"}
+
+
+def test_detached_loop_records_nothing() -> None:
+    ctx, pets = make_ctx(team_size=1, seed=1)
+    tracer, loop = SpanTracer(), BattleLoop()
+    act = BattleAction(kind=ActionKind.USE_ABILITY, ability_id=ABILITY_HIT, slot_index=1)
+    with tracer.attached(loop, ctx.dispatcher):
+        loop.run_round(ctx, act, act, pets)
+    seen = len(tracer.events)
+    assert seen and "dispatch" not in vars(ctx.dispatcher)
+    loop.run_round(ctx, act, act, pets)
+    assert len(tracer.events) == seen
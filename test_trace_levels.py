@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from engine.core.rng import SeqRNG
+from engine.core.trace import TRACE_EXTENDED, TRACE_OFF, TraceSampler
+from engine.model.damage import DamageEvent
+from engine.model.heal import HealEvent
+from engine.resolver.damage_pipeline import DamagePipeline
+from engine.resolver.heal_pipeline import HealPipeline
+from engine.resolver.state_manager import StateManager
+from engine.resolver.stats_resolver import StatsResolver
+
+
+def _ctx(**kw) -> SimpleNamespace:
+    rng = SeqRNG(seq_var=[0.97, 1.02, 1.0, 0.96] * 4, seq_crit=[0.5, 0.01, 0.9, 0.3] * 4)
+    actor = SimpleNamespace(id=1, pet_type=7, power=300, speed=250, hp=1000, max_hp=1400)
+    target = SimpleNamespace(id=2, pet_type=5, power=280, speed=240, hp=1400, max_hp=1400)
+    return SimpleNamespace(rng=rng, pets={1: actor, 2: target}, states=StateManager(), stats=StatsResolver(), **kw)
+
+
+def _resolve(ctx: SimpleNamespace):
+    a, t = ctx.pets[1], ctx.pets[2]
+    dp, hp = DamagePipeline(ctx.rng), HealPipeline(ctx.rng)
+    out = []
+    for k in range(4):
+        out.append(dp.resolve(ctx, DamageEvent(source_actor=a, target=t, ability_id=0, effect_id=k, points=20 + 10 * k)))
+        out.append(hp.resolve(ctx, HealEvent(source_actor=a, target=a, ability_id=0, effect_id=k, points=15)))
+    return out
+
+
+def test_trace_off_skips_trace_without_changing_results() -> None:
+    minimal = _resolve(_ctx())
+    off = _resolve(_ctx(trace_level="off"))
+    extended = _resolve(_ctx(trace_level=TRACE_EXTENDED))
+
+    values = [getattr(r, "final_damage", getattr(r, "final_heal", None)) for r in minimal]
+    assert [getattr(r, "final_damage", getattr(r, "final_heal", None)) for r in off] == values
+    assert [getattr(r, "final_damage", getattr(r, "final_heal", None)) for r in extended] == values
+    assert all(r.trace is None for r in off)
+    assert all(set(r.trace) == {"S1_base", "S7_variance_roll"} for r in minimal)
+    assert extended[0].trace["S8_is_crit"] is False and len(extended[0].trace) > 2
+    assert not hasattr(off[0], "__dict__")
+
+
+def test_trace_sampler_extends_one_in_n() -> None:
+    ctx = _ctx(trace_level=TraceSampler(3, base=TRACE_OFF))
+    traces = [r.trace for r in _resolve(ctx)]
+    assert [t is not None and "S2_power" in t for t in traces] == [False, False, True] * 2 + [False, False]
+    assert all(t is None for i, t in enumerate(traces) if i % 3 != 2)
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+from engine.constants.weather import WEATHER_RAIN, WEATHER_SUNLIGHT
+from engine.resolver.aura_manager import AuraManager
+from engine.resolver.weather_manager import WeatherManager
+
+
+def _apply_weather(am: AuraManager, owner: int, aura_id: int, state_id: int, duration: int):
+    ar = am.apply(
+        owner_pet_id=owner,
+        caster_pet_id=owner,
+        aura_id=aura_id,
+        duration=duration,
+        tickdown_first_round=False,
+        source_effect_id=99,
+    )
+    # Meta is attached after apply(), as ScriptDB.attach_meta_to_aura does.
+    ar.aura.meta["state_binds"] = [{"state_id": state_id, "value": 1, "flags": 0}]
+    return ar.aura
+
+
+def test_weather_follows_aura_apply_and_expire() -> None:
+    am = AuraManager()
+    wm = WeatherManager()
+    ctx = SimpleNamespace(aura=am, weather=wm)
+    assert wm.current(ctx) == 0
+
+    _apply_weather(am, 1, 590, WEATHER_RAIN, duration=1)
+    assert wm.current(ctx) == WEATHER_RAIN
+
+    am.tick(1)
+    assert wm.current(ctx) == WEATHER_RAIN
+    am.tick(1)
+    assert wm.current(ctx) == 0
+
+
+def test_weather_falls_back_to_longest_remaining_after_removal() -> None:
+    am = AuraManager()
+    wm = WeatherManager()
+    ctx = SimpleNamespace(aura=am, weather=wm)
+
+    _apply_weather(am, 1, 590, WEATHER_RAIN, duration=5)
+    sun = _apply_weather(am, 2, 591, WEATHER_SUNLIGHT, duration=3)
+    wm.on_aura_applied(sun)
+    assert wm.current(ctx) == WEATHER_SUNLIGHT
+
+    am.remove(2, 591)
+    assert wm.current(ctx) == WEATHER_RAIN
+
+
+def test_pending_auras_stay_bounded_without_reads() -> None:
+    am = AuraManager()
+    wm = WeatherManager()
+    assert wm.bind(am)
+    for i in range(200):  # a loop that applies / refreshes / removes auras but never reads weather
+        am.apply(owner_pet_id=1, caster_pet_id=2, aura_id=1000 + i % 5, duration=2,
+                 tickdown_first_round=False, source_effect_id=99)
+        if i % 3 == 0:
+            am.remove(1, 1000 + i % 5)
+    assert len(wm._pending) <= len(am.list_owner(1))
+    _apply_weather(am, 2, 590, WEATHER_RAIN, duration=3)
+    assert wm.current(SimpleNamespace(aura=am, weather=wm)) == WEATHER_RAIN and not wm._pending